@@ -0,0 +1,117 @@
+"""
+Puntajes de las áreas vocacionales (Sección 7)
+Cada respuesta se codifica una sola vez en una matriz booleana
+encuestados x 18 preguntas ("¿respondió A?"). Al multiplicarla por la matriz
+de pertenencia pregunta x área se obtiene el puntaje de cada encuestado en
+las seis áreas, y cualquier agrupación (grado, distrito, colegio) es un
+único groupby().sum() sobre ese resultado
+"""
+
+import numpy as np
+import pandas as pd
+
+from esquema import PREGUNTAS_VOCACIONALES
+from perfilado import perfilar
+
+# ============================================================================
+# ÁREAS VOCACIONALES
+# ============================================================================
+
+NOMBRES_AREAS = [
+    "Ciencias de la Salud",
+    "Ciencias Sociales y Humanidades",
+    "Ingeniería, Tecnología y Matemáticas",
+    "Arte, Comunicación y Diseño",
+    "Negocios, Economía y Emprendimiento",
+    "Ciencias Naturales y Medio Ambiente"
+]
+
+# Las preguntas del formulario van de tres en tres por área, en el mismo orden
+AREAS_VOCACIONALES = {
+    area: PREGUNTAS_VOCACIONALES[i * 3:(i + 1) * 3]
+    for i, area in enumerate(NOMBRES_AREAS)
+}
+
+
+def matriz_pertenencia(areas=AREAS_VOCACIONALES):
+    """Matriz pregunta x área con 1 si la pregunta pertenece al área"""
+    preguntas = [p for lista in areas.values() for p in lista]
+    matriz = np.zeros((len(preguntas), len(areas)), dtype=np.int32)
+    for j, lista in enumerate(areas.values()):
+        for pregunta in lista:
+            matriz[preguntas.index(pregunta), j] = 1
+    return preguntas, matriz
+
+
+# ============================================================================
+# CODIFICACIÓN DE RESPUESTAS
+# ============================================================================
+
+def _es_respuesta_a(serie):
+    """Vector booleano: la respuesta empieza con "A" (vacíos = False)"""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        # Se evalúa cada opción distinta una sola vez y se expande por código
+        categorias_a = np.array([str(c).startswith("A") for c in serie.cat.categories] + [False])
+        return categorias_a[serie.cat.codes.to_numpy()]
+    return serie.astype("string").str.startswith("A").fillna(False).to_numpy(dtype=bool)
+
+
+def preguntas_faltantes(df, areas=AREAS_VOCACIONALES):
+    """Preguntas vocacionales que no están en el DataFrame"""
+    return [p for lista in areas.values() for p in lista if p not in df.columns]
+
+
+def matriz_respuestas_a(df, areas=AREAS_VOCACIONALES):
+    """Matriz booleana encuestados x preguntas (las preguntas ausentes quedan en False)"""
+    preguntas, _ = matriz_pertenencia(areas)
+    matriz = np.zeros((len(df), len(preguntas)), dtype=bool)
+    for j, pregunta in enumerate(preguntas):
+        if pregunta in df.columns:
+            matriz[:, j] = _es_respuesta_a(df[pregunta])
+    return matriz
+
+
+# ============================================================================
+# PUNTAJES
+# ============================================================================
+
+@perfilar('areas_vocacionales')
+def puntajes_por_area(df, areas=AREAS_VOCACIONALES):
+    """Cantidad de respuestas A de cada encuestado en cada área"""
+    _, pertenencia = matriz_pertenencia(areas)
+    puntajes = matriz_respuestas_a(df, areas).astype(np.int32) @ pertenencia
+    return pd.DataFrame(puntajes, index=df.index, columns=list(areas))
+
+
+def puntajes_por_grupo(df, columna, areas=AREAS_VOCACIONALES):
+    """
+    Total de respuestas A por área para cada valor de `columna`.
+
+    Los grupos salen en el orden en que aparecen en los datos (como unique())
+    y las filas sin valor en `columna` se descartan.
+    """
+    puntajes = puntajes_por_area(df, areas)
+    return puntajes.groupby(df[columna].to_numpy(dtype=object), sort=False).sum()
+
+
+# ============================================================================
+# GRÁFICO POR GRUPO
+# ============================================================================
+
+def guardar_grafico_areas(conteo_areas, titulo, color, ruta):
+    """
+    Dibuja y guarda el gráfico de barras de respuestas A por área de un grupo.
+    Es una función de módulo para poder ejecutarse en otro proceso.
+    """
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10,6))
+    plt.bar(conteo_areas.index, conteo_areas.values, color=color)
+    plt.title(titulo, fontsize=14, fontweight='bold')
+    plt.xlabel("Áreas Vocacionales")
+    plt.ylabel("Cantidad de respuestas A")
+    plt.xticks(rotation=30, ha='right')
+    plt.tight_layout()
+    plt.savefig(ruta)
+    plt.close()
+    return ruta
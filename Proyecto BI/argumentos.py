@@ -0,0 +1,61 @@
+"""
+Filtros desde la línea de comandos
+Cada dimensión del cubo (Género, Edad, Grado, Distrito, Colegio) se puede
+fijar con un argumento (--genero Femenino, --grado 4° 5°, ...) en lugar de
+editar el diccionario FILTROS de cada sección o responder un menú con input()
+"""
+
+from cubo import DIMENSIONES
+
+# Argumento de cada dimensión del cubo
+ARGUMENTOS_FILTROS = {
+    'Genero': '--genero',
+    'Edad': '--edad',
+    'Grado': '--grado',
+    'Distrito': '--distrito',
+    'Colegio': '--colegio',
+}
+
+
+def agregar_argumentos_filtros(parser, dimensiones=DIMENSIONES):
+    """Agrega a un ArgumentParser un argumento por dimensión (uno o varios valores)"""
+    grupo = parser.add_argument_group('filtros', "Sin filtros se analizan todos los estudiantes")
+    for dimension in dimensiones:
+        grupo.add_argument(ARGUMENTOS_FILTROS[dimension], nargs='+', dest=f"filtro_{dimension}",
+                           metavar='VALOR', help=f"Filtrar por {dimension}")
+    return parser
+
+
+def _resolver_valores(cubo, dimension, texto):
+    """
+    Etiquetas del cubo que corresponden al texto, sin distinguir espacios
+    sobrantes (las edades se leen como números)
+    """
+    return [etiqueta for etiqueta in cubo['etiquetas'].get(dimension, [])
+            if str(etiqueta).strip() == texto.strip()]
+
+
+def filtros_desde_argumentos(args, cubo=None):
+    """
+    Diccionario de filtros (dimensión -> valor o lista de valores) de los argumentos.
+
+    Con `cubo` cada texto se convierte en la etiqueta de los datos (ej. '16'
+    en 16, y 'San Luis' en 'San Luis' y 'San Luis '); los valores que no aparecen en los
+    datos se avisan y se dejan como texto (no seleccionan ninguna fila).
+    """
+    filtros = {}
+    for dimension in ARGUMENTOS_FILTROS:
+        valores = getattr(args, f"filtro_{dimension}", None)
+        if not valores:
+            continue
+        if cubo is not None and dimension in cubo['dimensiones']:
+            resueltos = []
+            for texto in valores:
+                etiquetas = _resolver_valores(cubo, dimension, texto)
+                if not etiquetas:
+                    print(f"ADVERTENCIA: '{texto}' no es un valor de {dimension} en los datos.")
+                    etiquetas = [texto]
+                resueltos.extend(e for e in etiquetas if e not in resueltos)
+            valores = resueltos
+        filtros[dimension] = valores[0] if len(valores) == 1 else valores
+    return filtros
@@ -0,0 +1,265 @@
+"""
+Mapa de asociaciones entre preguntas
+Calcula chi-cuadrado, valor p y V de Cramér para todos los pares de
+preguntas categóricas (y datos demográficos) a la vez. Todas las tablas de
+contingencia salen de un único producto de matrices sobre la codificación
+one-hot de las respuestas, se apilan en un tensor pares x filas x columnas y
+los estadísticos se calculan con operaciones vectorizadas de NumPy
+"""
+
+import argparse
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+from cubo import DIMENSIONES
+from esquema import codigos_respuestas
+from perfilado import perfilar
+from render_lote import ejecutar_en_paralelo
+
+# Scipy es opcional (se usa para los valores p); se importa recién al calcularlos
+SCIPY_AVAILABLE = importlib.util.find_spec('scipy') is not None
+if not SCIPY_AVAILABLE:
+    print("ADVERTENCIA: Scipy no esta disponible. Los valores p quedaran vacios.")
+
+# Columnas con más opciones que esto se consideran texto libre y se omiten
+MAX_CATEGORIAS = 50
+
+# Elementos por bloque (filas de la matriz one-hot o celdas del tensor de tablas)
+TAMANO_BLOQUE = 2 ** 24
+
+# Pares por tarea cuando los valores p se reparten entre procesos
+PARES_POR_TAREA = 50_000
+
+
+# ============================================================================
+# CODIFICACIÓN
+# ============================================================================
+
+def columnas_categoricas(df, max_categorias=MAX_CATEGORIAS):
+    """Preguntas categóricas y columnas demográficas presentes en df"""
+    demograficas = {c for candidatas in DIMENSIONES.values() for c in candidatas}
+    columnas = []
+    for columna in df.columns:
+        if isinstance(df[columna].dtype, pd.CategoricalDtype) or columna in demograficas:
+            if df[columna].nunique() <= max_categorias:
+                columnas.append(columna)
+    return columnas
+
+
+def _codificar_columnas(df, columnas):
+    """
+    Códigos de cada columna compactados a las opciones con respuestas.
+
+    Returns:
+        (columnas con al menos dos opciones, matriz de códigos filas x columnas
+        con -1 en los vacíos, número de opciones de cada columna)
+    """
+    usadas, codigos, tamanos = [], [], []
+    for columna in columnas:
+        codigos_col, _ = codigos_respuestas(df[columna])
+        presentes = np.unique(codigos_col[codigos_col >= 0])
+        if len(presentes) < 2:
+            continue
+        compactos = np.full(codigos_col.max() + 2, -1, dtype=np.intp)
+        compactos[presentes] = np.arange(len(presentes))
+        usadas.append(columna)
+        codigos.append(compactos[codigos_col])
+        tamanos.append(len(presentes))
+    matriz = np.column_stack(codigos) if codigos else np.zeros((len(df), 0), dtype=np.intp)
+    return usadas, matriz, np.array(tamanos, dtype=np.intp)
+
+
+def _conteos_conjuntos(codigos, tamanos):
+    """
+    Matriz de conteos conjuntos (opciones x opciones) de todas las columnas.
+
+    Con H la matriz one-hot encuestados x opciones, H.T @ H contiene en cada
+    bloque la tabla de contingencia de un par de columnas. Un vacío deja su
+    fila de H en cero, así cada par usa solo los encuestados que respondieron
+    ambas preguntas. Se acumula por bloques de filas para acotar la memoria.
+    """
+    desplazamientos = np.concatenate([[0], np.cumsum(tamanos)[:-1]])
+    total = int(tamanos.sum())
+    conjuntos = np.zeros((total, total), dtype=np.float64)
+    filas_por_bloque = max(1, TAMANO_BLOQUE // max(total, 1))
+
+    for inicio in range(0, len(codigos), filas_por_bloque):
+        bloque = codigos[inicio:inicio + filas_por_bloque]
+        one_hot = np.zeros((len(bloque), total), dtype=np.float64)
+        filas, cols = np.nonzero(bloque >= 0)
+        one_hot[filas, desplazamientos[cols] + bloque[filas, cols]] = 1
+        conjuntos += one_hot.T @ one_hot
+    return conjuntos, desplazamientos
+
+
+def _tensor_pares(conjuntos, desplazamientos, pares, forma):
+    """Apila las tablas de contingencia de pares que comparten forma (filas x columnas)"""
+    filas = desplazamientos[pares[:, 0], None] + np.arange(forma[0])
+    columnas = desplazamientos[pares[:, 1], None] + np.arange(forma[1])
+    return conjuntos[filas[:, :, None], columnas[:, None, :]]
+
+
+# ============================================================================
+# ESTADÍSTICOS VECTORIZADOS
+# ============================================================================
+
+def estadisticos_contingencia(tablas, correccion=True):
+    """
+    Chi-cuadrado, grados de libertad, n y V de Cramér de varias tablas a la vez.
+
+    Args:
+        tablas: Arreglo pares x filas x columnas (o una sola tabla 2D); las
+                filas y columnas en cero se ignoran
+        correccion: Corrección de Yates cuando hay 1 grado de libertad
+                    (igual que scipy.stats.chi2_contingency)
+
+    Returns:
+        Diccionario de arreglos: chi2, gl, n y cramers_v
+    """
+    tablas = np.asarray(tablas, dtype=np.float64)
+    if tablas.ndim == 2:
+        tablas = tablas[None]
+
+    total_filas = tablas.sum(axis=2, keepdims=True)
+    total_columnas = tablas.sum(axis=1, keepdims=True)
+    n = tablas.sum(axis=(1, 2))
+    filas_validas = (total_filas[:, :, 0] > 0).sum(axis=1)
+    columnas_validas = (total_columnas[:, 0, :] > 0).sum(axis=1)
+    gl = (filas_validas - 1) * (columnas_validas - 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        esperado = total_filas * total_columnas / n[:, None, None]
+        diferencia = tablas - esperado
+        if correccion:
+            yates = (gl == 1)[:, None, None]
+            ajuste = np.minimum(0.5, np.abs(diferencia))
+            diferencia = np.where(yates, np.sign(diferencia) * (np.abs(diferencia) - ajuste), diferencia)
+        chi2 = np.where(esperado > 0, diferencia ** 2 / esperado, 0.0).sum(axis=(1, 2))
+
+        minimo = np.minimum(filas_validas, columnas_validas) - 1
+        cramers_v = np.sqrt(chi2 / (n * minimo))
+    cramers_v = np.where((minimo > 0) & (n > 0), cramers_v, np.nan)
+    chi2 = np.where(gl > 0, chi2, np.nan)
+
+    return {'chi2': chi2, 'gl': gl, 'n': n.astype(np.int64), 'cramers_v': cramers_v}
+
+
+def _valores_p_bloque(chi2, gl):
+    """Valores p de un bloque de pares (función de módulo para el pool)"""
+    from scipy import stats
+
+    with np.errstate(invalid='ignore'):
+        return stats.chi2.sf(chi2, np.maximum(gl, 1))
+
+
+def valores_p(chi2, gl, procesos=1):
+    """Valores p de chi-cuadrado; con varios procesos se reparten por bloques de pares"""
+    if not SCIPY_AVAILABLE:
+        return np.full(len(chi2), np.nan)
+    tareas = [(chi2[i:i + PARES_POR_TAREA], gl[i:i + PARES_POR_TAREA])
+              for i in range(0, len(chi2), PARES_POR_TAREA)]
+    if not tareas:
+        return np.zeros(0)
+    p = np.concatenate(ejecutar_en_paralelo(_valores_p_bloque, tareas, procesos=procesos))
+    return np.where(gl > 0, p, np.nan)
+
+
+# ============================================================================
+# MATRIZ DE ASOCIACIONES
+# ============================================================================
+
+@perfilar('asociaciones')
+def matriz_asociaciones(df, columnas=None, correccion=True, alfa=0.05, procesos=1):
+    """
+    Asociación entre todos los pares de columnas categóricas.
+
+    Args:
+        df: DataFrame normalizado (con categorías del esquema)
+        columnas: Columnas a comparar; por defecto las preguntas categóricas
+                  y las columnas demográficas
+        correccion: Corrección de Yates en las tablas con 1 grado de libertad
+        alfa: Nivel de significancia
+        procesos: Procesos para calcular los valores p
+
+    Returns:
+        DataFrame con una fila por par: pregunta_1, pregunta_2, n, chi2, gl,
+        p_valor, cramers_v y significativo (ordenado por V de Cramér)
+    """
+    if columnas is None:
+        columnas = columnas_categoricas(df)
+    columnas, codigos, tamanos = _codificar_columnas(df, columnas)
+    if len(columnas) < 2:
+        return pd.DataFrame(columns=['pregunta_1', 'pregunta_2', 'n', 'chi2', 'gl',
+                                     'p_valor', 'cramers_v', 'significativo'])
+
+    conjuntos, desplazamientos = _conteos_conjuntos(codigos, tamanos)
+    pares = np.array(np.triu_indices(len(columnas), k=1)).T
+
+    # Los pares se agrupan por forma de tabla (sin relleno) y cada grupo se
+    # procesa por bloques para acotar la memoria del tensor
+    resultado = {'chi2': np.empty(len(pares)), 'gl': np.empty(len(pares), dtype=np.int64),
+                 'n': np.empty(len(pares), dtype=np.int64), 'cramers_v': np.empty(len(pares))}
+    formas, grupo = np.unique(tamanos[pares], axis=0, return_inverse=True)
+    for g, forma in enumerate(formas):
+        indices = np.flatnonzero(grupo.ravel() == g)
+        pares_por_bloque = max(1, TAMANO_BLOQUE // int(forma[0] * forma[1]))
+        for i in range(0, len(indices), pares_por_bloque):
+            seleccion = indices[i:i + pares_por_bloque]
+            tablas = _tensor_pares(conjuntos, desplazamientos, pares[seleccion], forma)
+            for clave, valores in estadisticos_contingencia(tablas, correccion).items():
+                resultado[clave][seleccion] = valores
+    p_valor = valores_p(resultado['chi2'], resultado['gl'], procesos)
+
+    nombres = np.array(columnas, dtype=object)
+    tabla = pd.DataFrame({
+        'pregunta_1': nombres[pares[:, 0]],
+        'pregunta_2': nombres[pares[:, 1]],
+        'n': resultado['n'],
+        'chi2': resultado['chi2'],
+        'gl': resultado['gl'],
+        'p_valor': p_valor,
+        'cramers_v': resultado['cramers_v'],
+    })
+    tabla['significativo'] = tabla['p_valor'] < alfa
+    return tabla.sort_values('cramers_v', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def matriz_cramers(asociaciones):
+    """Matriz cuadrada de V de Cramér (diagonal = 1) a partir de matriz_asociaciones"""
+    columnas = pd.unique(pd.concat([asociaciones['pregunta_1'], asociaciones['pregunta_2']]))
+    posicion = {columna: i for i, columna in enumerate(columnas)}
+    filas = asociaciones['pregunta_1'].map(posicion).to_numpy()
+    cols = asociaciones['pregunta_2'].map(posicion).to_numpy()
+    matriz = np.eye(len(columnas))
+    matriz[filas, cols] = asociaciones['cramers_v'].to_numpy()
+    matriz[cols, filas] = asociaciones['cramers_v'].to_numpy()
+    return pd.DataFrame(matriz, index=columnas, columns=columnas)
+
+
+if __name__ == "__main__":
+    from carga_datos import cargar_encuesta_normalizada, ARCHIVO_RESPUESTAS
+
+    parser = argparse.ArgumentParser(description="Chi-cuadrado y V de Cramér entre todas las preguntas")
+    parser.add_argument('--archivo', default=ARCHIVO_RESPUESTAS, help="Excel de respuestas a analizar")
+    parser.add_argument('--salida', help="Guardar la tabla completa de pares en este CSV")
+    parser.add_argument('--top', type=int, default=15, help="Pares más asociados a mostrar")
+    parser.add_argument('--procesos', type=int, default=1, help="Procesos para los valores p")
+    args = parser.parse_args()
+
+    df = cargar_encuesta_normalizada(args.archivo)
+    asociaciones = matriz_asociaciones(df, procesos=args.procesos)
+
+    print("=" * 80)
+    print(f"MAPA DE ASOCIACIONES - {len(asociaciones)} pares de preguntas")
+    print("=" * 80)
+    for _, fila in asociaciones.head(args.top).iterrows():
+        marca = "*" if fila['significativo'] else " "
+        print(f"{marca} V={fila['cramers_v']:.3f}  p={fila['p_valor']:.4f}  "
+              f"{str(fila['pregunta_1'])[:40]} <-> {str(fila['pregunta_2'])[:40]}")
+    print("(* = significativo con p < 0.05)")
+
+    if args.salida:
+        asociaciones.to_csv(args.salida, index=False)
+        print(f"\n[OK] Tabla guardada en: {args.salida}")
@@ -0,0 +1,267 @@
+"""
+Barrido de filtros
+Recorre todas las combinaciones de Género x Edad x Grado x Distrito (cada
+dimensión con sus valores y con "Todos") sobre una única carga de la
+encuesta. Los conteos y las métricas de cada corte se leen del cubo, y los
+gráficos de las secciones 2, 4 y 6 se generan en modo lote. Los cortes se
+reparten entre procesos y cada uno se guarda en su propia carpeta:
+
+    salida/Genero_Femenino/Edad_16/Grado_4/Distrito_Todos/
+        conteos.csv, metricas.csv, graficos/*.png
+"""
+
+import contextlib
+import io
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+from carga_datos import cargar_encuesta_normalizada, ARCHIVO_RESPUESTAS
+from config_graficos import activar_modo_lote, nombre_archivo_seguro
+from cubo import construir_cubo, consultar_cubo, total_cubo
+from indices import aplicar_filtros, construir_indices
+from metricas import calcular_metricas
+from render_lote import ejecutar_en_paralelo, procesos_por_defecto, VARIABLE_PROCESOS
+
+# Dimensiones que se combinan en el barrido
+DIMENSIONES_BARRIDO = ['Genero', 'Edad', 'Grado', 'Distrito']
+
+# Nombre de la carpeta cuando una dimensión no se filtra
+ETIQUETA_TODOS = 'Todos'
+
+# Tareas por proceso: los cortes se agrupan para no enviar los datos con cada uno
+TAREAS_POR_PROCESO = 4
+
+
+# ============================================================================
+# CORTES
+# ============================================================================
+
+def combinaciones_filtros(cubo, dimensiones=DIMENSIONES_BARRIDO, filtros_fijos=None, incluir_todos=True):
+    """
+    Todas las combinaciones de valores de las dimensiones con al menos un estudiante.
+
+    Args:
+        cubo: Cubo de conteos
+        dimensiones: Dimensiones a combinar (las que no están en los datos se omiten)
+        filtros_fijos: Filtros que se aplican a todos los cortes (ej. un colegio)
+        incluir_todos: Agregar el valor "Todos" (sin filtro) en cada dimensión
+
+    Returns:
+        Lista de diccionarios de filtros
+    """
+    filtros_fijos = filtros_fijos or {}
+    dimensiones = [d for d in dimensiones if d in cubo['dimensiones'] and d not in filtros_fijos]
+    opciones = []
+    for dimension in dimensiones:
+        valores = [v for v in cubo['etiquetas'][dimension] if not pd.isna(v)]
+        opciones.append(([None] if incluir_todos else []) + valores)
+
+    cortes = []
+    for valores in itertools.product(*opciones):
+        filtros = dict(filtros_fijos)
+        filtros.update({d: v for d, v in zip(dimensiones, valores) if v is not None})
+        if total_cubo(cubo, filtros) > 0:
+            cortes.append(filtros)
+    return cortes
+
+
+def nombres_carpetas(cubo, dimensiones=DIMENSIONES_BARRIDO):
+    """
+    Nombre de carpeta de cada valor de cada dimensión: dimension -> {valor: nombre}.
+
+    Valores que solo difieren en espacios o símbolos ('San Luis' y 'San Luis ')
+    reciben un sufijo para no escribir en la misma carpeta.
+    """
+    nombres = {}
+    for dimension in dimensiones:
+        usados = {ETIQUETA_TODOS}
+        nombres[dimension] = {}
+        for valor in cubo['etiquetas'].get(dimension, []):
+            base = nombre_archivo_seguro(valor)
+            nombre, n = base, 1
+            while nombre in usados:
+                n += 1
+                nombre = f"{base}_{n}"
+            usados.add(nombre)
+            nombres[dimension][valor] = nombre
+    return nombres
+
+
+def carpeta_corte(filtros, nombres, dimensiones=DIMENSIONES_BARRIDO):
+    """Ruta relativa de un corte: una carpeta por dimensión (Genero_X/Edad_Y/...)"""
+    partes = []
+    for dimension in dimensiones:
+        valor = filtros.get(dimension)
+        if valor is None:
+            nombre = ETIQUETA_TODOS
+        elif isinstance(valor, (list, tuple, set)):
+            nombre = '_'.join(nombres[dimension].get(v, nombre_archivo_seguro(v)) for v in valor)
+        else:
+            nombre = nombres[dimension].get(valor, nombre_archivo_seguro(valor))
+        partes.append(f"{dimension}_{nombre}")
+    return os.path.join(*partes)
+
+
+def tabla_corte(cubo, filtros):
+    """
+    Conteos de todas las preguntas del cubo para un corte, con el formato de
+    metricas.tabla_conteos (un solo grupo)
+    """
+    preguntas = list(cubo['conteos'])
+    categorias = [cubo['categorias'][p] for p in preguntas]
+    conteos = np.zeros((1, len(preguntas), max((len(c) for c in categorias), default=0)), dtype=np.int64)
+    for j, pregunta in enumerate(preguntas):
+        conteos[0, j, :len(categorias[j])] = consultar_cubo(cubo, pregunta, filtros).to_numpy()
+    return {
+        'conteos': conteos,
+        'preguntas': preguntas,
+        'categorias': categorias,
+        'categoricas': [True] * len(preguntas),
+        'grupos': [ETIQUETA_TODOS],
+    }
+
+
+def conteos_corte(tabla):
+    """Conteo de cada opción de todas las preguntas (formato largo)"""
+    largos = [len(c) for c in tabla['categorias']]
+    return pd.DataFrame({
+        'pregunta': np.repeat(np.array(tabla['preguntas'], dtype=object), largos),
+        'opcion': np.array([o for categorias in tabla['categorias'] for o in categorias], dtype=object),
+        'conteo': np.concatenate([tabla['conteos'][0, j, :n] for j, n in enumerate(largos)] or [np.zeros(0, dtype=np.int64)]),
+    })
+
+
+def metricas_corte(tabla):
+    """Moda, entropía y diversidad de todas las preguntas de un corte"""
+    return calcular_metricas(None, tabla['preguntas'], tabla=tabla).drop(columns='grupo')
+
+
+# ============================================================================
+# GRÁFICOS DE CADA CORTE
+# ============================================================================
+
+def _graficos_seccion2(df, filtros, cubo, indices):
+    """La Sección 2 cuenta sobre las filas del corte (con todos sus grados)"""
+    import seccion2
+    filas, _ = aplicar_filtros(df, filtros, indices)
+    seccion2.ejecutar(df, grados_filtrar=seccion2.grados_presentes(df, filas), filas=filas)
+
+
+def _graficos_seccion4(df, filtros, cubo, indices):
+    import seccion4
+    seccion4.ejecutar(df, filtros=filtros, cubo=cubo, indices=indices)
+
+
+def _graficos_seccion6(df, filtros, cubo, indices):
+    import seccion6
+    seccion6.ejecutar(df, filtros=filtros, cubo=cubo, indices=indices)
+
+
+SECCIONES_BARRIDO = {
+    'Sección 2': _graficos_seccion2,
+    'Sección 4': _graficos_seccion4,
+    'Sección 6': _graficos_seccion6,
+}
+
+
+def _graficar_corte(df, filtros, cubo, indices, carpeta):
+    """Genera los gráficos de las secciones para un corte; devuelve los errores"""
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    errores = []
+    for nombre, funcion in SECCIONES_BARRIDO.items():
+        activar_modo_lote(os.path.join(carpeta, 'graficos'), prefijo=f"{nombre_archivo_seguro(nombre)}_")
+        try:
+            # La salida por pantalla de cada sección no se muestra en el barrido
+            with matplotlib.rc_context(), contextlib.redirect_stdout(io.StringIO()):
+                funcion(df, filtros, cubo, indices)
+        except Exception as e:
+            errores.append(f"{nombre}: {e}")
+            plt.close('all')
+    return errores
+
+
+# ============================================================================
+# EJECUCIÓN
+# ============================================================================
+
+def procesar_cortes(cortes, df, cubo, indices, salida, dimensiones=DIMENSIONES_BARRIDO, graficos=True):
+    """
+    Tarea del pool: guarda los resultados de un grupo de cortes.
+
+    Returns:
+        Lista con una fila de resumen por corte (filtros, estudiantes, carpeta, errores)
+    """
+    # Dentro de un trabajador no se abren más procesos
+    os.environ[VARIABLE_PROCESOS] = '1'
+    nombres = nombres_carpetas(cubo, dimensiones)
+    resumen = []
+    for filtros in cortes:
+        relativa = carpeta_corte(filtros, nombres, dimensiones)
+        carpeta = os.path.join(salida, relativa)
+        os.makedirs(carpeta, exist_ok=True)
+
+        tabla = tabla_corte(cubo, filtros)
+        conteos_corte(tabla).to_csv(os.path.join(carpeta, 'conteos.csv'), index=False)
+        metricas_corte(tabla).to_csv(os.path.join(carpeta, 'metricas.csv'), index=False)
+        errores = _graficar_corte(df, filtros, cubo, indices, carpeta) if graficos else []
+
+        fila = {d: filtros.get(d, ETIQUETA_TODOS) for d in dimensiones}
+        fila.update({'estudiantes': total_cubo(cubo, filtros), 'carpeta': relativa, 'errores': '; '.join(errores)})
+        resumen.append(fila)
+    return resumen
+
+
+def ejecutar_barrido(df=None, archivo=ARCHIVO_RESPUESTAS, salida='barrido', dimensiones=DIMENSIONES_BARRIDO,
+                     filtros_fijos=None, graficos=True, procesos=None, cubo=None):
+    """
+    Calcula todos los cortes de la encuesta y los guarda en un árbol de carpetas.
+
+    Args:
+        df: DataFrame ya normalizado; si es None se carga desde `archivo`
+        archivo: Ruta al Excel de respuestas
+        salida: Carpeta raíz de los resultados
+        dimensiones: Dimensiones a combinar
+        filtros_fijos: Filtros comunes a todos los cortes
+        graficos: Generar también los gráficos de las secciones 2, 4 y 6
+        procesos: Procesos del pool (por defecto BI_PROCESOS o los núcleos)
+        cubo: Cubo ya construido sobre df (opcional)
+
+    Returns:
+        DataFrame resumen con una fila por corte (también en salida/indice.csv)
+    """
+    if df is None:
+        df = cargar_encuesta_normalizada(archivo)
+    if cubo is None:
+        cubo = construir_cubo(df)
+    indices = construir_indices(df)
+    cortes = combinaciones_filtros(cubo, dimensiones, filtros_fijos)
+
+    print("=" * 80)
+    print(f"BARRIDO DE FILTROS - {len(cortes)} cortes con estudiantes ({' x '.join(dimensiones)})")
+    print("=" * 80)
+
+    # Los cortes se reparten en grupos: cada proceso recibe los datos una vez por grupo
+    procesos = min(procesos or procesos_por_defecto(), max(len(cortes), 1))
+    n_grupos = min(len(cortes), procesos * TAREAS_POR_PROCESO) if procesos > 1 else 1
+    grupos = [cortes[i::n_grupos] for i in range(n_grupos)] if cortes else []
+    tareas = [(grupo, df, cubo, indices, salida, dimensiones, graficos) for grupo in grupos]
+    resultados = ejecutar_en_paralelo(procesar_cortes, tareas, procesos=procesos)
+
+    # Se restituye el orden original de los cortes
+    filas = [None] * len(cortes)
+    for i, resumen in enumerate(resultados):
+        filas[i::n_grupos] = resumen
+    indice = pd.DataFrame(filas, columns=dimensiones + ['estudiantes', 'carpeta', 'errores'])
+    os.makedirs(salida, exist_ok=True)
+    indice.to_csv(os.path.join(salida, 'indice.csv'), index=False)
+
+    con_errores = int((indice['errores'] != '').sum())
+    if con_errores:
+        print(f"[ADVERTENCIA] {con_errores} cortes con errores (ver la columna 'errores' de indice.csv)")
+    print(f"[OK] {len(indice)} cortes guardados en: {salida}")
+    return indice
@@ -0,0 +1,232 @@
+"""
+Caché de gráficos por contenido
+Cada figura se identifica con un hash de los conteos que dibuja, del código
+que la dibuja y de los parámetros de estilo de matplotlib (tema oscuro,
+fuentes, colores). Si ese hash ya se generó antes, en modo lote se copia el
+PNG guardado en vez de volver a dibujar la figura (sin importar
+matplotlib.pyplot; matplotlib solo se importa al calcular la primera clave).
+La carpeta tiene un tamaño máximo: al pasarlo se borran los PNG usados hace
+más tiempo
+"""
+
+import glob
+import hashlib
+import inspect
+import io
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import config_graficos
+from carga_datos import RAIZ_PROYECTO
+from config_graficos import modo_lote_activo, mostrar_o_guardar, nombre_archivo_seguro, ruta_salida, titulo_figura
+from perfilado import etapa
+
+# Carpeta donde se guardan los PNG por hash (ignorada por git)
+DIRECTORIO_CACHE_GRAFICOS = os.path.join(RAIZ_PROYECTO, '.cache_graficos')
+
+# Subir este número invalida todas las imágenes guardadas
+VERSION_CACHE = 1
+
+# Tamaño máximo de la carpeta de la caché; cada cambio de datos, código o
+# estilo deja PNG que ya no se van a pedir y los más viejos se borran
+LIMITE_CACHE_GRAFICOS_MB = 200
+
+# Parámetros de matplotlib que no cambian la imagen final
+PARAMETROS_IGNORADOS = {'backend', 'backend_fallback', 'interactive'}
+
+
+# ============================================================================
+# CLAVE DE CADA FIGURA
+# ============================================================================
+
+def _agregar_valor(sha, valor):
+    """Agrega al hash un argumento de la función de dibujo"""
+    if isinstance(valor, (pd.Series, pd.DataFrame)):
+        sha.update(pd.util.hash_pandas_object(valor, index=True).to_numpy().tobytes())
+        etiquetas = valor.columns if isinstance(valor, pd.DataFrame) else [valor.name]
+        sha.update(repr((list(valor.index), list(etiquetas), str(valor.dtypes))).encode())
+    elif isinstance(valor, np.ndarray):
+        sha.update(repr((valor.dtype.str, valor.shape)).encode())
+        sha.update(np.ascontiguousarray(valor).tobytes())
+    else:
+        sha.update(repr(valor).encode())
+
+
+def _codigo_fuente(funcion):
+    """
+    Código del módulo de la función y de config_graficos: si cambia el dibujo,
+    un color o un tamaño definido en esos archivos, cambia la clave
+    """
+    partes = []
+    for modulo in (inspect.getmodule(funcion), config_graficos):
+        try:
+            partes.append(inspect.getsource(modulo))
+        except (OSError, TypeError):
+            partes.append(f"{funcion.__module__}.{funcion.__qualname__}")
+    return '\n'.join(partes)
+
+
+def _estilo_actual():
+    """Parámetros de estilo vigentes (plt.style.use, configurar_estilo_global)"""
+    import matplotlib
+
+    return repr(sorted((clave, repr(valor)) for clave, valor in matplotlib.rcParams.items()
+                       if clave not in PARAMETROS_IGNORADOS))
+
+
+def clave_grafico(dibujar, *args, **kwargs):
+    """
+    Hash SHA-256 que identifica la figura que produciría dibujar(*args, **kwargs).
+
+    Incluye los datos de entrada, el código que dibuja, el estilo vigente
+    y las versiones de matplotlib y de la caché.
+    """
+    import matplotlib
+
+    sha = hashlib.sha256()
+    sha.update(f"{VERSION_CACHE}|{matplotlib.__version__}|{dibujar.__module__}.{dibujar.__qualname__}".encode())
+    sha.update(_codigo_fuente(dibujar).encode())
+    for valor in args:
+        _agregar_valor(sha, valor)
+    for nombre in sorted(kwargs):
+        sha.update(nombre.encode())
+        _agregar_valor(sha, kwargs[nombre])
+    sha.update(_estilo_actual().encode())
+    return sha.hexdigest()
+
+
+# ============================================================================
+# DIBUJO CON CACHÉ
+# ============================================================================
+
+def _buscar_en_cache(clave, directorio_cache):
+    """PNG guardado para la clave y el título con que se guardó (o None)"""
+    patron = os.path.join(glob.escape(directorio_cache), f"{clave}__*.png")
+    for ruta in glob.glob(patron):
+        titulo = os.path.basename(ruta)[len(clave) + 2:-len('.png')]
+        try:
+            # La fecha de modificación marca el último uso (para _podar_cache)
+            os.utime(ruta)
+        except OSError:
+            pass
+        return ruta, titulo
+    return None
+
+
+def _podar_cache(directorio_cache, limite_mb=LIMITE_CACHE_GRAFICOS_MB):
+    """Borra los PNG usados hace más tiempo hasta que la caché quede bajo el límite"""
+    archivos = []
+    for ruta in glob.glob(os.path.join(glob.escape(directorio_cache), '*.png')):
+        try:
+            estado = os.stat(ruta)
+        except OSError:
+            continue
+        archivos.append((estado.st_mtime, estado.st_size, ruta))
+
+    sobrante = sum(tamano for _, tamano, _ in archivos) - limite_mb * 1024 * 1024
+    for _, tamano, ruta in sorted(archivos):
+        if sobrante <= 0:
+            break
+        try:
+            os.remove(ruta)
+        except OSError:
+            # Otro proceso la pudo borrar o la está leyendo
+            continue
+        sobrante -= tamano
+
+
+def _guardar_en_cache(datos, clave, titulo, directorio_cache):
+    """Guarda los bytes de un PNG en la caché (reemplazo atómico)"""
+    destino = os.path.join(directorio_cache, f"{clave}__{nombre_archivo_seguro(titulo or 'grafico')}.png")
+    temporal = f"{destino}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(directorio_cache, exist_ok=True)
+        with open(temporal, 'wb') as archivo:
+            archivo.write(datos)
+        os.replace(temporal, destino)
+    except OSError as e:
+        print(f"ADVERTENCIA: No se pudo guardar el gráfico en la caché ({e}).")
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        return
+    _podar_cache(directorio_cache)
+
+
+def graficar_con_cache(dibujar, *args, directorio_cache=DIRECTORIO_CACHE_GRAFICOS, **kwargs):
+    """
+    Dibuja una figura con dibujar(*args, **kwargs) y la muestra o guarda.
+
+    En modo lote, si ya existe un PNG con la misma clave se copia a la carpeta
+    de salida sin dibujar nada; si no, se dibuja, se guarda y se agrega a la
+    caché. Fuera del modo lote se dibuja siempre (la figura se muestra).
+
+    La función de dibujo solo debe depender de sus argumentos y del estilo
+    de matplotlib, y no debe llamar a plt.show() ni a mostrar_o_guardar().
+
+    Returns:
+        Ruta del PNG en modo lote, o None si la figura se mostró en pantalla
+    """
+    with etapa(f"grafico:{dibujar.__name__}"):
+        if not modo_lote_activo():
+            with etapa('dibujo'):
+                dibujar(*args, **kwargs)
+            return mostrar_o_guardar()
+
+        clave = clave_grafico(dibujar, *args, **kwargs)
+        encontrado = _buscar_en_cache(clave, directorio_cache)
+        if encontrado is not None:
+            ruta_cache, titulo = encontrado
+            destino = ruta_salida(titulo=titulo)
+            try:
+                with etapa('copia_cache'):
+                    shutil.copyfile(ruta_cache, destino)
+                return destino
+            except OSError as e:
+                print(f"ADVERTENCIA: No se pudo copiar el gráfico de la caché, se vuelve a dibujar ({e}).")
+
+        import matplotlib.pyplot as plt
+
+        with etapa('dibujo'):
+            dibujar(*args, **kwargs)
+        titulo = titulo_figura(plt.gcf())
+        ruta = mostrar_o_guardar()
+        with open(ruta, 'rb') as archivo:
+            _guardar_en_cache(archivo.read(), clave, titulo, directorio_cache)
+        return ruta
+
+
+def graficar_en_memoria(dibujar, *args, directorio_cache=DIRECTORIO_CACHE_GRAFICOS, **kwargs):
+    """
+    Dibuja una figura y devuelve su PNG como bytes, sin pasar por la carpeta
+    de salida (para incrustarla en un PDF con BytesIO).
+
+    Usa la misma caché que graficar_con_cache: si la clave ya existe se
+    devuelven los bytes guardados. Es una función de módulo para poder
+    ejecutarse en otro proceso.
+    """
+    with etapa(f"grafico:{dibujar.__name__}"):
+        clave = clave_grafico(dibujar, *args, **kwargs)
+        encontrado = _buscar_en_cache(clave, directorio_cache)
+        if encontrado is not None:
+            try:
+                with open(encontrado[0], 'rb') as archivo:
+                    return archivo.read()
+            except OSError as e:
+                print(f"ADVERTENCIA: No se pudo leer el gráfico de la caché, se vuelve a dibujar ({e}).")
+
+        import matplotlib.pyplot as plt
+
+        with etapa('dibujo'):
+            dibujar(*args, **kwargs)
+        fig = plt.gcf()
+        titulo = titulo_figura(fig)
+        buffer = io.BytesIO()
+        with etapa('guardado'):
+            fig.savefig(buffer, format='png', facecolor=fig.get_facecolor())
+        plt.close(fig)
+        datos = buffer.getvalue()
+        _guardar_en_cache(datos, clave, titulo, directorio_cache)
+        return datos
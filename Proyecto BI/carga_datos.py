@@ -0,0 +1,200 @@
+"""
+Carga centralizada de los archivos de la encuesta
+Este módulo convierte cada libro de Excel (o CSV) a formato columnar
+(Arrow/Feather) una sola vez y reutiliza esa copia mientras el archivo
+original no cambie. Los archivos Parquet ya son columnares y se leen directo
+"""
+
+import glob
+import hashlib
+import os
+
+import pandas as pd
+
+from perfilado import etapa
+
+# Importar pyarrow solo si está disponible
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    print("ADVERTENCIA: pyarrow no esta disponible. El Excel se leera completo en cada ejecucion.")
+
+
+# ============================================================================
+# RUTAS DE LOS ARCHIVOS DE DATOS
+# ============================================================================
+
+RAIZ_PROYECTO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+DIRECTORIO_DATOS = os.path.join(RAIZ_PROYECTO, 'data')
+
+ARCHIVO_RESPUESTAS = os.path.join(DIRECTORIO_DATOS, 'RecopilaciónDeDatos-BI(respuestas).xlsx')
+ARCHIVO_T03 = os.path.join(DIRECTORIO_DATOS, 'RecopilaciónDeDatos-BI_T03.xlsx')
+ARCHIVO_VOCACIONAL = os.path.join(RAIZ_PROYECTO, 'Proyecto BI', 'Encuesta_Vocacional_Completa.xlsx')
+
+# Carpeta donde se guardan las copias columnares (ignorada por git)
+DIRECTORIO_CACHE = os.path.join(RAIZ_PROYECTO, '.cache_datos')
+
+# Tamaño de bloque para calcular el hash sin cargar el archivo completo
+TAMANO_BLOQUE_HASH = 1024 * 1024
+
+# Caracteres del hash de la ruta en el nombre de las copias
+LARGO_HASH_RUTA = 8
+
+
+# ============================================================================
+# FUNCIONES DE CACHÉ
+# ============================================================================
+
+def calcular_hash_archivo(ruta):
+    """Calcula el hash SHA-256 del contenido de un archivo"""
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(TAMANO_BLOQUE_HASH), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def _nombre_base(ruta_excel):
+    """Nombre del archivo sin extensión (el CSV lleva la suya para no chocar con el xlsx)"""
+    nombre, extension = os.path.splitext(os.path.basename(ruta_excel))
+    if extension.lower() == '.csv':
+        nombre = f"{nombre}_csv"
+    return nombre
+
+
+def _nombre_cache(ruta_excel):
+    """
+    Nombre base de las copias de un archivo: su nombre y un hash corto de su
+    ruta absoluta, para que dos archivos con el mismo nombre en carpetas
+    distintas (los RecopilacionDeDatos.xlsx de las secciones) no compartan copia
+    """
+    ruta = os.path.normcase(os.path.abspath(ruta_excel))
+    return f"{_nombre_base(ruta_excel)}_{hashlib.sha256(ruta.encode('utf-8')).hexdigest()[:LARGO_HASH_RUTA]}"
+
+
+def ruta_cache(ruta_excel, hash_archivo, directorio_cache=DIRECTORIO_CACHE):
+    """Devuelve la ruta de la copia columnar asociada a un Excel y su hash"""
+    return os.path.join(directorio_cache, f"{_nombre_cache(ruta_excel)}_{hash_archivo[:16]}.feather")
+
+
+def _guardar_cache(df, destino):
+    """Escribe el DataFrame en formato Feather sin compresión (apto para mmap)"""
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    temporal = f"{destino}.{os.getpid()}.tmp"
+    try:
+        tabla = pa.Table.from_pandas(df, preserve_index=False)
+        feather.write_feather(tabla, temporal, compression='uncompressed')
+        # Reemplazo atómico para que otro proceso nunca lea un archivo a medias
+        os.replace(temporal, destino)
+        return True
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OSError) as e:
+        print(f"ADVERTENCIA: No se pudo guardar la copia columnar ({e}).")
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        return False
+
+
+def _eliminar_versiones_antiguas(ruta_excel, destino, directorio_cache):
+    """
+    Borra las copias de versiones anteriores del mismo Excel (misma ruta) y
+    las del formato anterior, cuyo nombre no llevaba el hash de la ruta
+    """
+    hash_contenido = '[0-9a-f]' * 16
+    patrones = [f"{glob.escape(_nombre_cache(ruta_excel))}_{hash_contenido}.feather",
+                f"{glob.escape(_nombre_base(ruta_excel))}_{hash_contenido}.feather"]
+    for patron in patrones:
+        for antigua in glob.glob(os.path.join(glob.escape(directorio_cache), patron)):
+            if os.path.abspath(antigua) != os.path.abspath(destino):
+                try:
+                    os.remove(antigua)
+                except OSError:
+                    pass
+
+
+def _leer_original(ruta):
+    """Lee el archivo original según su extensión (.xlsx, .csv o .parquet)"""
+    extension = os.path.splitext(ruta)[1].lower()
+    with etapa(f"lectura_{extension.lstrip('.') or 'original'}"):
+        if extension == '.csv':
+            return pd.read_csv(ruta)
+        if extension == '.parquet':
+            return pd.read_parquet(ruta)
+        return pd.read_excel(ruta)
+
+
+def cargar_encuesta(ruta=ARCHIVO_RESPUESTAS, directorio_cache=DIRECTORIO_CACHE, usar_cache=True):
+    """
+    Carga un archivo de la encuesta usando la copia columnar cuando existe.
+
+    La primera vez se lee el Excel con pandas y se guarda en Feather; las
+    siguientes cargas mapean en memoria esa copia. Solo se vuelve a leer el
+    Excel cuando cambia su contenido (se compara el hash SHA-256).
+
+    Args:
+        ruta: Ruta al archivo .xlsx (también acepta .csv y .parquet)
+        directorio_cache: Carpeta donde se guardan las copias columnares
+        usar_cache: Si es False se lee siempre el Excel original
+
+    Returns:
+        DataFrame con las columnas originales del archivo
+    """
+    if not usar_cache or not PYARROW_AVAILABLE or ruta.lower().endswith('.parquet'):
+        return _leer_original(ruta)
+
+    hash_archivo = calcular_hash_archivo(ruta)
+    destino = ruta_cache(ruta, hash_archivo, directorio_cache)
+
+    if os.path.exists(destino):
+        try:
+            with etapa('lectura_cache'):
+                tabla = feather.read_table(destino, memory_map=True)
+                return tabla.to_pandas()
+        except (pa.ArrowInvalid, OSError) as e:
+            print(f"ADVERTENCIA: Copia columnar dañada, se vuelve a leer el Excel ({e}).")
+
+    df = _leer_original(ruta)
+    if _guardar_cache(df, destino):
+        _eliminar_versiones_antiguas(ruta, destino, directorio_cache)
+    return df
+
+
+# ============================================================================
+# LIMPIEZA DE NOMBRES DE COLUMNAS
+# ============================================================================
+
+def normalizar_columnas(df):
+    """
+    Limpia los encabezados exportados por Google Forms.
+
+    Quita espacios en los extremos, espacios de ancho cero, saltos de línea
+    y el asterisco final de las preguntas obligatorias ('Género *' -> 'Género').
+    No modifica el DataFrame recibido: devuelve una copia superficial.
+    """
+    columnas = (df.columns.str.replace('\u200b', '', regex=False)
+                          .str.replace('\n', '', regex=False)
+                          .str.strip()
+                          .str.replace(r'\s*\*$', '', regex=True)
+                          .str.strip())
+    df_normalizado = df.copy(deep=False)
+    df_normalizado.columns = columnas
+    return df_normalizado
+
+
+def cargar_encuesta_normalizada(ruta=ARCHIVO_RESPUESTAS, categorizar=True, **kwargs):
+    """
+    Carga un archivo de la encuesta y normaliza sus encabezados.
+
+    Con `categorizar` las preguntas registradas en esquema.py se convierten
+    a categóricas ordenadas (un código int8 por respuesta).
+    """
+    with etapa('carga', archivo=os.path.basename(ruta)):
+        df = cargar_encuesta(ruta, **kwargs)
+    with etapa('normalizacion'):
+        df = normalizar_columnas(df)
+        if categorizar:
+            from esquema import aplicar_esquema
+            df = aplicar_esquema(df)
+    return df
@@ -1,10 +1,14 @@
 """
 Configuración de estilos y parámetros visuales para los gráficos
-Este módulo centraliza todas las configuraciones de matplotlib
+Este módulo centraliza todas las configuraciones de matplotlib.
+matplotlib y seaborn se importan recién al dibujar o guardar un gráfico, así
+los scripts que solo imprimen conteos no cargan la librería de gráficos
 """
 
-import matplotlib.pyplot as plt
-import seaborn as sns
+import os
+import re
+
+from perfilado import etapa
 
 # ============================================================================
 # CONFIGURACIÓN GLOBAL DE MATPLOTLIB
@@ -12,6 +16,9 @@ import seaborn as sns
 
 def configurar_estilo_global():
     """Configura el estilo global de matplotlib con tema oscuro"""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     plt.style.use('seaborn-v0_8-whitegrid')
     sns.set_palette("viridis")
     
@@ -126,3 +133,101 @@ def aplicar_etiquetas(ax, xlabel=None, ylabel=None, color=COLOR_TEXTO):
     if ylabel:
         ax.set_ylabel(ylabel, fontsize=TAMANO_ETIQUETA, fontweight='bold', color=color)
 
+
+# ============================================================================
+# MODO LOTE (SIN PANTALLA)
+# ============================================================================
+# En modo lote los gráficos no abren ventana: se guardan como PNG en una
+# carpeta y se cierran. Se activa con activar_modo_lote() o definiendo la
+# variable de entorno BI_GRAFICOS_SALIDA con la carpeta de destino.
+
+VARIABLE_SALIDA = 'BI_GRAFICOS_SALIDA'
+
+_modo_lote = {'directorio': None, 'prefijo': '', 'contador': 0}
+
+
+def activar_modo_lote(directorio, prefijo=''):
+    """Usa el backend Agg y guarda los gráficos siguientes en `directorio`"""
+    import matplotlib
+    matplotlib.use('Agg')
+    os.makedirs(directorio, exist_ok=True)
+    _modo_lote['directorio'] = directorio
+    _modo_lote['prefijo'] = prefijo
+    _modo_lote['contador'] = 0
+
+
+def modo_lote_activo():
+    """Indica si los gráficos se están guardando en lugar de mostrarse"""
+    return _modo_lote['directorio'] is not None
+
+
+def directorio_salida(subcarpeta=None):
+    """Carpeta de salida del modo lote (None si no está activo)"""
+    directorio = _modo_lote['directorio']
+    if directorio is None or subcarpeta is None:
+        return directorio
+    ruta = os.path.join(directorio, subcarpeta)
+    os.makedirs(ruta, exist_ok=True)
+    return ruta
+
+
+def nombre_archivo_seguro(texto, largo=60):
+    """Convierte un título en un nombre de archivo válido"""
+    nombre = re.sub(r'[^\w\-]+', '_', str(texto))[:largo].strip('_')
+    return nombre or 'grafico'
+
+
+def titulo_figura(fig):
+    """Primer título visible de la figura (suptitle, título de ejes o texto)"""
+    if fig._suptitle is not None and fig._suptitle.get_text():
+        return fig._suptitle.get_text()
+    for ax in fig.axes:
+        for loc in ('center', 'left', 'right'):
+            if ax.get_title(loc=loc):
+                return ax.get_title(loc=loc)
+    for texto in fig.texts:
+        if texto.get_text().strip():
+            return texto.get_text()
+    return None
+
+
+def ruta_salida(nombre=None, titulo=None):
+    """
+    Ruta del próximo PNG en modo lote.
+
+    Con `nombre` se usa tal cual; si no, el archivo se numera y se nombra
+    con `titulo` (el título de la figura).
+    """
+    _modo_lote['contador'] += 1
+    if nombre is None:
+        nombre = f"{_modo_lote['contador']:02d}_{nombre_archivo_seguro(titulo or 'grafico')}"
+    return os.path.join(_modo_lote['directorio'], f"{_modo_lote['prefijo']}{nombre}.png")
+
+
+def mostrar_o_guardar(nombre=None, fig=None):
+    """
+    Reemplaza a plt.show() en todos los gráficos del proyecto.
+
+    Fuera del modo lote muestra la figura como siempre. En modo lote la
+    guarda en la carpeta de salida y la cierra. Sin `nombre` el archivo se
+    numera y se nombra con el título de la figura.
+
+    Returns:
+        Ruta del PNG guardado, o None si se mostró en pantalla
+    """
+    import matplotlib.pyplot as plt
+
+    if not modo_lote_activo():
+        plt.show()
+        return None
+
+    fig = fig if fig is not None else plt.gcf()
+    ruta = ruta_salida(nombre, titulo_figura(fig))
+    with etapa('guardado'):
+        fig.savefig(ruta, facecolor=fig.get_facecolor())
+    plt.close(fig)
+    return ruta
+
+
+if os.environ.get(VARIABLE_SALIDA):
+    activar_modo_lote(os.environ[VARIABLE_SALIDA])
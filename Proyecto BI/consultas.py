@@ -0,0 +1,293 @@
+"""
+Consultas sobre cortes de la encuesta
+Cada sección repetía la misma cadena: filtrar, value_counts, reindex y
+porcentajes. Aquí esa cadena se describe una vez y se ejecuta al final:
+
+    consulta = encuesta(df)
+    consulta.filtrar(Grado='5°').agrupar_por('Distrito').contar('Dificultad_Costos').ejecutar()
+
+(filtrar / agrupar_por / contar equivalen a where / group_by / count). Los
+pasos solo se anotan; nada se calcula hasta ejecutar() o ejecutar_consultas().
+Al ejecutar:
+
+- Si hay cubo y los filtros y el desglose son dimensiones del cubo (Género,
+  Edad, Grado, Distrito, Colegio), el conteo se lee del cubo sin recorrer
+  los datos.
+- Si no, las filas de cada filtro distinto se calculan una sola vez con los
+  mapas de bits de indices.py (y quedan guardadas para las siguientes
+  consultas) y todas las preguntas que comparten filtro y desglose se
+  cuentan juntas con un único np.bincount.
+"""
+
+import numpy as np
+import pandas as pd
+
+from cubo import DIMENSIONES, codificar, consultar_cubo, construir_cubo, resolver_pregunta, total_cubo
+from esquema import ESQUEMA, codigos_respuestas
+from indices import filas_de_mapa, mapa_filtros
+from perfilado import perfilar
+
+
+# ============================================================================
+# CONSULTA
+# ============================================================================
+
+class Consulta:
+    """
+    Descripción de un corte de la encuesta (filtros, desglose y conteos).
+
+    Cada método devuelve una consulta nueva, así que una consulta base se
+    puede reutilizar para armar varias. Todas las consultas que salen de
+    la misma encuesta() comparten las filas ya filtradas y el cubo.
+    """
+
+    def __init__(self, contexto, filtros=None, por=None, preguntas=(), categorias=None, porcentaje=False):
+        self.contexto = contexto
+        self.filtros = dict(filtros or {})
+        self.por = por
+        self.preguntas = tuple(preguntas)
+        self.categorias = categorias
+        self.porcentaje = porcentaje
+
+    def _copiar(self, **cambios):
+        valores = {'filtros': self.filtros, 'por': self.por, 'preguntas': self.preguntas,
+                   'categorias': self.categorias, 'porcentaje': self.porcentaje}
+        valores.update(cambios)
+        return Consulta(self.contexto, **valores)
+
+    def filtrar(self, filtros=None, **por_nombre):
+        """
+        Agrega filtros: filtrar(Grado='5°', Genero=['Femenino']) o
+        filtrar({'¿Qué modalidad de estudio prefieres?': 'Virtual'}).
+        Las claves son dimensiones, nombres canónicos de esquema.py o encabezados.
+        """
+        return self._copiar(filtros={**self.filtros, **(filtros or {}), **por_nombre})
+
+    def agrupar_por(self, dimension):
+        """Desglosa los conteos por los valores de una columna (una columna por valor)"""
+        return self._copiar(por=dimension)
+
+    def contar(self, *preguntas, categorias=None, porcentaje=False):
+        """
+        Conteo de respuestas de una o varias preguntas.
+
+        Args:
+            preguntas: Nombres canónicos o encabezados (sin preguntas se
+                       cuentan los encuestados del corte)
+            categorias: Orden de las opciones (como value_counts().reindex)
+            porcentaje: Devolver porcentajes del total del corte (o de cada grupo)
+        """
+        return self._copiar(preguntas=preguntas, categorias=categorias, porcentaje=porcentaje)
+
+    def ejecutar(self):
+        """Resultado de esta consulta (ver ejecutar_consultas)"""
+        return ejecutar_consultas([self])[0]
+
+    def __repr__(self):
+        return (f"Consulta(filtros={self.filtros}, por={self.por!r}, "
+                f"preguntas={list(self.preguntas)}, porcentaje={self.porcentaje})")
+
+
+def encuesta(df, cubo=None):
+    """
+    Consulta sin filtros sobre un DataFrame normalizado.
+
+    Args:
+        df: DataFrame con encabezados normalizados (renombrado o no)
+        cubo: Cubo de conteos ya construido; con True se construye la primera
+              vez que una consulta lo puede usar (conviene cuando se piden
+              muchos cortes por dimensiones)
+    """
+    contexto = {'df': df, 'cubo': cubo, 'indices': None, 'filas': {}}
+    return Consulta(contexto)
+
+
+# ============================================================================
+# EJECUCIÓN
+# ============================================================================
+
+def _columna(df, nombre):
+    """Columna de df que corresponde a una dimensión, un nombre canónico o un encabezado"""
+    candidatas = list(DIMENSIONES.get(nombre, []))
+    if nombre in ESQUEMA:
+        candidatas.append(ESQUEMA[nombre][0])
+    candidatas.append(nombre)
+    for columna in candidatas:
+        if columna in df.columns:
+            return columna
+    raise KeyError(f"La columna '{nombre}' no está en los datos")
+
+
+def _cubo(contexto):
+    """Cubo del contexto (se construye aquí si se pidió con cubo=True)"""
+    if contexto['cubo'] is True:
+        contexto['cubo'] = construir_cubo(contexto['df'])
+    return contexto['cubo']
+
+
+def _usa_cubo(consulta):
+    """True si la consulta se puede responder solo con el cubo"""
+    if consulta.contexto['cubo'] is None:
+        return False
+    dimensiones = set(consulta.filtros) | ({consulta.por} if consulta.por is not None else set())
+    if not dimensiones <= set(DIMENSIONES):
+        return False
+    cubo = _cubo(consulta.contexto)
+    if not dimensiones <= set(cubo['dimensiones']):
+        return False
+    return all(resolver_pregunta(cubo, pregunta) for pregunta in consulta.preguntas)
+
+
+def _clave_filtros(filtros):
+    """Clave estable de un diccionario de filtros (los valores pueden ser listas)"""
+    clave = []
+    for nombre, valor in sorted(filtros.items()):
+        valores = tuple(sorted(map(str, valor))) if isinstance(valor, (list, tuple, set)) else (str(valor),)
+        clave.append((nombre, valores))
+    return tuple(clave)
+
+
+def _filas(contexto, filtros):
+    """Posiciones de las filas que cumplen los filtros (se calculan una vez por filtro)"""
+    clave = _clave_filtros(filtros)
+    if clave not in contexto['filas']:
+        df = contexto['df']
+        if contexto['indices'] is None:
+            # Los mapas de bits se crean a medida que los filtros los piden
+            contexto['indices'] = {'n_filas': len(df), 'mapas': {}}
+        # Las dimensiones se indexan por su nombre; el resto por su encabezado
+        por_columna = {nombre if nombre in DIMENSIONES else _columna(df, nombre): valor
+                       for nombre, valor in filtros.items()}
+        mapa, _ = mapa_filtros(contexto['indices'], por_columna, df)
+        contexto['filas'][clave] = filas_de_mapa(mapa, len(df))
+    return contexto['filas'][clave]
+
+
+def _conteos_fusionados(contexto, filtros, por, preguntas):
+    """
+    Conteos de varias preguntas sobre el mismo corte con un solo np.bincount.
+
+    Returns:
+        (pregunta -> arreglo grupos x opciones, pregunta -> opciones,
+        etiquetas de los grupos (None sin desglose), encuestados por grupo)
+    """
+    df = contexto['df']
+    filas = _filas(contexto, filtros) if filtros else None
+
+    if por is None:
+        etiquetas_grupos = None
+        grupos = np.zeros(len(df) if filas is None else len(filas), dtype=np.intp)
+    else:
+        grupos, etiquetas_grupos = codificar(df[_columna(df, por)])
+        if filas is not None:
+            grupos = grupos[filas]
+    n_grupos = 1 if etiquetas_grupos is None else len(etiquetas_grupos)
+
+    codigos = {}
+    opciones = {}
+    for pregunta in preguntas:
+        codigos[pregunta], opciones[pregunta] = codigos_respuestas(df[_columna(df, pregunta)])
+        if filas is not None:
+            codigos[pregunta] = codigos[pregunta][filas]
+    total_opciones = sum(len(o) for o in opciones.values())
+
+    # Cada respuesta se convierte en su posición (grupo, opción) dentro de una
+    # tabla con las opciones de todas las preguntas una al lado de la otra
+    desplazamientos = {}
+    posiciones = []
+    inicio = 0
+    for pregunta in preguntas:
+        validas = codigos[pregunta] >= 0
+        posiciones.append(grupos[validas] * total_opciones + inicio + codigos[pregunta][validas])
+        desplazamientos[pregunta] = inicio
+        inicio += len(opciones[pregunta])
+
+    posiciones = np.concatenate(posiciones) if posiciones else np.zeros(0, dtype=np.intp)
+    tabla = np.bincount(posiciones, minlength=n_grupos * total_opciones).reshape(n_grupos, total_opciones)
+    conteos = {p: tabla[:, desplazamientos[p]:desplazamientos[p] + len(opciones[p])] for p in preguntas}
+    return conteos, opciones, etiquetas_grupos, np.bincount(grupos, minlength=n_grupos)
+
+
+def _formatear(consulta, conteo):
+    """Series (o DataFrame opción x grupo) con el orden y la escala pedidos"""
+    if consulta.categorias is not None:
+        conteo = conteo.reindex(consulta.categorias, fill_value=0)
+    if consulta.porcentaje:
+        # Porcentaje del total del corte (de cada columna con agrupar_por)
+        totales = conteo.sum()
+        totales = totales.where(totales > 0, 1) if consulta.por else (totales or 1)
+        conteo = conteo / totales * 100
+    return conteo
+
+
+def _resultado_cubo(consulta):
+    """Conteos leídos del cubo"""
+    cubo = _cubo(consulta.contexto)
+    if not consulta.preguntas:
+        return total_cubo(cubo, consulta.filtros, consulta.por)
+    return {pregunta: consultar_cubo(cubo, pregunta, consulta.filtros, por=consulta.por)
+            for pregunta in consulta.preguntas}
+
+
+def _resultado_fusionado(consulta, calculado):
+    """Conteos de una consulta tomados de la tabla de su grupo"""
+    conteos, opciones, etiquetas_grupos, encuestados = calculado
+    if etiquetas_grupos is not None:
+        columnas = pd.Index(etiquetas_grupos, name=consulta.por)
+    if not consulta.preguntas:
+        if etiquetas_grupos is None:
+            return int(encuestados[0])
+        return pd.Series(encuestados, index=columnas, name='count')
+
+    resultado = {}
+    for pregunta in consulta.preguntas:
+        indice = pd.Index(opciones[pregunta], name=pregunta)
+        if etiquetas_grupos is None:
+            resultado[pregunta] = pd.Series(conteos[pregunta][0], index=indice, name='count')
+        else:
+            resultado[pregunta] = pd.DataFrame(conteos[pregunta].T, index=indice, columns=columnas)
+    return resultado
+
+
+@perfilar('consultas')
+def ejecutar_consultas(consultas):
+    """
+    Ejecuta varias consultas de una vez.
+
+    Las que se pueden responder con el cubo lo leen directamente. Las demás
+    se agrupan por (filtros, desglose): las filas de cada grupo se calculan
+    una sola vez y todas las preguntas del grupo se cuentan con un único
+    np.bincount.
+
+    Returns:
+        Lista con el resultado de cada consulta, en el mismo orden: una
+        Series por opción (DataFrame opción x grupo con agrupar_por), un
+        diccionario pregunta -> resultado si se contaron varias preguntas, o
+        el número de encuestados si no se indicó ninguna pregunta
+    """
+    # Preguntas de cada grupo que no se puede leer del cubo
+    grupos = {}
+    for consulta in consultas:
+        if not _usa_cubo(consulta):
+            clave = (id(consulta.contexto), _clave_filtros(consulta.filtros), consulta.por)
+            preguntas = grupos.setdefault(clave, [])
+            preguntas.extend(p for p in consulta.preguntas if p not in preguntas)
+
+    calculados = {}
+    resultados = []
+    for consulta in consultas:
+        if _usa_cubo(consulta):
+            resultado = _resultado_cubo(consulta)
+        else:
+            clave = (id(consulta.contexto), _clave_filtros(consulta.filtros), consulta.por)
+            if clave not in calculados:
+                calculados[clave] = _conteos_fusionados(consulta.contexto, consulta.filtros,
+                                                        consulta.por, grupos[clave])
+            resultado = _resultado_fusionado(consulta, calculados[clave])
+
+        if isinstance(resultado, dict):
+            resultado = {p: _formatear(consulta, r) for p, r in resultado.items()}
+            if len(resultado) == 1:
+                resultado = next(iter(resultado.values()))
+        resultados.append(resultado)
+    return resultados
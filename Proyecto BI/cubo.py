@@ -0,0 +1,334 @@
+"""
+Cubo de conteos de la encuesta
+Precalcula, en una sola pasada sobre los encuestados, cuántas veces se eligió
+cada opción de cada pregunta en cada combinación de Género, Edad, Grado,
+Distrito y Colegio que tiene al menos un encuestado. Las combinaciones vacías
+no se guardan (el colegio va dentro del distrito, así que casi todos los
+pares colegio/distrito son imposibles) y los totales por dimensión se suman
+al consultar, así que cualquier corte que muestran los gráficos o el reporte
+se resuelve sobre las celdas guardadas, sin volver a recorrer los datos
+"""
+
+import numpy as np
+import pandas as pd
+
+from esquema import ESQUEMA
+from perfilado import perfilar
+
+# ============================================================================
+# DIMENSIONES DEL CUBO
+# ============================================================================
+# nombre canónico -> encabezados posibles (normalizados o ya renombrados)
+
+DIMENSIONES = {
+    'Genero': ['Género', 'Genero'],
+    'Edad': ['¿Cuál es tu edad?', 'Edad'],
+    'Grado': ['¿En qué grado estás actualmente?', 'Grado'],
+    'Distrito': ['¿En qué distrito vives?', '¿En qué distrito o comunidad vives?', 'Distrito'],
+    'Colegio': ['Nombre de tu colegio:', 'Nombre de tu Institucion:', 'Colegio'],
+}
+
+
+def _buscar_columna(df, candidatas):
+    """Devuelve la primera columna de `candidatas` presente en df"""
+    for columna in candidatas:
+        if columna in df.columns:
+            return columna
+    return None
+
+
+def codificar(serie):
+    """
+    Códigos enteros y etiquetas de una columna (los vacíos cuentan como valor).
+    consultas.py agrupa con esta misma función para que el desglose sin cubo
+    tenga los mismos grupos que el del cubo.
+    """
+    codigos, etiquetas = pd.factorize(serie, sort=True, use_na_sentinel=False)
+    return codigos, list(etiquetas)
+
+
+def _mapa_posiciones(etiquetas):
+    """Posición de cada etiqueta (los vacíos no se pueden filtrar, igual que con ==)"""
+    return {etiqueta: i for i, etiqueta in enumerate(etiquetas) if not pd.isna(etiqueta)}
+
+
+# ============================================================================
+# CONSTRUCCIÓN
+# ============================================================================
+
+def _celdas_observadas(codigos, forma, n_filas):
+    """
+    Combinaciones de dimensiones presentes en los datos.
+
+    Returns:
+        (códigos de cada celda, matriz celdas x dimensiones; celda de cada fila)
+    """
+    if not forma:
+        return np.zeros((min(n_filas, 1), 0), dtype=np.int32), np.zeros(n_filas, dtype=np.intp)
+    observadas, celda = np.unique(np.ravel_multi_index(codigos, forma), return_inverse=True)
+    celdas = np.column_stack(np.unravel_index(observadas, forma)).astype(np.int32)
+    return celdas, celda
+
+
+@perfilar('cubo')
+def construir_cubo(df, preguntas=None):
+    """
+    Construye el cubo de conteos de un DataFrame normalizado.
+
+    Args:
+        df: DataFrame con encabezados normalizados (renombrados o no)
+        preguntas: Columnas a incluir; por defecto todas las categóricas
+
+    Returns:
+        Diccionario con las dimensiones, sus etiquetas, las celdas con
+        encuestados ('celdas': código de cada dimensión por celda) y los
+        conteos de cada pregunta (un arreglo celdas x opciones por pregunta)
+    """
+    # Dimensiones presentes y su código por fila
+    dimensiones = []
+    etiquetas = {}
+    columnas = {}
+    codigos = []
+    for nombre, candidatas in DIMENSIONES.items():
+        columna = _buscar_columna(df, candidatas)
+        if columna is None:
+            continue
+        codigos_dim, etiquetas_dim = codificar(df[columna])
+        dimensiones.append(nombre)
+        etiquetas[nombre] = etiquetas_dim
+        columnas[nombre] = columna
+        codigos.append(codigos_dim)
+
+    forma = tuple(len(etiquetas[d]) for d in dimensiones)
+    celdas, celda = _celdas_observadas(codigos, forma, len(df))
+    n_celdas = len(celdas)
+
+    columnas_dimension = {c for candidatas in DIMENSIONES.values() for c in candidatas}
+    if preguntas is None:
+        preguntas = [c for c in df.columns
+                     if isinstance(df[c].dtype, pd.CategoricalDtype) and c not in columnas_dimension]
+
+    # Cada respuesta se convierte en su posición (celda, opción) y se cuentan
+    # con bincount; el arreglo de cada pregunta solo tiene las celdas observadas
+    categorias = {}
+    conteos = {}
+    for pregunta in preguntas:
+        serie = df[pregunta]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            codigos_p = serie.cat.codes.to_numpy()
+            categorias[pregunta] = list(serie.cat.categories)
+        else:
+            codigos_p, cats = pd.factorize(serie, sort=True)
+            categorias[pregunta] = list(cats)
+        n_opciones = len(categorias[pregunta])
+        validas = codigos_p >= 0
+        conteo = np.bincount(celda[validas] * n_opciones + codigos_p[validas], minlength=n_celdas * n_opciones)
+        conteos[pregunta] = conteo.astype(np.int32).reshape(n_celdas, n_opciones)
+
+    return {
+        'dimensiones': dimensiones,
+        'etiquetas': etiquetas,
+        'columnas': columnas,
+        'posiciones': {d: _mapa_posiciones(etiquetas[d]) for d in dimensiones},
+        'celdas': celdas,
+        'categorias': categorias,
+        'conteos': conteos,
+        'respondentes': np.bincount(celda, minlength=n_celdas).astype(np.int32),
+        'alias': _alias_preguntas(preguntas),
+    }
+
+
+def _alias_preguntas(preguntas):
+    """Alias: una pregunta se puede consultar por su encabezado o su nombre canónico"""
+    alias = {p: p for p in preguntas}
+    for nombre, (encabezado, _) in ESQUEMA.items():
+        for presente, otro in ((encabezado, nombre), (nombre, encabezado)):
+            if presente in preguntas:
+                alias.setdefault(otro, presente)
+    return alias
+
+
+# ============================================================================
+# COMBINACIÓN (CONTEOS INCREMENTALES)
+# ============================================================================
+
+def _orden_valores(columna, valores):
+    """
+    Valores de una columna en el mismo orden que tendrían en construir_cubo
+    sobre todos los datos (orden del esquema o alfabético, vacíos al final)
+    """
+    from esquema import aplicar_esquema
+    serie = aplicar_esquema(pd.DataFrame({columna: pd.Series(valores, dtype=object)}))[columna]
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        orden = {v: i for i, v in enumerate(serie.cat.categories)}
+        return sorted(valores, key=lambda v: (pd.isna(v), orden.get(v, len(orden))))
+    return codificar(serie)[1]
+
+
+def _reubicar(arreglo, filas, columnas, forma):
+    """Suma las celdas de un arreglo en otro de `forma` según sus posiciones nuevas"""
+    resultado = np.zeros(forma, dtype=np.int32)
+    if arreglo.size:
+        resultado[np.ix_(filas, columnas)] += arreglo
+    return resultado
+
+
+def combinar_cubos(cubo, delta):
+    """
+    Suma dos cubos (ej. el guardado y el de las filas nuevas).
+
+    Las etiquetas y opciones que solo aparecen en uno se agregan en el orden
+    en que construir_cubo las pondría con todos los datos, así el resultado es
+    igual al cubo de todas las filas juntas.
+    """
+    if cubo['dimensiones'] != delta['dimensiones']:
+        raise ValueError(f"Los cubos tienen dimensiones distintas: {cubo['dimensiones']} y {delta['dimensiones']}")
+    dimensiones = cubo['dimensiones']
+
+    etiquetas = {}
+    for d in dimensiones:
+        conocidas = cubo['etiquetas'][d]
+        nuevas = [e for e in delta['etiquetas'][d] if not pd.isna(e) and e not in cubo['posiciones'][d]]
+        con_vacios = any(pd.isna(e) for e in conocidas + delta['etiquetas'][d])
+        if nuevas or con_vacios != any(pd.isna(e) for e in conocidas):
+            valores = [e for e in conocidas if not pd.isna(e)] + nuevas + ([np.nan] if con_vacios else [])
+            etiquetas[d] = _orden_valores(cubo['columnas'][d], valores)
+        else:
+            etiquetas[d] = conocidas
+    posiciones = {d: _mapa_posiciones(etiquetas[d]) for d in dimensiones}
+    forma = tuple(len(etiquetas[d]) for d in dimensiones)
+
+    def codigos_nuevos(origen):
+        """Celdas de `origen` con los códigos de las etiquetas combinadas"""
+        mapas = [np.array([len(etiquetas[d]) - 1 if pd.isna(e) else posiciones[d][e]
+                           for e in origen['etiquetas'][d]], dtype=np.intp) for d in dimensiones]
+        return [mapa[origen['celdas'][:, eje]] for eje, mapa in enumerate(mapas)]
+
+    # Celdas de los dos cubos juntas; filas[id] es la celda nueva de cada celda de ese cubo
+    partes_celdas = [codigos_nuevos(c) for c in (cubo, delta)]
+    celdas, celda = _celdas_observadas([np.concatenate(ejes) for ejes in zip(*partes_celdas)],
+                                       forma, len(cubo['celdas']) + len(delta['celdas']))
+    filas = {id(cubo): celda[:len(cubo['celdas'])], id(delta): celda[len(cubo['celdas']):]}
+    n_celdas = len(celdas)
+
+    categorias = {}
+    conteos = {}
+    preguntas = list(cubo['conteos']) + [p for p in delta['conteos'] if p not in cubo['conteos']]
+    for pregunta in preguntas:
+        partes = [c for c in (cubo, delta) if pregunta in c['conteos']]
+        opciones = list(partes[0]['categorias'][pregunta])
+        nuevas = [o for p in partes[1:] for o in p['categorias'][pregunta] if o not in opciones]
+        categorias[pregunta] = _orden_valores(pregunta, opciones + nuevas) if nuevas else opciones
+
+        orden = {o: i for i, o in enumerate(categorias[pregunta])}
+        total = np.zeros((n_celdas, len(orden)), dtype=np.int32)
+        for parte in partes:
+            mapa_opciones = np.array([orden[o] for o in parte['categorias'][pregunta]], dtype=np.intp)
+            total += _reubicar(parte['conteos'][pregunta], filas[id(parte)], mapa_opciones, total.shape)
+        conteos[pregunta] = total
+
+    respondentes = np.zeros(n_celdas, dtype=np.int32)
+    for c in (cubo, delta):
+        respondentes[filas[id(c)]] += c['respondentes']
+
+    return {
+        'dimensiones': dimensiones,
+        'etiquetas': etiquetas,
+        'columnas': cubo['columnas'],
+        'posiciones': posiciones,
+        'celdas': celdas,
+        'categorias': categorias,
+        'conteos': conteos,
+        'respondentes': respondentes,
+        'alias': _alias_preguntas(preguntas),
+    }
+
+
+# ============================================================================
+# CONSULTAS
+# ============================================================================
+
+def _indices_valor(cubo, dimension, valor):
+    """Posiciones de uno o varios valores de una dimensión (ignora los ausentes)"""
+    valores = valor if isinstance(valor, (list, tuple, set)) else [valor]
+    posiciones = cubo['posiciones'][dimension]
+    indices = []
+    for v in valores:
+        i = posiciones.get(v)
+        if i is not None and i not in indices:
+            indices.append(i)
+    return indices
+
+
+def _seleccionar(arreglo, cubo, filtros, por=None):
+    """
+    Suma las celdas de un arreglo del cubo que cumplen los filtros.
+
+    Las dimensiones sin filtro se suman completas (el margen "todos"). La
+    dimensión `por` se conserva como primer eje del resultado, con una
+    posición por cada una de sus etiquetas.
+    """
+    filtros = filtros or {}
+    for clave in filtros:
+        if clave not in DIMENSIONES:
+            raise ValueError(f"'{clave}' no es una dimensión del cubo ({', '.join(DIMENSIONES)})")
+    if por is not None and por not in cubo['dimensiones']:
+        raise ValueError(f"La dimensión '{por}' no existe en los datos")
+
+    celdas = cubo['celdas']
+    seleccion = np.ones(len(celdas), dtype=bool)
+    for eje, dimension in enumerate(cubo['dimensiones']):
+        if dimension in filtros:
+            seleccion &= np.isin(celdas[:, eje], _indices_valor(cubo, dimension, filtros[dimension]))
+
+    if por is None:
+        return arreglo[seleccion].sum(axis=0, dtype=np.int64)
+    grupos = celdas[seleccion, cubo['dimensiones'].index(por)]
+    resultado = np.zeros((len(cubo['etiquetas'][por]),) + arreglo.shape[1:], dtype=np.int64)
+    np.add.at(resultado, grupos, arreglo[seleccion])
+    return resultado
+
+
+def resolver_pregunta(cubo, pregunta):
+    """Nombre con el que la pregunta está guardada en el cubo (o None)"""
+    return cubo['alias'].get(pregunta)
+
+
+def consultar_cubo(cubo, pregunta, filtros=None, categorias=None, por=None):
+    """
+    Conteo de respuestas de una pregunta para un corte del cubo.
+
+    Args:
+        cubo: Cubo devuelto por construir_cubo
+        pregunta: Encabezado normalizado o nombre canónico de la pregunta
+        filtros: Diccionario dimensión -> valor (o lista de valores)
+        categorias: Orden de las opciones (como value_counts().reindex)
+        por: Dimensión a desglosar en columnas (ej. 'Grado')
+
+    Returns:
+        Series con el conteo por opción, o DataFrame opción x valor de `por`
+    """
+    clave = resolver_pregunta(cubo, pregunta)
+    if clave is None:
+        raise KeyError(f"La pregunta '{pregunta}' no está en el cubo")
+
+    datos = _seleccionar(cubo['conteos'][clave], cubo, filtros, por)
+    indice = pd.Index(cubo['categorias'][clave], name=pregunta)
+
+    if por is None:
+        resultado = pd.Series(datos, index=indice, name='count')
+    else:
+        columnas = pd.Index(cubo['etiquetas'][por], name=por)
+        resultado = pd.DataFrame(datos.T, index=indice, columns=columnas)
+
+    if categorias is not None:
+        resultado = resultado.reindex(categorias, fill_value=0)
+    return resultado
+
+
+def total_cubo(cubo, filtros=None, por=None):
+    """Número de encuestados en un corte del cubo"""
+    datos = _seleccionar(cubo['respondentes'], cubo, filtros, por)
+    if por is None:
+        return int(datos)
+    return pd.Series(datos, index=pd.Index(cubo['etiquetas'][por], name=por), name='count')
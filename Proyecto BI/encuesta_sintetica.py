@@ -0,0 +1,297 @@
+"""
+Generador de encuestas sintéticas
+Produce millones de encuestados con los mismos encabezados que un archivo
+real de la encuesta (incluidos los espacios sobrantes como
+'  ¿En qué grado estás actualmente?   ' o el ' *' de las preguntas
+obligatorias), para probar las secciones y el pipeline con volumen.
+
+Cada columna toma las opciones del archivo plantilla en el orden del
+esquema y, por defecto, su distribución observada. Las respuestas se
+correlacionan con factores latentes compartidos: con probabilidad
+|correlacion| una columna reutiliza el cuantil del factor del encuestado en
+lugar de uno propio, así las distribuciones marginales se mantienen y las
+columnas del mismo factor quedan asociadas según el orden de sus opciones.
+Todo se genera por bloques con NumPy y se escribe en xlsx, CSV y Parquet
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from carga_datos import (cargar_encuesta, normalizar_columnas, PYARROW_AVAILABLE,
+                         ARCHIVO_RESPUESTAS, ARCHIVO_T03, ARCHIVO_VOCACIONAL)
+from cubo import DIMENSIONES
+from esquema import ESQUEMA, aplicar_esquema
+
+# Archivos reales que sirven de plantilla (encabezados y opciones)
+PLANTILLAS = {
+    'respuestas': ARCHIVO_RESPUESTAS,
+    't03': ARCHIVO_T03,
+    'vocacional': ARCHIVO_VOCACIONAL,
+}
+
+# Correlación por defecto de las preguntas con el factor 'general'
+CORRELACION_POR_DEFECTO = 0.3
+
+# Filas que se generan y escriben por vez (acota la memoria)
+FILAS_POR_BLOQUE = 250_000
+
+# Límite de filas de una hoja de Excel (sin contar el encabezado)
+MAX_FILAS_EXCEL = 1_048_575
+
+FORMATOS = ['xlsx', 'csv', 'parquet']
+
+
+# ============================================================================
+# DESCRIPCIÓN DE LAS COLUMNAS
+# ============================================================================
+
+def _normalizar_distribucion(distribucion, valores):
+    """Pesos opción -> peso convertidos en probabilidades en el orden de `valores`"""
+    pesos = np.array([float(distribucion.get(str(v), distribucion.get(v, 0))) for v in valores])
+    if pesos.sum() <= 0:
+        raise ValueError(f"La distribución {distribucion} no da peso a ninguna opción ({valores})")
+    return pesos / pesos.sum()
+
+
+def _buscar_configuracion(config, encabezado):
+    """Configuración de una columna por su encabezado normalizado o su nombre canónico"""
+    columnas = config.get('columnas', {})
+    if encabezado in columnas:
+        return columnas[encabezado]
+    for nombre, (encabezado_esquema, _) in ESQUEMA.items():
+        if encabezado_esquema == encabezado and nombre in columnas:
+            return columnas[nombre]
+    return {}
+
+
+def describir_plantilla(plantilla=ARCHIVO_RESPUESTAS, config=None):
+    """
+    Describe cómo generar cada columna de un archivo plantilla.
+
+    Args:
+        plantilla: Archivo real de la encuesta (sus encabezados se copian tal cual)
+        config: Diccionario opcional con 'correlacion' (por defecto para todas
+                las preguntas) y 'columnas': encabezado normalizado o nombre
+                canónico -> {'distribucion': {opción: peso}, 'correlacion': r,
+                'factor': nombre, 'vacios': proporción}
+
+    Returns:
+        Lista de diccionarios, uno por columna, con el encabezado original,
+        el tipo ('opciones', 'fecha', 'identificador' o 'vacia') y sus parámetros
+    """
+    config = config or {}
+    correlacion_general = config.get('correlacion', CORRELACION_POR_DEFECTO)
+    original = cargar_encuesta(plantilla)
+    normalizado = aplicar_esquema(normalizar_columnas(original))
+    demograficas = {c for candidatas in DIMENSIONES.values() for c in candidatas}
+
+    columnas = []
+    for posicion, encabezado in enumerate(original.columns):
+        serie = original.iloc[:, posicion]
+        serie_normalizada = normalizado.iloc[:, posicion]
+        nombre = normalizado.columns[posicion]
+        ajustes = _buscar_configuracion(config, nombre)
+        columna = {'encabezado': encabezado, 'nombre': nombre}
+
+        if serie.isna().all():
+            columna['tipo'] = 'vacia'
+        elif pd.api.types.is_datetime64_any_dtype(serie):
+            columna.update(tipo='fecha', inicio=serie.min(), fin=serie.max())
+        elif pd.api.types.is_integer_dtype(serie) and serie.nunique() == len(serie) and len(serie) > 50:
+            # Un entero distinto por encuestado (DNI): se generan sin repetir
+            columna.update(tipo='identificador', minimo=int(serie.min()), maximo=int(serie.max()))
+        else:
+            if isinstance(serie_normalizada.dtype, pd.CategoricalDtype):
+                valores = list(serie_normalizada.cat.categories)
+                conteo = serie_normalizada.value_counts(sort=False).reindex(valores, fill_value=0)
+            else:
+                conteo = serie.value_counts().sort_index()
+                valores = list(conteo.index)
+            probabilidades = conteo.to_numpy(dtype=float) / max(conteo.sum(), 1)
+            if 'distribucion' in ajustes:
+                probabilidades = _normalizar_distribucion(ajustes['distribucion'], valores)
+
+            # Las columnas demográficas no se correlacionan salvo que se pida
+            correlacion = 0.0 if nombre in demograficas else correlacion_general
+            columna.update(
+                tipo='opciones',
+                valores=valores,
+                probabilidades=probabilidades,
+                vacios=float(ajustes.get('vacios', serie.isna().mean())),
+                correlacion=float(ajustes.get('correlacion', correlacion)),
+                factor=ajustes.get('factor', 'general'),
+            )
+        columnas.append(columna)
+    return columnas
+
+
+# ============================================================================
+# GENERACIÓN VECTORIZADA
+# ============================================================================
+
+def _generar_opciones(columna, n, factores, rng):
+    """Respuestas de una columna de opciones para n encuestados"""
+    probabilidades = columna['probabilidades'] * (1 - columna['vacios'])
+    acumulada = np.cumsum(np.append(probabilidades, columna['vacios']))
+    acumulada /= acumulada[-1]
+
+    cuantiles = rng.random(n)
+    correlacion = columna['correlacion']
+    if correlacion:
+        factor = factores[columna['factor']]
+        compartido = factor if correlacion > 0 else 1 - factor
+        cuantiles = np.where(rng.random(n) < abs(correlacion), compartido, cuantiles)
+
+    # El último código es el vacío (-1 en el categórico); sin vacíos no se usa
+    valores = columna['valores']
+    codigos = np.minimum(np.searchsorted(acumulada, cuantiles, side='right'), len(valores))
+    if columna['vacios'] > 0:
+        codigos[codigos == len(valores)] = -1
+    else:
+        codigos = np.minimum(codigos, len(valores) - 1)
+    # Categórico directo desde los códigos: no se crea un texto por respuesta
+    return pd.Categorical.from_codes(codigos.astype(np.int8 if len(valores) < 127 else np.int32), categories=valores)
+
+
+def generar_bloque(columnas, inicio, n, total, rng):
+    """
+    Genera las filas [inicio, inicio + n) de una encuesta de `total` filas.
+
+    Las fechas crecen con el número de fila (como las marcas temporales de
+    Google Forms) y los identificadores no se repiten en toda la encuesta.
+    """
+    factores = {}
+    for columna in columnas:
+        if columna['tipo'] == 'opciones' and columna['factor'] not in factores:
+            factores[columna['factor']] = rng.random(n)
+
+    filas = np.arange(inicio, inicio + n)
+    datos = {}
+    for posicion, columna in enumerate(columnas):
+        tipo = columna['tipo']
+        if tipo == 'opciones':
+            valores = _generar_opciones(columna, n, factores, rng)
+        elif tipo == 'fecha':
+            duracion = columna['fin'] - columna['inicio']
+            valores = pd.Series(columna['inicio'] + duracion * ((filas + rng.random(n)) / total))
+        elif tipo == 'identificador':
+            # Permutación de un rango con una función afín (sin repetidos)
+            rango = max(columna['maximo'] - columna['minimo'] + 1, total)
+            paso = 2_654_435_761
+            while np.gcd(paso, rango) != 1:
+                paso += 2
+            valores = pd.Series(columna['minimo'] + (filas * paso + 12_345) % rango)
+        else:
+            valores = pd.Series(np.full(n, np.nan))
+        datos[posicion] = valores if tipo == 'opciones' else valores.to_numpy()
+
+    bloque = pd.DataFrame(datos)
+    bloque.columns = [c['encabezado'] for c in columnas]
+    return bloque
+
+
+def generar_encuesta(n_filas, plantilla=ARCHIVO_RESPUESTAS, config=None, semilla=None,
+                     filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    Genera la encuesta sintética por bloques.
+
+    Yields:
+        DataFrames de hasta `filas_por_bloque` filas con los encabezados de la plantilla
+    """
+    columnas = describir_plantilla(plantilla, config)
+    rng = np.random.default_rng(semilla)
+    for inicio in range(0, n_filas, filas_por_bloque):
+        yield generar_bloque(columnas, inicio, min(filas_por_bloque, n_filas - inicio), n_filas, rng)
+
+
+# ============================================================================
+# ESCRITURA
+# ============================================================================
+
+def escribir_encuesta(bloques, destino, formatos=FORMATOS):
+    """
+    Escribe los bloques en destino.xlsx, destino.csv y destino.parquet.
+
+    CSV y Parquet se escriben bloque a bloque; el xlsx necesita todas las
+    filas en memoria y se omite si supera el límite de filas de Excel.
+
+    Returns:
+        Lista de archivos escritos
+    """
+    formatos = list(formatos)
+    if 'parquet' in formatos and not PYARROW_AVAILABLE:
+        print("ADVERTENCIA: pyarrow no esta disponible. No se escribira el archivo Parquet.")
+        formatos.remove('parquet')
+
+    directorio = os.path.dirname(os.path.abspath(destino))
+    os.makedirs(directorio, exist_ok=True)
+    rutas = {formato: f"{destino}.{formato}" for formato in formatos}
+    escritor_parquet = None
+    para_excel = []
+    filas = 0
+
+    escritor_csv = None
+    try:
+        for bloque in bloques:
+            tabla = None
+            if PYARROW_AVAILABLE and ('csv' in rutas or 'parquet' in rutas):
+                import pyarrow as pa
+                tabla = pa.Table.from_pandas(bloque, preserve_index=False)
+            if 'csv' in rutas:
+                if tabla is None:
+                    bloque.to_csv(rutas['csv'], mode='w' if filas == 0 else 'a', header=filas == 0, index=False)
+                else:
+                    # pyarrow escribe el CSV mucho más rápido que pandas
+                    import pyarrow.csv as pa_csv
+                    if escritor_csv is None:
+                        escritor_csv = pa_csv.CSVWriter(rutas['csv'], tabla.schema)
+                        esquema_csv = tabla.schema
+                    escritor_csv.write_table(tabla.cast(esquema_csv))
+            if 'parquet' in rutas:
+                import pyarrow.parquet as pq
+                if escritor_parquet is None:
+                    escritor_parquet = pq.ParquetWriter(rutas['parquet'], tabla.schema)
+                escritor_parquet.write_table(tabla.cast(escritor_parquet.schema))
+            if 'xlsx' in rutas:
+                if filas + len(bloque) > MAX_FILAS_EXCEL:
+                    print(f"ADVERTENCIA: Excel admite hasta {MAX_FILAS_EXCEL} filas. No se escribira el xlsx.")
+                    del rutas['xlsx']
+                    para_excel = []
+                else:
+                    para_excel.append(bloque)
+            filas += len(bloque)
+    finally:
+        if escritor_csv is not None:
+            escritor_csv.close()
+        if escritor_parquet is not None:
+            escritor_parquet.close()
+
+    if 'xlsx' in rutas and para_excel:
+        pd.concat(para_excel, ignore_index=True).to_excel(rutas['xlsx'], index=False)
+    return list(rutas.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera una encuesta sintética con los encabezados reales")
+    parser.add_argument('--filas', type=int, default=1_000_000, help="Cantidad de encuestados")
+    parser.add_argument('--plantilla', default='respuestas',
+                        help=f"Archivo plantilla: {', '.join(PLANTILLAS)} o la ruta de un Excel")
+    parser.add_argument('--config', help="JSON con distribuciones y correlaciones por columna")
+    parser.add_argument('--salida', default='encuesta_sintetica', help="Ruta de salida sin extensión")
+    parser.add_argument('--formatos', nargs='+', choices=FORMATOS, default=FORMATOS, help="Formatos a escribir")
+    parser.add_argument('--semilla', type=int, help="Semilla para repetir la misma encuesta")
+    args = parser.parse_args()
+
+    config = None
+    if args.config:
+        with open(args.config, encoding='utf-8') as archivo:
+            config = json.load(archivo)
+
+    plantilla = PLANTILLAS.get(args.plantilla, args.plantilla)
+    bloques = generar_encuesta(args.filas, plantilla, config, args.semilla)
+    for ruta in escribir_encuesta(bloques, args.salida, args.formatos):
+        print(f"[OK] {args.filas} encuestados escritos en: {ruta}")
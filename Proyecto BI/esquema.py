@@ -0,0 +1,326 @@
+"""
+Registro central de categorías de la encuesta
+Cada pregunta de opción múltiple o escala Likert tiene aquí su nombre
+canónico, el encabezado normalizado del formulario y el orden de sus
+opciones. Al cargar los datos las columnas se convierten a pd.Categorical
+ordenado, de modo que cada respuesta ocupa un código int8 en lugar de un
+string de Python y los conteos se resuelven con np.bincount
+"""
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# OPCIONES COMPARTIDAS
+# ============================================================================
+
+# Respuestas de las 18 preguntas vocacionales (Sección 7)
+OPCIONES_VOCACIONALES = [
+    'A (Me gusta mucho / Me interesa bastante)',
+    'B (A veces me interesa / Más o menos)',
+    'C (No me gusta / No me interesa)'
+]
+
+PREGUNTAS_VOCACIONALES = [
+    "¿Te interesa aprender cómo funciona el cuerpo humano?",
+    "¿Te motiva la idea de ayudar a otras personas a mejorar su bienestar?",
+    "¿Te gustaría trabajar en hospitales, clínicas o centros de investigación médica?",
+    "¿Disfrutas conversar y escuchar los problemas de los demás para orientarlos?",
+    "¿Te interesa la historia, la filosofía o comprender cómo piensan las personas?",
+    "¿Te gusta participar en proyectos sociales, comunitarios o de voluntariado?",
+    "¿Te gustan las matemáticas y resolver problemas lógicos?",
+    "¿Te interesa entender cómo funcionan las máquinas, aparatos o sistemas digitales?",
+    "¿Te entusiasma diseñar programas, aplicaciones o inventos?",
+    "¿Te gusta expresarte a través de la música, la pintura, el teatro o la escritura?",
+    "¿Disfrutas crear contenidos (videos, redes sociales, diseño gráfico, etc.)?",
+    "¿Te interesa trabajar en medios de comunicación o en proyectos artísticos?",
+    "¿Te interesa organizar proyectos, liderar equipos o emprender negocios?",
+    "¿Te gustan los números aplicados a la economía y las finanzas?",
+    "¿Te motiva la idea de tener tu propio negocio en el futuro?",
+    "¿Te interesa la naturaleza y cuidar el medio ambiente?",
+    "¿Te gusta trabajar al aire libre, en campos, laboratorios o áreas ecológicas?",
+    "¿Te motiva la idea de aportar a la sostenibilidad y seguridad alimentaria?"
+]
+
+
+# ============================================================================
+# REGISTRO DE PREGUNTAS
+# ============================================================================
+# nombre canónico -> (encabezado normalizado, opciones en orden)
+
+ESQUEMA = {
+    # Filtros demográficos
+    'Genero': ('Género', ['Femenino', 'Masculino']),
+    'Grado': ('¿En qué grado estás actualmente?', ['4°', '5°']),
+
+    # Sección 2: Preferencias e intereses
+    'Estilo_Aprendizaje': ('¿Cómo prefieres aprender cosas nuevas?', [
+        'En clases presenciales con profesor',
+        'De manera autónoma (tutoriales, libros, internet).',
+        'En grupos de estudio con compañeros.',
+        'Mediante práctica y experiencias directas.'
+    ]),
+    'Importancia_Tecnologia': ('¿Qué tan importante consideras la tecnología (computadoras, internet, apps) para tu educación futura?', [
+        'Nada importante.', 'Poco importante.', 'Importante.', 'Muy importante.'
+    ]),
+    'Factor_Eleccion': ('¿Qué factor influye más en tu elección de carrera?', [
+        'Interés personal.', 'Perspectiva laboral', 'Costos de estudio.',
+        'Opiniones familiares', 'Opiniones de amigos.'
+    ]),
+    'Tipo_Estudios': ('¿Qué tipo de estudios prefieres seguir después del colegio?', [
+        'Carrera larga (5 años, universitaria).',
+        'Carrera corta (2 a 3 años, técnico o instituto).',
+        'Cursos cortos o certificaciones.'
+    ]),
+    'Lugar_Trabajo': ('¿Dónde te imaginas trabajando en el futuro?', [
+        'En mi ciudad o región.', 'En otra ciudad del Perú.', 'En el extranjero.'
+    ]),
+
+    # Sección 3: Situación socioeconómica
+    'Nivel_Socioeconomico': ('¿A qué nivel socioeconómico considera que pertenece su familia?', [
+        'Bajo', 'Medio bajo', 'Medio', 'Medio alto', 'Alto'
+    ]),
+    'Fuente_Ingresos': ('¿Cuál es la principal fuente de ingresos de su hogar?', [
+        'Trabajo en relación de dependencia (empleado)', 'Trabajo independiente',
+        'Negocio familiar', 'Empresario', 'Apoyo de familiares en el extranjero', 'Otro'
+    ]),
+    'Nivel_Educativo_Padres': ('¿Qué nivel educativo alcanzaron sus padres o tutores?', [
+        'Primaria incompleta', 'Primaria completa', 'Secundaria completa',
+        'Educación técnica', 'Universitaria'
+    ]),
+    'Influencia_Economica': ('¿Cree que la situación económica de su familia influirá en la elección de su futura carrera?', [
+        'No influye', 'Sí, en parte', 'Sí, mucho'
+    ]),
+    'Acceso_Becas': ('¿Cuenta con acceso a becas, créditos o apoyos económicos para estudios superiores?', [
+        'Si', 'No', 'No lo sé'
+    ]),
+
+    # Sección 4: Accesibilidad y oferta educativa
+    'Modalidad_Estudio': ('¿Qué modalidad de estudio prefieres?', [
+        'Presencial', 'Virtual', 'Híbrido (presencial + virtual)', 'No tengo preferencia'
+    ]),
+    'Disposicion_Mudanza': ('¿Estarías dispuesto/a a mudarte a otra ciudad si en tu zona no existe la carrera que te interesa?', [
+        'Sí, sin problemas', 'Sí, pero solo si cuento con apoyo económico',
+        'No, prefiero estudiar otra carrera en mi zona', 'No lo sé aún'
+    ]),
+    'Definicion_Interes': ('¿Qué tan definido tienes tu interés sobre qué estudiar después de la secundaria?', [
+        'Nada definido', 'Poco definido', 'Algo definido', 'Muy definido', 'Totalmente definido'
+    ]),
+    'Conocimiento_Opciones': ('¿Qué nivel de conocimiento tienes sobre las universidades, institutos o programas en tu zona?', [
+        'No conozco ninguno', 'Conozco muy pocos', 'Conozco algunos',
+        'Conozco varios', 'Conozco muchas opciones'
+    ]),
+    'Coincidencia_Opciones': ('¿En qué medida las opciones educativas cercanas coinciden con lo que quieres estudiar?', [
+        'No coinciden en nada', 'Coinciden muy poco', 'Coinciden parcialmente',
+        'Coinciden bastante', 'Coinciden totalmente'
+    ]),
+
+    # Sección 5: Barreras y apoyo
+    'Dificultad_Costos': ('¿Qué tan difícil consideras cubrir los costos de matrícula y pensiones de estudios superiores?', [
+        'Nada difícil', 'Poco difícil', 'Medianamente difícil', 'Difícil', 'Muy difícil'
+    ]),
+    'Importancia_Beca': ('¿Qué tan importante sería contar con una beca para poder continuar tus estudios?', [
+        'Nada importante', 'Poco importante', 'Medianamente importante', 'Importante', 'Muy importante'
+    ]),
+    'Influencia_Distancia': ('¿Qué tanto influye la distancia y transporte como barrera para estudiar en una institución superior?', [
+        'Nada', 'Poco', 'Medianamente', 'Mucho', 'Demasiado'
+    ]),
+    'Apoyo_Familiar': ('¿En qué medida consideras que el apoyo económico de tu familia es suficiente para tus estudios futuros?', [
+        'Nada suficiente', 'Poco suficiente', 'Medianamente suficiente', 'Suficiente', 'Muy suficiente'
+    ]),
+    'Recursos_Tecnologicos': ('¿Actualmente cuentas con computadora y conexión a internet en tu hogar?', [
+        'Sí, cuento con ambos (computadora e internet)', 'Solo computadora',
+        'Solo internet', 'No cuento con ninguno'
+    ]),
+
+    # Sección 6: Proyecto de vida y expectativas futuras
+    'Plan_Despues_Colegio': ('Al terminar el colegio, ¿cuál es tu principal plan a seguir?', [
+        'Ingresar a la universidad para estudiar una carrera profesional.',
+        'Estudiar en un instituto una carrera técnica corta.',
+        'Empezar a trabajar lo antes posible para tener independencia económica.',
+        'Tomarme un tiempo para decidir qué quiero hacer o viajar.'
+    ]),
+    'Importante_Trabajo_Futuro': ('¿Qué es lo más importante que buscas en tu futuro trabajo o profesión?', [
+        'Estabilidad económica y un buen sueldo.',
+        'Prestigio y reconocimiento en mi campo laboral.',
+        'Poder ayudar a los demás y tener un impacto positivo en la sociedad.',
+        'Un buen balance entre mi vida personal y el trabajo, con tiempo para mis pasatiempos.'
+    ]),
+    'Papel_Educacion_Superior': ('¿Qué papel crees que juega la educación superior (universitaria o técnica para alcanzar el futuro que deseas?', [
+        'Es fundamental y la única vía para asegurar el éxito profesional y personal.',
+        'Es muy importante, pero creo que la experiencia y las habilidades prácticas son igual de valiosas.',
+        'Es solo un requisito formal, pero no garantiza el éxito.',
+        'No es tan necesaria; hay otras formas de alcanzar mis metas sin estudios superiores.'
+    ]),
+    'Estilo_Vida_10_Anos': ('Pensando en 10 años, ¿cómo te gustaría que fuera tu estilo de vida?', [
+        'Con una vida estable, una casa propia y seguridad financiera.',
+        'Con libertad para viajar por el mundo y vivir diferentes experiencias.',
+        'Liderando mi propio negocio o siendo un profesional independiente.',
+        'Dedicado/a a mi desarrollo profesional, ocupando un alto cargo en una empresa.'
+    ]),
+    'Mayor_Desafio_Futuro': ('¿Cuál consideras que es el mayor desafío o preocupación que enfrentas al pensar en tu futuro después del colegio?', [
+        'La dificultad económica para poder costear mis estudios o proyectos.',
+        'La indecisión sobre qué carrera o camino profesional elegir.',
+        'La alta competencia en el campo laboral y el miedo a no encontrar trabajo.',
+        'La presión de mi familia o de la sociedad sobre lo que "debería" hacer.'
+    ]),
+}
+
+# Sección 7: las 18 preguntas vocacionales comparten las mismas opciones
+for _i, _pregunta in enumerate(PREGUNTAS_VOCACIONALES, 1):
+    ESQUEMA[f'Vocacional_{_i:02d}'] = (_pregunta, OPCIONES_VOCACIONALES)
+
+
+# ============================================================================
+# NOMBRES CORTOS DE LAS SECCIONES
+# ============================================================================
+# encabezado normalizado -> nombre corto con que las secciones 4, 5 y 6
+# renombran sus columnas (y con que sql_encuesta.py las muestra)
+
+RENOMBRAR_FILTROS = {
+    'Género': 'Genero',
+    '¿Cuál es tu edad?': 'Edad',
+    '¿En qué grado estás actualmente?': 'Grado',
+    '¿En qué distrito vives?': 'Distrito',
+}
+
+RENOMBRAR_SECCION4 = {
+    **RENOMBRAR_FILTROS,
+    '¿En qué distrito o comunidad vives?': 'Distrito',
+    '¿Qué modalidad de estudio prefieres?': 'Modalidad_Estudio',
+    '¿Estarías dispuesto/a a mudarte a otra ciudad si en tu zona no existe la carrera que te interesa?': 'Disposicion_Mudanza',
+    '¿Qué tan definido tienes tu interés sobre qué estudiar después de la secundaria?': 'Definicion_Interes',
+    '¿Qué nivel de conocimiento tienes sobre las universidades, institutos o programas en tu zona?': 'Conocimiento_Opciones',
+    '¿En qué medida las opciones educativas cercanas coinciden con lo que quieres estudiar?': 'Coincidencia_Opciones'
+}
+
+RENOMBRAR_SECCION5 = {
+    **RENOMBRAR_FILTROS,
+    '¿Qué tan difícil consideras cubrir los costos de matrícula y pensiones de estudios superiores?': 'Dificultad_Costos',
+    '¿Qué tan importante sería contar con una beca para poder continuar tus estudios?': 'Importancia_Beca',
+    '¿Qué tanto influye la distancia y transporte como barrera para estudiar en una institución superior?': 'Influencia_Distancia',
+    '¿En qué medida consideras que el apoyo económico de tu familia es suficiente para tus estudios futuros?': 'Apoyo_Familiar',
+    '¿Actualmente cuentas con computadora y conexión a internet en tu hogar?': 'Recursos_Tecnologicos'
+}
+
+RENOMBRAR_SECCION6 = {
+    **RENOMBRAR_FILTROS,
+    'Al terminar el colegio, ¿cuál es tu principal plan a seguir?': 'Plan_Despues_Colegio',
+    '¿Qué es lo más importante que buscas en tu futuro trabajo o profesión?': 'Importante_Trabajo_Futuro',
+    '¿Qué papel crees que juega la educación superior (universitaria o técnica para alcanzar el futuro que deseas?': 'Papel_Educacion_Superior',
+    'Pensando en 10 años, ¿cómo te gustaría que fuera tu estilo de vida?': 'Estilo_Vida_10_Anos',
+    '¿Cuál consideras que es el mayor desafío o preocupación que enfrentas al pensar en tu futuro después del colegio?': 'Mayor_Desafio_Futuro'
+}
+
+RENOMBRAR_SECCIONES = {**RENOMBRAR_SECCION4, **RENOMBRAR_SECCION5, **RENOMBRAR_SECCION6}
+
+
+# ============================================================================
+# FUNCIONES DEL REGISTRO
+# ============================================================================
+
+def obtener_categorias(nombre):
+    """Devuelve la lista ordenada de opciones de una pregunta canónica"""
+    return list(ESQUEMA[nombre][1])
+
+
+def construir_tipo(categorias, serie=None):
+    """
+    Crea el dtype categórico ordenado de una pregunta.
+
+    Las respuestas que no figuran en el registro (errores de tipeo del
+    formulario, opciones nuevas) se agregan al final para no perder datos.
+    """
+    categorias = list(categorias)
+    if serie is not None:
+        conocidas = set(categorias)
+        extras = sorted(v for v in pd.unique(serie.dropna()) if v not in conocidas)
+        categorias += extras
+    return pd.CategoricalDtype(categories=categorias, ordered=True)
+
+
+def aplicar_esquema(df):
+    """
+    Convierte a categóricas todas las columnas registradas presentes en df.
+
+    Busca cada pregunta por su encabezado normalizado o por su nombre
+    canónico (si la sección ya renombró las columnas). Las columnas que ya
+    son categóricas ordenadas se dejan igual; las categóricas sin orden (las
+    de un archivo Parquet, por ejemplo) se pasan al orden del registro. No
+    modifica el DataFrame recibido.
+    """
+    df_categorico = df.copy(deep=False)
+    for nombre, (encabezado, categorias) in ESQUEMA.items():
+        for columna in (encabezado, nombre):
+            if columna not in df_categorico.columns:
+                continue
+            tipo_actual = df_categorico[columna].dtype
+            if not isinstance(tipo_actual, pd.CategoricalDtype) or not tipo_actual.ordered:
+                tipo = construir_tipo(categorias, df_categorico[columna])
+                df_categorico[columna] = df_categorico[columna].astype(tipo)
+    return df_categorico
+
+
+def contar_respuestas(serie, categorias=None, filas=None):
+    """
+    Cuenta las respuestas de una pregunta.
+
+    Si la columna es categórica el conteo es un np.bincount sobre los
+    códigos int8; si no, se usa value_counts. Con `categorias` el resultado
+    se reordena igual que value_counts().reindex(categorias, fill_value=0).
+    Con `filas` (posiciones de indices.aplicar_filtros) solo se cuentan esas
+    filas, sin armar el DataFrame filtrado.
+    """
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos = serie.cat.codes.to_numpy()
+        if filas is not None:
+            codigos = codigos[filas]
+        conteo = np.bincount(codigos[codigos >= 0], minlength=len(serie.cat.categories))
+        resultado = pd.Series(conteo, index=pd.Index(serie.cat.categories, name=serie.name), name='count')
+    else:
+        resultado = (serie if filas is None else serie.iloc[filas]).value_counts()
+
+    if categorias is not None:
+        resultado = resultado.reindex(categorias, fill_value=0)
+    return resultado
+
+
+def codigos_respuestas(serie, categorias=None, filas=None):
+    """
+    Códigos enteros (-1 = vacío o fuera de `categorias`) y sus etiquetas.
+    Con `filas` solo se devuelven los códigos de esas posiciones; en una
+    columna no categórica las etiquetas son las de esas filas.
+    """
+    if filas is not None and not isinstance(serie.dtype, pd.CategoricalDtype):
+        serie, filas = serie.iloc[filas], None
+    if categorias is not None:
+        categorias = list(categorias)
+        codigos = pd.Categorical(serie, categories=categorias).codes.astype(np.intp)
+    elif isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos, categorias = serie.cat.codes.to_numpy().astype(np.intp), list(serie.cat.categories)
+    else:
+        codigos, etiquetas = pd.factorize(serie, sort=True)
+        categorias = list(etiquetas)
+    return (codigos if filas is None else codigos[filas]), categorias
+
+
+def tabla_cruzada(filas, columnas, categorias_filas=None, categorias_columnas=None, posiciones=None):
+    """
+    Tabla de contingencia entre dos columnas (ej. opción x grado).
+
+    Cada par de respuestas se convierte en una posición fila * n_columnas +
+    columna y toda la tabla sale de un único np.bincount, sin filtrar el
+    DataFrame por cada grado u opción. Las filas con algún vacío no se
+    cuentan (igual que pd.crosstab). Las columnas categóricas conservan todas
+    sus categorías, aunque tengan cero respuestas; con `categorias_*` se
+    fija el orden y se descartan los valores que no estén en la lista. Con
+    `posiciones` (las de indices.aplicar_filtros) solo se cuentan esas filas.
+    """
+    codigos_f, etiquetas_f = codigos_respuestas(filas, categorias_filas, posiciones)
+    codigos_c, etiquetas_c = codigos_respuestas(columnas, categorias_columnas, posiciones)
+    validos = (codigos_f >= 0) & (codigos_c >= 0)
+    conteo = np.bincount(codigos_f[validos] * len(etiquetas_c) + codigos_c[validos],
+                         minlength=len(etiquetas_f) * len(etiquetas_c))
+    return pd.DataFrame(conteo.reshape(len(etiquetas_f), len(etiquetas_c)),
+                        index=pd.Index(etiquetas_f, name=filas.name),
+                        columns=pd.Index(etiquetas_c, name=columnas.name))
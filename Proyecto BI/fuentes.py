@@ -0,0 +1,178 @@
+"""
+Unificación de varios archivos de la encuesta
+Cada sección leía su propio archivo (las respuestas, la exportación T03 o la
+encuesta vocacional). Este módulo carga cualquier cantidad de archivos a la
+vez con un pool de hilos, reconcilia las variantes de sus encabezados
+('Género *', 'Género ', 'Nombre de tu Institucion:' y 'Nombre de tu colegio:')
+y los une en un solo DataFrame sin encuestados repetidos, que se guarda en
+Parquet para que todas las secciones analicen los mismos datos
+"""
+
+import argparse
+import os
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from carga_datos import (cargar_encuesta, normalizar_columnas, PYARROW_AVAILABLE, DIRECTORIO_DATOS,
+                         ARCHIVO_RESPUESTAS, ARCHIVO_T03, ARCHIVO_VOCACIONAL)
+from cubo import DIMENSIONES
+from ingesta import hashes_filas
+from perfilado import etapa
+
+# Archivos que se unifican por defecto (el primero define los encabezados)
+FUENTES = [ARCHIVO_RESPUESTAS, ARCHIVO_T03, ARCHIVO_VOCACIONAL]
+
+ARCHIVO_UNIFICADO = os.path.join(DIRECTORIO_DATOS, 'encuesta_unificada.parquet')
+
+# Columna que indica de qué archivo viene cada fila
+COLUMNA_FUENTE = 'Fuente'
+
+# Encabezados distintos de la misma pregunta en los formularios -> encabezado común
+ENCABEZADOS_EQUIVALENTES = {
+    variante: candidatas[0]
+    for candidatas in DIMENSIONES.values()
+    for variante in candidatas[1:-1]
+}
+
+
+# ============================================================================
+# ENCABEZADOS
+# ============================================================================
+
+def clave_encabezado(encabezado):
+    """Encabezado sin tildes, mayúsculas ni espacios repetidos (para comparar variantes)"""
+    texto = unicodedata.normalize('NFKD', str(encabezado))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(texto.casefold().split())
+
+
+def reconciliar_encabezados(dfs):
+    """
+    Renombra las columnas de cada DataFrame a un encabezado común.
+
+    Primero se normalizan (espacios, asterisco final), después se aplican las
+    variantes conocidas de ENCABEZADOS_EQUIVALENTES y por último las columnas
+    que solo difieren en tildes o mayúsculas toman el encabezado con el que
+    aparecieron primero.
+
+    Returns:
+        Lista de DataFrames renombrados (copias superficiales)
+    """
+    comunes = {}
+    resultado = []
+    for df in dfs:
+        df = normalizar_columnas(df)
+        nombres = []
+        for columna in df.columns:
+            columna = ENCABEZADOS_EQUIVALENTES.get(columna, columna)
+            nombres.append(comunes.setdefault(clave_encabezado(columna), columna))
+        df.columns = nombres
+        resultado.append(df)
+    return resultado
+
+
+# ============================================================================
+# CARGA Y UNIFICACIÓN
+# ============================================================================
+
+def cargar_fuentes(rutas=FUENTES, hilos=None):
+    """
+    Carga varios archivos a la vez con un pool de hilos.
+
+    La lectura de las copias Feather (pyarrow) y del disco libera el GIL, así
+    que los archivos se leen en paralelo sin copiar los datos entre procesos.
+
+    Returns:
+        Lista de DataFrames con las columnas originales, en el orden de `rutas`
+    """
+    rutas = list(rutas)
+    with etapa('carga_fuentes', archivos=len(rutas)):
+        with ThreadPoolExecutor(max_workers=hilos or min(len(rutas), (os.cpu_count() or 1) + 4)) as ejecutor:
+            return list(ejecutor.map(cargar_encuesta, rutas))
+
+
+def _sin_repetidos(df, fuentes):
+    """
+    Posiciones de las filas que se conservan.
+
+    Una fila que aparece en varios archivos (una exportación más nueva trae
+    todas las filas de la anterior) se conserva una sola vez; las repetidas
+    dentro de un mismo archivo se conservan todas, como al contar ese
+    archivo solo.
+    """
+    hashes = hashes_filas(df)
+    aparicion = pd.Series(hashes).groupby([hashes, fuentes]).cumcount().to_numpy()
+    claves = pd.DataFrame({'hash': hashes, 'aparicion': aparicion})
+    return np.flatnonzero(~claves.duplicated().to_numpy())
+
+
+def _tipos_para_parquet(df):
+    """Las columnas con valores de distinto tipo según el archivo se guardan como texto"""
+    df = df.copy(deep=False)
+    for columna in df.columns:
+        if df[columna].dtype == object:
+            df[columna] = df[columna].astype('string')
+    return df
+
+
+def unificar_encuestas(rutas=FUENTES, hilos=None, destino=None):
+    """
+    Une varios archivos de la encuesta en un solo DataFrame.
+
+    Args:
+        rutas: Archivos a unir (.xlsx, .csv o .parquet)
+        hilos: Hilos para la carga (por defecto uno por archivo)
+        destino: Si se indica, guarda el resultado en este Parquet
+
+    Returns:
+        DataFrame con los encabezados reconciliados (sin normalizar con el
+        esquema), la columna 'Fuente' y sin encuestados repetidos entre archivos
+    """
+    rutas = list(rutas)
+    dfs = reconciliar_encabezados(cargar_fuentes(rutas, hilos))
+
+    with etapa('unificacion'):
+        partes = []
+        for ruta, df in zip(rutas, dfs):
+            partes.append(df.assign(**{COLUMNA_FUENTE: os.path.basename(ruta)}))
+        unido = pd.concat(partes, ignore_index=True, sort=False)
+        fuentes = unido.pop(COLUMNA_FUENTE)
+        filas = _sin_repetidos(unido, fuentes.to_numpy())
+        unido = unido.iloc[filas].reset_index(drop=True)
+        unido.insert(0, COLUMNA_FUENTE, fuentes.iloc[filas].to_numpy())
+
+    repetidas = sum(len(df) for df in dfs) - len(unido)
+    print(f"[OK] {len(rutas)} archivos unidos: {len(unido)} encuestados ({repetidas} filas repetidas descartadas)")
+
+    if destino:
+        if not PYARROW_AVAILABLE:
+            print("ADVERTENCIA: pyarrow no esta disponible. No se guardara el archivo unificado.")
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(destino)), exist_ok=True)
+            _tipos_para_parquet(unido).to_parquet(destino, index=False)
+            print(f"[OK] Encuesta unificada guardada en: {destino}")
+    return unido
+
+
+def cargar_unificada(rutas=FUENTES, hilos=None, categorizar=True):
+    """Une los archivos y aplica el esquema categórico, como cargar_encuesta_normalizada"""
+    df = unificar_encuestas(rutas, hilos)
+    if categorizar:
+        from esquema import aplicar_esquema
+        with etapa('normalizacion'):
+            df = aplicar_esquema(df)
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Une varios archivos de la encuesta en un solo Parquet")
+    parser.add_argument('archivos', nargs='*', default=FUENTES, help="Archivos a unir (por defecto los tres de la encuesta)")
+    parser.add_argument('--salida', default=ARCHIVO_UNIFICADO, help="Parquet de salida")
+    parser.add_argument('--hilos', type=int, help="Hilos para cargar los archivos (por defecto uno por archivo)")
+    args = parser.parse_args()
+
+    df = unificar_encuestas(args.archivos, args.hilos, args.salida)
+    print(df[COLUMNA_FUENTE].value_counts().to_string())
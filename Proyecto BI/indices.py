@@ -0,0 +1,161 @@
+"""
+Índices de bits para los filtros de la encuesta
+Para cada columna de filtro y cada uno de sus valores se guarda un mapa de
+bits (un bit por encuestado). Aplicar varios filtros es un AND entre mapas y
+contar los encuestados es un popcount, sin comparar strings ni copiar el
+DataFrame. El resultado son posiciones de fila, no un DataFrame nuevo: los
+conteos las reciben directamente (parámetro filas= de contar_respuestas,
+tabla_conteos o seccion2.ejecutar). vista_filas() arma el DataFrame del
+corte solo para los scripts que necesitan uno
+"""
+
+import numpy as np
+import pandas as pd
+
+from cubo import DIMENSIONES
+from perfilado import perfilar
+
+# np.bitwise_count existe desde numpy 2.0; con versiones anteriores se cuentan
+# los bits desempaquetando el mapa
+POPCOUNT_AVAILABLE = hasattr(np, 'bitwise_count')
+
+
+# ============================================================================
+# MAPAS DE BITS
+# ============================================================================
+
+def _empaquetar(mascara):
+    """Convierte una máscara booleana en un mapa de bits de palabras de 64 bits"""
+    bytes_mapa = np.packbits(mascara, bitorder='little')
+    relleno = (-len(bytes_mapa)) % 8
+    if relleno:
+        bytes_mapa = np.concatenate([bytes_mapa, np.zeros(relleno, dtype=np.uint8)])
+    return bytes_mapa.view(np.uint64)
+
+
+def _mapas_columna(serie):
+    """Un mapa de bits por cada valor distinto de la columna (los vacíos no se indexan)"""
+    codigos, valores = pd.factorize(serie)
+    return {valor: _empaquetar(codigos == i) for i, valor in enumerate(valores)}
+
+
+def contar_bits(mapa):
+    """Popcount: número de encuestados marcados en el mapa"""
+    if POPCOUNT_AVAILABLE:
+        return int(np.bitwise_count(mapa).sum())
+    return int(np.unpackbits(mapa.view(np.uint8)).sum())
+
+
+def filas_de_mapa(mapa, n_filas):
+    """Posiciones de las filas marcadas en el mapa"""
+    bits = np.unpackbits(mapa.view(np.uint8), bitorder='little', count=n_filas)
+    return np.flatnonzero(bits)
+
+
+# ============================================================================
+# CONSTRUCCIÓN Y CONSULTA
+# ============================================================================
+
+def _resolver_columna(df, nombre):
+    """Columna de df que corresponde a un filtro (nombre canónico o encabezado)"""
+    candidatas = DIMENSIONES.get(nombre, []) + [nombre]
+    for columna in candidatas:
+        if columna in df.columns:
+            return columna
+    return None
+
+
+@perfilar('indices')
+def construir_indices(df, columnas=None):
+    """
+    Construye los mapas de bits de las columnas de filtro.
+
+    Args:
+        df: DataFrame normalizado (renombrado o no)
+        columnas: Filtros a indexar; por defecto las dimensiones del cubo
+                  (Genero, Edad, Grado, Distrito, Colegio)
+
+    Returns:
+        Diccionario con el número de filas y los mapas por filtro y valor
+    """
+    indices = {'n_filas': len(df), 'mapas': {}}
+    for nombre in (columnas or DIMENSIONES):
+        columna = _resolver_columna(df, nombre)
+        if columna is not None:
+            indices['mapas'][nombre] = _mapas_columna(df[columna])
+    return indices
+
+
+def mapa_filtros(indices, filtros, df=None):
+    """
+    Combina los filtros con AND sobre los mapas de bits.
+
+    Un filtro sobre una columna que no está indexada se indexa en ese momento
+    si se pasa `df`; si la columna no existe se ignora (igual que antes con
+    las máscaras). Un valor que no aparece en los datos no deja ninguna fila.
+
+    Returns:
+        (mapa de bits resultante, lista de filtros aplicados 'columna=valor')
+    """
+    palabras = (indices['n_filas'] + 63) // 64
+    resultado = _empaquetar(np.ones(indices['n_filas'], dtype=bool))
+    filtros_aplicados = []
+
+    for nombre, valor in filtros.items():
+        if nombre not in indices['mapas']:
+            columna = _resolver_columna(df, nombre) if df is not None else None
+            if columna is None:
+                continue
+            indices['mapas'][nombre] = _mapas_columna(df[columna])
+
+        valores = valor if isinstance(valor, (list, tuple, set)) else [valor]
+        mapa_valor = np.zeros(palabras, dtype=np.uint64)
+        for v in valores:
+            mapa = indices['mapas'][nombre].get(v)
+            if mapa is not None:
+                mapa_valor |= mapa
+        resultado &= mapa_valor
+        filtros_aplicados.append(f"{nombre}={valor}")
+
+    return resultado, filtros_aplicados
+
+
+@perfilar('filtros')
+def aplicar_filtros(df, filtros, indices=None):
+    """
+    Aplica los filtros definidos al dataframe.
+
+    Returns:
+        (posiciones de las filas que cumplen los filtros, filtros aplicados).
+        Para obtener las filas basta con df.iloc[filas].
+    """
+    if indices is None:
+        indices = construir_indices(df)
+    mapa, filtros_aplicados = mapa_filtros(indices, filtros, df)
+    return filas_de_mapa(mapa, indices['n_filas']), filtros_aplicados
+
+
+# ============================================================================
+# VISTAS DE LAS FILAS FILTRADAS
+# ============================================================================
+
+def vista_filas(df, filas, columnas=None):
+    """
+    DataFrame con las filas en las posiciones `filas`.
+
+    Si son todas las filas se devuelve df tal cual y si son un tramo
+    contiguo, una rebanada (con Copy-on-Write no copia datos mientras nadie
+    la modifique). En otro caso las filas se copian una vez (solo las de
+    `columnas`, si se indican): para contar conviene pasar las posiciones,
+    no este DataFrame.
+    """
+    if columnas is not None:
+        df = df[list(columnas)]
+    filas = np.asarray(filas)
+    if len(filas) == 0:
+        return df.iloc[:0]
+    if np.all(np.diff(filas) == 1):
+        if filas[0] == 0 and len(filas) == len(df):
+            return df
+        return df.iloc[filas[0]:filas[-1] + 1]
+    return df.take(filas)
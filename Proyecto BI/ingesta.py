@@ -0,0 +1,237 @@
+"""
+Ingesta incremental de la encuesta
+Cada exportación de Google Forms trae todas las filas anteriores más las
+nuevas. En lugar de volver a contar todo, se guardan las filas ya ingeridas
+(por lotes, en Feather) con el hash de cada fila y el cubo de conteos. En cada
+actualización solo se cuentan las filas nuevas y su cubo se suma al guardado,
+así el costo de los conteos crece con las filas nuevas y no con el total.
+
+Una fila es nueva si su marca temporal es posterior a la última ingerida o,
+si no lo es (la exportación no siempre viene ordenada), si su hash no está
+entre los ya ingeridos. Las filas repetidas se cuentan tantas veces como
+aparecen, igual que al contar desde cero. Una respuesta editada en el
+formulario cambia de hash y se toma como una fila nueva
+"""
+
+import argparse
+import json
+import os
+import pickle
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from carga_datos import cargar_encuesta, normalizar_columnas, ARCHIVO_RESPUESTAS, RAIZ_PROYECTO
+from cubo import combinar_cubos, construir_cubo
+from esquema import aplicar_esquema
+from perfilado import etapa
+
+# Carpeta con los datos ingeridos de cada archivo (ignorada por git)
+DIRECTORIO_INGESTA = os.path.join(RAIZ_PROYECTO, '.ingesta')
+
+# Columna con la fecha y hora de envío que agrega Google Forms
+COLUMNA_MARCA = 'Marca temporal'
+
+# Subir este número obliga a ingerir todo de nuevo (cambio de formato del cubo)
+VERSION_INGESTA = 2
+
+
+# ============================================================================
+# ESTADO GUARDADO
+# ============================================================================
+
+def directorio_archivo(ruta, directorio=DIRECTORIO_INGESTA):
+    """Carpeta de la ingesta de un archivo de la encuesta (el xlsx y el CSV del mismo nombre no se mezclan)"""
+    return os.path.join(directorio, os.path.basename(ruta).replace('.', '_'))
+
+
+def _leer_estado(carpeta):
+    """Estado de la ingesta (None si no existe o es de otra versión)"""
+    try:
+        with open(os.path.join(carpeta, 'estado.json'), encoding='utf-8') as archivo:
+            estado = json.load(archivo)
+        with open(os.path.join(carpeta, 'cubo.pkl'), 'rb') as archivo:
+            cubo = pickle.load(archivo)
+        hashes = np.load(os.path.join(carpeta, 'hashes.npy'))
+    except (OSError, ValueError, pickle.UnpicklingError):
+        return None
+    if estado.get('version') != VERSION_INGESTA:
+        return None
+    return estado, cubo, hashes
+
+
+def _guardar_estado(carpeta, estado, cubo, hashes):
+    """Guarda el cubo, los hashes y el estado (el estado al final: marca la ingesta como completa)"""
+    for nombre, escribir in (('cubo.pkl', lambda f: pickle.dump(cubo, f, protocol=pickle.HIGHEST_PROTOCOL)),
+                             ('hashes.npy', lambda f: np.save(f, hashes))):
+        temporal = os.path.join(carpeta, f"{nombre}.tmp")
+        with open(temporal, 'wb') as archivo:
+            escribir(archivo)
+        os.replace(temporal, os.path.join(carpeta, nombre))
+
+    temporal = os.path.join(carpeta, 'estado.json.tmp')
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(estado, archivo, indent=2, ensure_ascii=False)
+    os.replace(temporal, os.path.join(carpeta, 'estado.json'))
+
+
+# ============================================================================
+# DETECCIÓN DE FILAS NUEVAS
+# ============================================================================
+
+def _como_texto(serie):
+    """
+    Texto de cada valor, igual entre exportaciones aunque cambie el tipo de la
+    columna (16 y 16.0 cuando aparece un vacío, vacíos como texto vacío)
+    """
+    if pd.api.types.is_float_dtype(serie):
+        enteros = serie.dropna()
+        if (enteros == np.floor(enteros)).all():
+            serie = serie.astype('Int64')
+    return serie.astype('string').fillna('')
+
+
+def hashes_filas(df):
+    """Hash de 64 bits del contenido de cada fila (sin el índice)"""
+    texto = pd.DataFrame({i: _como_texto(df.iloc[:, i]) for i in range(df.shape[1])})
+    return pd.util.hash_pandas_object(texto, index=False).to_numpy(dtype=np.uint64)
+
+
+def filas_nuevas(df, hashes_ingeridos, ultima_marca=None, columna_marca=COLUMNA_MARCA):
+    """
+    Posiciones de las filas de df que todavía no se ingirieron.
+
+    Args:
+        df: Exportación completa (columnas originales)
+        hashes_ingeridos: Hashes ordenados de las filas ya ingeridas (con repetidos)
+        ultima_marca: Marca temporal más reciente ya ingerida
+        columna_marca: Columna de la marca temporal (si no existe solo se usan los hashes)
+
+    Returns:
+        (posiciones de las filas nuevas, hashes de todas las filas de df)
+    """
+    hashes = hashes_filas(df)
+    nuevas = np.zeros(len(df), dtype=bool)
+
+    # Las filas enviadas después de la última ingesta son nuevas sin más
+    revisar = np.ones(len(df), dtype=bool)
+    if ultima_marca is not None and columna_marca in df.columns:
+        marcas = pd.to_datetime(df[columna_marca], errors='coerce')
+        posteriores = (marcas > pd.Timestamp(ultima_marca)).to_numpy()
+        nuevas |= posteriores
+        revisar &= ~posteriores
+
+    # Las demás se comparan por hash: la k-ésima aparición de un hash es nueva
+    # si ya se ingirieron menos de k filas con ese hash
+    posiciones = np.flatnonzero(revisar)
+    if len(posiciones):
+        candidatos = hashes[posiciones]
+        aparicion = pd.Series(candidatos).groupby(candidatos).cumcount().to_numpy()
+        ingeridas = (np.searchsorted(hashes_ingeridos, candidatos, side='right')
+                     - np.searchsorted(hashes_ingeridos, candidatos, side='left'))
+        nuevas[posiciones[aparicion >= ingeridas]] = True
+    return np.flatnonzero(nuevas), hashes
+
+
+def _ultima_marca(df, columna_marca=COLUMNA_MARCA, anterior=None):
+    """Marca temporal más reciente entre df y la anterior (texto ISO o None)"""
+    if columna_marca not in df.columns or df.empty:
+        return anterior
+    maxima = pd.to_datetime(df[columna_marca], errors='coerce').max()
+    if pd.isna(maxima):
+        return anterior
+    if anterior is not None:
+        maxima = max(maxima, pd.Timestamp(anterior))
+    return maxima.isoformat()
+
+
+# ============================================================================
+# INGESTA
+# ============================================================================
+
+def ingerir(ruta=ARCHIVO_RESPUESTAS, directorio=DIRECTORIO_INGESTA, reiniciar=False):
+    """
+    Agrega a la ingesta guardada las filas nuevas de una exportación.
+
+    Args:
+        ruta: Exportación completa de la encuesta (.xlsx, .csv o .parquet)
+        directorio: Carpeta donde se guardan las ingestas
+        reiniciar: Borrar lo ingerido y volver a empezar
+
+    Returns:
+        Diccionario con 'nuevas' (filas agregadas), 'total' (filas ingeridas)
+        y 'cubo' (cubo de conteos de todas las filas ingeridas)
+    """
+    carpeta = directorio_archivo(ruta, directorio)
+    guardado = None if reiniciar else _leer_estado(carpeta)
+
+    with etapa('carga', archivo=os.path.basename(ruta)):
+        df = cargar_encuesta(ruta)
+
+    if guardado is not None and guardado[0]['columnas'] != [str(c) for c in df.columns]:
+        print("ADVERTENCIA: Los encabezados de la exportación cambiaron. Se vuelve a ingerir todo el archivo.")
+        guardado = None
+    if guardado is None:
+        shutil.rmtree(carpeta, ignore_errors=True)
+        os.makedirs(os.path.join(carpeta, 'lotes'), exist_ok=True)
+        estado = {'version': VERSION_INGESTA, 'archivo': os.path.abspath(ruta),
+                  'columnas': [str(c) for c in df.columns], 'ultima_marca': None, 'filas': 0, 'lotes': []}
+        cubo, hashes_ingeridos = None, np.zeros(0, dtype=np.uint64)
+    else:
+        estado, cubo, hashes_ingeridos = guardado
+
+    with etapa('filas_nuevas'):
+        posiciones, hashes = filas_nuevas(df, hashes_ingeridos, estado['ultima_marca'])
+    if len(posiciones) == 0:
+        return {'nuevas': 0, 'total': estado['filas'], 'cubo': cubo}
+
+    # Solo las filas nuevas se guardan y se cuentan
+    nuevas = df.iloc[posiciones].reset_index(drop=True)
+    lote = f"lote_{len(estado['lotes']) + 1:05d}.feather"
+    nuevas.to_feather(os.path.join(carpeta, 'lotes', lote))
+
+    delta = construir_cubo(aplicar_esquema(normalizar_columnas(nuevas)))
+    cubo = delta if cubo is None else combinar_cubos(cubo, delta)
+
+    estado['lotes'].append(lote)
+    estado['filas'] += len(nuevas)
+    estado['ultima_marca'] = _ultima_marca(nuevas, anterior=estado['ultima_marca'])
+    _guardar_estado(carpeta, estado, cubo, np.sort(np.concatenate([hashes_ingeridos, hashes[posiciones]])))
+    return {'nuevas': len(nuevas), 'total': estado['filas'], 'cubo': cubo}
+
+
+def cargar_ingesta(ruta=ARCHIVO_RESPUESTAS, directorio=DIRECTORIO_INGESTA, categorizar=True):
+    """
+    Todas las filas ingeridas de un archivo, normalizadas como en
+    cargar_encuesta_normalizada (None si todavía no se ingirió)
+    """
+    carpeta = directorio_archivo(ruta, directorio)
+    guardado = _leer_estado(carpeta)
+    if guardado is None:
+        return None
+    lotes = [pd.read_feather(os.path.join(carpeta, 'lotes', lote)) for lote in guardado[0]['lotes']]
+    df = normalizar_columnas(pd.concat(lotes, ignore_index=True) if len(lotes) > 1 else lotes[0])
+    return aplicar_esquema(df) if categorizar else df
+
+
+def actualizar_encuesta(ruta=ARCHIVO_RESPUESTAS, directorio=DIRECTORIO_INGESTA):
+    """
+    Ingiere las filas nuevas y devuelve los datos y el cubo actualizados.
+
+    Returns:
+        (DataFrame normalizado con todas las filas ingeridas, cubo de conteos)
+    """
+    resultado = ingerir(ruta, directorio)
+    print(f"[OK] Ingesta incremental: {resultado['nuevas']} filas nuevas ({resultado['total']} en total)")
+    return cargar_ingesta(ruta, directorio), resultado['cubo']
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Agrega las filas nuevas de una exportación a los conteos guardados")
+    parser.add_argument('--archivo', default=ARCHIVO_RESPUESTAS, help="Exportación completa de la encuesta")
+    parser.add_argument('--reiniciar', action='store_true', help="Borrar lo ingerido y empezar de nuevo")
+    args = parser.parse_args()
+
+    resultado = ingerir(args.archivo, reiniciar=args.reiniciar)
+    print(f"[OK] {resultado['nuevas']} filas nuevas ingeridas ({resultado['total']} en total)")
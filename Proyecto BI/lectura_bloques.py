@@ -0,0 +1,161 @@
+"""
+Lectura por bloques de exportaciones muy grandes
+pd.read_excel carga el libro completo antes de poder contar nada. Aquí la
+exportación se lee en bloques de tamaño fijo (openpyxl en modo solo lectura
+para .xlsx, lectura por partes para .csv y por lotes de filas para .parquet);
+cada bloque se normaliza, se convierte a categóricas y su cubo de conteos se
+suma al acumulado con cubo.combinar_cubos. La memoria queda acotada por el
+tamaño del bloque y los conteos parciales están disponibles desde el primer
+bloque. El cubo final es el mismo que construir_cubo con todas las filas y
+sirve para las secciones 4, 5 y 6 (parámetro cubo=) y el reporte
+"""
+
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from carga_datos import normalizar_columnas, ARCHIVO_RESPUESTAS
+from cubo import combinar_cubos, construir_cubo, consultar_cubo, total_cubo
+from esquema import aplicar_esquema
+from perfilado import etapa
+
+# Filas por bloque: unos pocos MB por bloque con las 51 columnas del formulario
+TAMANO_BLOQUE = 50_000
+
+
+# ============================================================================
+# LECTURA
+# ============================================================================
+
+def _bloques_excel(ruta, tamano):
+    """Bloques de un .xlsx leído fila a fila (openpyxl en modo solo lectura)"""
+    from openpyxl import load_workbook
+
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        filas = libro.worksheets[0].iter_rows(values_only=True)
+        encabezados = [str(e) if e is not None else f"Unnamed: {i}" for i, e in enumerate(next(filas, []))]
+        bloque = []
+        for fila in filas:
+            if all(valor is None for valor in fila):
+                continue
+            bloque.append(fila)
+            if len(bloque) == tamano:
+                yield pd.DataFrame.from_records(bloque, columns=encabezados)
+                bloque = []
+        if bloque:
+            yield pd.DataFrame.from_records(bloque, columns=encabezados)
+    finally:
+        libro.close()
+
+
+def _bloques_parquet(ruta, tamano):
+    """Bloques de un .parquet leídos por lotes de filas"""
+    import pyarrow.parquet as pq
+    archivo = pq.ParquetFile(ruta)
+    for lote in archivo.iter_batches(batch_size=tamano):
+        yield lote.to_pandas()
+
+
+def leer_bloques(ruta=ARCHIVO_RESPUESTAS, tamano=TAMANO_BLOQUE):
+    """
+    Recorre un archivo de la encuesta en bloques de `tamano` filas.
+
+    Yields:
+        DataFrames con las columnas originales del archivo
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == '.csv':
+        bloques = pd.read_csv(ruta, chunksize=tamano)
+    elif extension == '.parquet':
+        bloques = _bloques_parquet(ruta, tamano)
+    else:
+        bloques = _bloques_excel(ruta, tamano)
+
+    while True:
+        with etapa('lectura_bloque'):
+            bloque = next(bloques, None)
+        if bloque is None:
+            return
+        yield bloque
+
+
+# ============================================================================
+# CONTEOS ACUMULADOS
+# ============================================================================
+
+def _enteros_estables(bloque):
+    """
+    Un bloque con algún vacío lee los enteros como float (16.0); se pasan a
+    Int64 para que la edad tenga las mismas etiquetas en todos los bloques
+    """
+    bloque = bloque.copy(deep=False)
+    for columna in bloque.columns:
+        serie = bloque[columna]
+        if pd.api.types.is_float_dtype(serie):
+            valores = serie.dropna()
+            if len(valores) and (valores == valores.round()).all():
+                bloque[columna] = serie.astype('Int64')
+    return bloque
+
+
+def cubos_parciales(ruta=ARCHIVO_RESPUESTAS, tamano=TAMANO_BLOQUE):
+    """
+    Cubo acumulado después de cada bloque.
+
+    Yields:
+        (filas leídas hasta el momento, cubo de esas filas)
+    """
+    cubo = None
+    filas = 0
+    for bloque in leer_bloques(ruta, tamano):
+        with etapa('bloque', filas=len(bloque)):
+            delta = construir_cubo(aplicar_esquema(normalizar_columnas(_enteros_estables(bloque))))
+            cubo = delta if cubo is None else combinar_cubos(cubo, delta)
+        filas += len(bloque)
+        yield filas, cubo
+
+
+def cubo_por_bloques(ruta=ARCHIVO_RESPUESTAS, tamano=TAMANO_BLOQUE, al_avanzar=None):
+    """
+    Cubo de conteos de todo el archivo, leído por bloques.
+
+    Args:
+        ruta: Exportación (.xlsx, .csv o .parquet)
+        tamano: Filas por bloque
+        al_avanzar: Función opcional llamada con (filas leídas, cubo parcial)
+                    después de cada bloque
+
+    Returns:
+        Cubo igual al de construir_cubo sobre todas las filas (None si el archivo está vacío)
+    """
+    cubo = None
+    for filas, cubo in cubos_parciales(ruta, tamano):
+        if al_avanzar is not None:
+            al_avanzar(filas, cubo)
+    return cubo
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cuenta las respuestas de una exportación grande por bloques")
+    parser.add_argument('--archivo', default=ARCHIVO_RESPUESTAS, help="Exportación (.xlsx, .csv o .parquet)")
+    parser.add_argument('--tamano', type=int, default=TAMANO_BLOQUE, help="Filas por bloque")
+    parser.add_argument('--pregunta', default='Plan_Despues_Colegio',
+                        help="Pregunta cuyo conteo parcial se muestra después de cada bloque")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+
+    def mostrar_avance(filas, cubo):
+        print(f"\n[{time.perf_counter() - inicio:6.1f}s] {filas} filas leídas")
+        if cubo['alias'].get(args.pregunta):
+            print(consultar_cubo(cubo, args.pregunta).to_string())
+
+    cubo = cubo_por_bloques(args.archivo, args.tamano, al_avanzar=mostrar_avance)
+    if cubo is None:
+        print("ADVERTENCIA: El archivo no tiene filas.")
+    else:
+        print(f"\n[OK] {total_cubo(cubo)} encuestados contados en {time.perf_counter() - inicio:.1f}s "
+              f"({len(cubo['conteos'])} preguntas)")
@@ -0,0 +1,163 @@
+"""
+Matriz compacta de respuestas
+Toda la encuesta como una sola matriz contigua de códigos int8
+(encuestados x preguntas), más la lista de etiquetas de cada pregunta. Se
+guarda como .npy al lado de la copia columnar del Excel y se abre con
+np.load(mmap_mode='r'): cargarla no lee el archivo y cada pregunta es una
+columna contigua de la matriz (orden Fortran), así que sus conteos salen de
+un np.bincount sobre la columna mapeada, sin crear strings de Python.
+
+Solo entran las preguntas de respuesta cerrada (hasta 127 opciones); la marca
+temporal, el correo y el texto libre se quedan en el DataFrame
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from carga_datos import (calcular_hash_archivo, cargar_encuesta_normalizada, _nombre_cache,
+                         ARCHIVO_RESPUESTAS, DIRECTORIO_CACHE)
+
+# Un código int8 admite hasta 127 opciones (-1 = sin respuesta)
+MAXIMO_OPCIONES = np.iinfo(np.int8).max
+
+
+# ============================================================================
+# CONSTRUCCIÓN
+# ============================================================================
+
+def _codigos_columna(serie):
+    """Códigos int8 y etiquetas de una columna (None si no es de respuesta cerrada)"""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos, etiquetas = serie.cat.codes.to_numpy(), serie.cat.categories
+    elif pd.api.types.is_datetime64_any_dtype(serie) or serie.isna().all():
+        return None
+    else:
+        codigos, etiquetas = pd.factorize(serie, sort=True)
+    if len(etiquetas) > MAXIMO_OPCIONES:
+        return None
+    return codigos.astype(np.int8, copy=False), etiquetas.tolist()
+
+
+def construir_matriz(df):
+    """
+    Convierte las preguntas de respuesta cerrada de df en una matriz int8.
+
+    Returns:
+        Diccionario con 'codigos' (matriz encuestados x preguntas, orden
+        Fortran, -1 = vacío), 'columnas' (encabezado de cada columna) y
+        'etiquetas' (encabezado -> lista de opciones, en el orden de los códigos)
+    """
+    columnas, codigos, etiquetas = [], [], {}
+    for columna in df.columns:
+        resultado = _codigos_columna(df[columna])
+        if resultado is None:
+            continue
+        columnas.append(columna)
+        codigos.append(resultado[0])
+        etiquetas[columna] = resultado[1]
+
+    matriz = np.empty((len(df), len(columnas)), dtype=np.int8, order='F')
+    for j, codigos_columna in enumerate(codigos):
+        matriz[:, j] = codigos_columna
+    return {'codigos': matriz, 'columnas': columnas, 'etiquetas': etiquetas}
+
+
+# ============================================================================
+# ALMACENAMIENTO
+# ============================================================================
+
+def guardar_matriz(matriz, carpeta):
+    """Guarda los códigos (codigos.npy) y las etiquetas (etiquetas.json) en `carpeta`"""
+    temporal = f"{carpeta}.{os.getpid()}.tmp"
+    os.makedirs(temporal, exist_ok=True)
+    np.save(os.path.join(temporal, 'codigos.npy'), matriz['codigos'])
+    with open(os.path.join(temporal, 'etiquetas.json'), 'w', encoding='utf-8') as archivo:
+        json.dump({'columnas': matriz['columnas'], 'etiquetas': matriz['etiquetas']},
+                  archivo, ensure_ascii=False, default=str)
+    # La carpeta completa se reemplaza de una vez para no dejar una matriz a medias
+    shutil.rmtree(carpeta, ignore_errors=True)
+    os.replace(temporal, carpeta)
+
+
+def cargar_matriz(carpeta, mmap=True):
+    """Abre una matriz guardada (con `mmap` los códigos se mapean en memoria, solo lectura)"""
+    with open(os.path.join(carpeta, 'etiquetas.json'), encoding='utf-8') as archivo:
+        metadatos = json.load(archivo)
+    codigos = np.load(os.path.join(carpeta, 'codigos.npy'), mmap_mode='r' if mmap else None)
+    return {'codigos': codigos, 'columnas': metadatos['columnas'], 'etiquetas': metadatos['etiquetas']}
+
+
+def matriz_encuesta(ruta=ARCHIVO_RESPUESTAS, directorio_cache=DIRECTORIO_CACHE):
+    """
+    Matriz de códigos de un archivo de la encuesta, mapeada en memoria.
+
+    Se construye la primera vez (a partir de cargar_encuesta_normalizada) y se
+    reutiliza mientras el archivo no cambie, igual que la copia columnar.
+    """
+    hash_archivo = calcular_hash_archivo(ruta)
+    carpeta = os.path.join(directorio_cache, f"{_nombre_cache(ruta)}_{hash_archivo[:16]}_matriz")
+    try:
+        return cargar_matriz(carpeta)
+    except (OSError, ValueError):
+        pass
+
+    matriz = construir_matriz(cargar_encuesta_normalizada(ruta))
+    try:
+        guardar_matriz(matriz, carpeta)
+    except OSError as e:
+        print(f"ADVERTENCIA: No se pudo guardar la matriz de respuestas ({e}).")
+        return matriz
+    return cargar_matriz(carpeta)
+
+
+# ============================================================================
+# CONTEOS
+# ============================================================================
+
+def _contar_codigos(codigos, etiquetas):
+    """
+    Opciones respondidas y su cantidad, como np.unique(..., return_counts=True).
+
+    Los códigos int8 se leen como uint8 (una vista, sin copia): el vacío (-1)
+    queda en la posición 255 y no se cuenta.
+    """
+    conteo = np.bincount(codigos.view(np.uint8), minlength=256)[:len(etiquetas)]
+    respondidas = np.flatnonzero(conteo)
+    return np.asarray(etiquetas, dtype=object)[respondidas], conteo[respondidas]
+
+
+def frecuencias(datos, columna):
+    """
+    Frecuencia de cada respuesta de una pregunta.
+
+    Args:
+        datos: DataFrame de la encuesta o matriz de matriz_encuesta()
+        columna: Encabezado de la pregunta
+
+    Returns:
+        (opciones respondidas, cantidades) o None si la pregunta no está
+    """
+    if isinstance(datos, dict):
+        if columna not in datos['etiquetas']:
+            return None
+        j = datos['columnas'].index(columna)
+        return _contar_codigos(datos['codigos'][:, j], datos['etiquetas'][columna])
+
+    if columna not in datos.columns:
+        return None
+    resultado = _codigos_columna(datos[columna])
+    if resultado is None:
+        unique, counts = np.unique(datos[columna].dropna().to_numpy(), return_counts=True)
+        return unique, counts
+    return _contar_codigos(*resultado)
+
+
+if __name__ == "__main__":
+    matriz = matriz_encuesta()
+    codigos = matriz['codigos']
+    print(f"[OK] Matriz de respuestas: {codigos.shape[0]} encuestados x {codigos.shape[1]} preguntas "
+          f"({codigos.nbytes / 1024:.1f} KB)")
@@ -0,0 +1,175 @@
+"""
+Métricas de distribución de todas las preguntas a la vez
+Cuenta las respuestas de todas las preguntas y todos los grupos (grado,
+colegio, ...) en un único np.bincount sobre los códigos categóricos, en un
+arreglo grupos x preguntas x opciones rellenado con ceros. La moda, su
+porcentaje, la entropía de Shannon y la diversidad (Gini-Simpson) se
+calculan sobre ese arreglo sin recorrer las preguntas en Python
+"""
+
+import numpy as np
+import pandas as pd
+
+from esquema import codigos_respuestas
+from perfilado import perfilar
+
+# Se suma a las probabilidades antes del logaritmo (como en la Sección 2)
+EPSILON_ENTROPIA = 1e-10
+
+
+# ============================================================================
+# CONTEOS
+# ============================================================================
+
+@perfilar('conteos')
+def tabla_conteos(df, preguntas, grupo=None, filas=None):
+    """
+    Conteo de todas las preguntas por grupo en una sola pasada.
+
+    Args:
+        df: DataFrame normalizado (con categorías del esquema)
+        preguntas: Columnas a contar
+        grupo: Columna que separa los grupos (opcional); las filas sin
+               grupo no se cuentan
+        filas: Contar solo estas posiciones (ej. las de indices.aplicar_filtros)
+
+    Returns:
+        Diccionario con 'conteos' (grupos x preguntas x opciones), las
+        'preguntas', las 'categorias' de cada una, si es 'categoricas' y las
+        etiquetas de 'grupos' (['Todos'] si no hay grupo)
+    """
+    preguntas = list(preguntas)
+    codigos, categorias, categoricas = [], [], []
+    for pregunta in preguntas:
+        serie = df[pregunta]
+        categoricas.append(isinstance(serie.dtype, pd.CategoricalDtype))
+        if categoricas[-1]:
+            codigos_p, categorias_p = codigos_respuestas(serie, filas=filas)
+        else:
+            # En orden de aparición: los empates quedan como en value_counts
+            codigos_p, categorias_p = pd.factorize(serie if filas is None else serie.iloc[filas])
+            categorias_p = list(categorias_p)
+        codigos.append(codigos_p)
+        categorias.append(categorias_p)
+
+    n_filas = len(df) if filas is None else len(filas)
+    if grupo is None:
+        codigos_grupo = np.zeros(n_filas, dtype=np.intp)
+        grupos = ['Todos']
+    else:
+        codigos_grupo, grupos = codigos_respuestas(df[grupo], filas=filas)
+
+    n_preguntas = len(preguntas)
+    n_opciones = max((len(c) for c in categorias), default=0)
+    matriz = np.column_stack(codigos) if codigos else np.zeros((n_filas, 0), dtype=np.intp)
+
+    # Posición plana (grupo, pregunta, opción) de cada respuesta
+    validos = (matriz >= 0) & (codigos_grupo >= 0)[:, None]
+    fila_resp, col_resp = np.nonzero(validos)
+    posiciones = (codigos_grupo[fila_resp] * n_preguntas + col_resp) * n_opciones + matriz[fila_resp, col_resp]
+    conteos = np.bincount(posiciones, minlength=len(grupos) * n_preguntas * n_opciones)
+
+    return {
+        'conteos': conteos.reshape(len(grupos), n_preguntas, n_opciones),
+        'preguntas': preguntas,
+        'categorias': categorias,
+        'categoricas': categoricas,
+        'grupos': list(grupos),
+    }
+
+
+def serie_conteo(tabla, pregunta, grupo=None):
+    """
+    Conteo de una pregunta como lo da value_counts (de mayor a menor).
+
+    Las opciones sin respuestas se omiten también en las preguntas
+    categóricas, como value_counts sobre las respuestas originales (texto).
+    """
+    q = tabla['preguntas'].index(pregunta)
+    g = 0 if grupo is None else tabla['grupos'].index(grupo)
+    categorias = tabla['categorias'][q]
+    serie = pd.Series(tabla['conteos'][g, q, :len(categorias)], index=pd.Index(categorias, name=pregunta),
+                      name='count')
+    serie = serie[serie > 0]
+    return serie.sort_values(ascending=False, kind='stable')
+
+
+# ============================================================================
+# MÉTRICAS VECTORIZADAS
+# ============================================================================
+
+def metricas_conteos(conteos):
+    """
+    Métricas de cada fila de un arreglo de conteos (... x opciones).
+
+    Returns:
+        Diccionario de arreglos con la forma de conteos sin el último eje:
+        total, indice_moda, frecuencia_moda, porcentaje_moda, entropia y
+        diversidad (NaN donde no hay respuestas)
+    """
+    conteos = np.asarray(conteos)
+    total = conteos.sum(axis=-1)
+    indice_moda = conteos.argmax(axis=-1)
+    frecuencia_moda = np.take_along_axis(conteos, indice_moda[..., None], axis=-1)[..., 0]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        probabilidades = conteos / total[..., None]
+        porcentaje_moda = frecuencia_moda / total * 100
+        entropia = -np.sum(probabilidades * np.log2(probabilidades + EPSILON_ENTROPIA), axis=-1)
+        diversidad = 1 - np.sum(probabilidades ** 2, axis=-1)
+
+    return {
+        'total': total,
+        'indice_moda': indice_moda,
+        'frecuencia_moda': frecuencia_moda,
+        'porcentaje_moda': porcentaje_moda,
+        'entropia': entropia,
+        'diversidad': diversidad,
+    }
+
+
+def calcular_metricas(df, preguntas, grupo=None, tabla=None, filas=None):
+    """
+    Moda, porcentaje de la moda, entropía y diversidad de cada pregunta y grupo.
+
+    Args:
+        df: DataFrame normalizado
+        preguntas: Columnas a analizar
+        grupo: Columna que separa los grupos (opcional)
+        tabla: Resultado de tabla_conteos ya calculado (opcional)
+        filas: Analizar solo estas posiciones (ver tabla_conteos)
+
+    Returns:
+        DataFrame con una fila por grupo y pregunta: grupo, pregunta,
+        total_respuestas, moda, frecuencia_moda, porcentaje_moda, entropia
+        y diversidad. Las combinaciones sin respuestas se omiten.
+    """
+    if tabla is None:
+        tabla = tabla_conteos(df, preguntas, grupo, filas)
+    metricas = metricas_conteos(tabla['conteos'])
+
+    g, q = np.nonzero(metricas['total'] > 0)
+    modas = [tabla['categorias'][j][i] for i, j in zip(metricas['indice_moda'][g, q], q)]
+
+    return pd.DataFrame({
+        'grupo': np.array(tabla['grupos'], dtype=object)[g],
+        'pregunta': np.array(tabla['preguntas'], dtype=object)[q],
+        'total_respuestas': metricas['total'][g, q],
+        'moda': modas,
+        'frecuencia_moda': metricas['frecuencia_moda'][g, q],
+        'porcentaje_moda': metricas['porcentaje_moda'][g, q],
+        'entropia': metricas['entropia'][g, q],
+        'diversidad': metricas['diversidad'][g, q],
+    })
+
+
+def ranking_diversidad(metricas):
+    """Pregunta más y menos diversa de cada grupo: DataFrame grupo -> (mayor, menor)"""
+    ordenadas = metricas.sort_values(['grupo', 'diversidad'], ascending=[True, False], kind='stable')
+    por_grupo = ordenadas.groupby('grupo', sort=False)
+    return pd.DataFrame({
+        'mayor_diversidad': por_grupo['pregunta'].first(),
+        'valor_mayor': por_grupo['diversidad'].first(),
+        'menor_diversidad': por_grupo['pregunta'].last(),
+        'valor_menor': por_grupo['diversidad'].last(),
+    })
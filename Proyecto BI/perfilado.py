@@ -0,0 +1,279 @@
+"""
+Perfilado por etapas (opcional)
+Las etapas del análisis (carga, filtros, conteos, dibujo y guardado de cada
+gráfico, armado del reporte PDF) están envueltas en `with etapa(...)`. Sin
+perfilado activo esas envolturas no hacen nada; con el perfilado activo se
+registra para cada una el tiempo real, el tiempo de CPU del proceso (de todos
+sus hilos) y el pico de memoria (tracemalloc) por encima de la memoria al
+entrar. Cada hilo tiene su propia pila de etapas; como el pico de tracemalloc
+es del proceso, la memoria solo se mide en las etapas del hilo principal (que
+incluyen lo que usen los hilos que lanzan).
+
+Se activa con activar_perfilado(), con la opción --perfilar de pipeline.py o
+con la variable de entorno BI_PERFILADO en cualquier script:
+
+    BI_PERFILADO=perfil.json python reporte.py
+
+Al terminar se escriben perfil.json (formato Trace Event, se abre en
+chrome://tracing o Perfetto, con un resumen por etapa) y perfil.folded
+(pilas colapsadas para flamegraph.pl o speedscope, en microsegundos)
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# Variables de entorno: archivo del perfil y si se mide la memoria (tracemalloc
+# hace el programa bastante más lento; BI_PERFILADO_MEMORIA=0 lo desactiva)
+VARIABLE_PERFILADO = 'BI_PERFILADO'
+VARIABLE_MEMORIA = 'BI_PERFILADO_MEMORIA'
+
+_estado = {
+    'activo': False,
+    'ruta': None,
+    'memoria': False,
+    'origen': 0.0,
+    'hilos': threading.local(),
+    'registros': [],
+    'guardar_al_salir': False,
+}
+
+
+# ============================================================================
+# ACTIVACIÓN
+# ============================================================================
+
+def activar_perfilado(ruta='perfil.json', memoria=True):
+    """
+    Empieza a registrar las etapas; el perfil se escribe en `ruta` al salir.
+
+    Args:
+        ruta: Archivo JSON de la traza (el perfil colapsado va al lado, .folded)
+        memoria: Medir el pico de memoria de cada etapa con tracemalloc
+    """
+    _estado.update(activo=True, ruta=ruta, memoria=memoria, origen=time.perf_counter(),
+                   hilos=threading.local(), registros=[])
+    if memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if not _estado['guardar_al_salir']:
+        atexit.register(_guardar_al_salir)
+        _estado['guardar_al_salir'] = True
+
+
+def desactivar_perfilado():
+    """Deja de registrar etapas (los registros ya tomados se conservan)"""
+    _estado['activo'] = False
+    if _estado['memoria'] and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def perfilado_activo():
+    """True si las etapas se están registrando"""
+    return _estado['activo']
+
+
+# ============================================================================
+# ETAPAS
+# ============================================================================
+
+def _pila_hilo():
+    """Pila de etapas abiertas del hilo actual"""
+    hilo = _estado['hilos']
+    if not hasattr(hilo, 'pila'):
+        hilo.pila = []
+    return hilo.pila
+
+
+@contextlib.contextmanager
+def _medir_etapa(nombre, detalles):
+    pila = _pila_hilo()
+    # El pico de tracemalloc es de todo el proceso: reiniciarlo desde otro hilo
+    # arruinaría la medición de la etapa del hilo principal que lo lanzó
+    memoria = (_estado['memoria'] and tracemalloc.is_tracing()
+               and threading.current_thread() is threading.main_thread())
+    marco = {'nombre': nombre.replace(';', ','), 'pico_hijos': 0, 'memoria_inicial': 0}
+
+    if memoria:
+        # El pico de tracemalloc es global: se guarda el que llevaba la etapa
+        # contenedora y se reinicia para medir solo esta
+        actual, pico = tracemalloc.get_traced_memory()
+        if pila:
+            pila[-1]['pico_hijos'] = max(pila[-1]['pico_hijos'], pico)
+        tracemalloc.reset_peak()
+        marco['memoria_inicial'] = actual
+
+    pila.append(marco)
+    inicio = time.perf_counter()
+    inicio_cpu = time.process_time()
+    try:
+        yield
+    finally:
+        pared = time.perf_counter() - inicio
+        cpu = time.process_time() - inicio_cpu
+        pila.pop()
+
+        pico_etapa = 0
+        if memoria:
+            pico = max(tracemalloc.get_traced_memory()[1], marco['pico_hijos'])
+            pico_etapa = max(pico - marco['memoria_inicial'], 0)
+            if pila:
+                pila[-1]['pico_hijos'] = max(pila[-1]['pico_hijos'], pico)
+            tracemalloc.reset_peak()
+
+        _estado['registros'].append({
+            'nombre': marco['nombre'],
+            'pila': [m['nombre'] for m in pila] + [marco['nombre']],
+            'inicio': inicio - _estado['origen'],
+            'pared': pared,
+            'cpu': cpu,
+            'memoria_pico': pico_etapa,
+            'hilo': threading.get_native_id(),
+            'nombre_hilo': threading.current_thread().name,
+            'detalles': {k: str(v) for k, v in detalles.items()},
+        })
+
+
+def etapa(nombre, **detalles):
+    """
+    Contexto que mide una etapa: with etapa('filtros', columnas=3): ...
+
+    Sin perfilado activo devuelve un contexto vacío (no mide nada).
+    """
+    if not _estado['activo']:
+        return contextlib.nullcontext()
+    return _medir_etapa(nombre, detalles)
+
+
+def perfilar(nombre=None):
+    """Decorador: cada llamada a la función es una etapa (por defecto con su nombre)"""
+    def decorador(funcion):
+        nombre_etapa = nombre or funcion.__name__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _estado['activo']:
+                return funcion(*args, **kwargs)
+            with _medir_etapa(nombre_etapa, {}):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+# ============================================================================
+# RESULTADOS
+# ============================================================================
+
+def registros_perfil():
+    """Lista de etapas registradas (en el orden en que terminaron)"""
+    return list(_estado['registros'])
+
+
+def resumen_perfil(registros=None):
+    """
+    Totales por nombre de etapa, de la más lenta a la más rápida.
+
+    Returns:
+        Lista de diccionarios con nombre, llamadas, pared, cpu (del proceso)
+        y memoria_pico (máxima)
+    """
+    totales = {}
+    for registro in (registros if registros is not None else _estado['registros']):
+        total = totales.setdefault(registro['nombre'], {'nombre': registro['nombre'], 'llamadas': 0,
+                                                        'pared': 0.0, 'cpu': 0.0, 'memoria_pico': 0})
+        total['llamadas'] += 1
+        total['pared'] += registro['pared']
+        total['cpu'] += registro['cpu']
+        total['memoria_pico'] = max(total['memoria_pico'], registro['memoria_pico'])
+    return sorted(totales.values(), key=lambda t: t['pared'], reverse=True)
+
+
+def pilas_colapsadas(registros=None):
+    """
+    Perfil en formato de pilas colapsadas: 'a;b;c microsegundos' por línea,
+    con el tiempo propio de cada etapa (sin el de sus etapas internas del
+    mismo hilo; las de otros hilos tienen su propia pila)
+    """
+    registros = registros if registros is not None else _estado['registros']
+    propios = {}
+    for registro in registros:
+        pila = ';'.join(registro['pila'])
+        propios[pila] = propios.get(pila, 0.0) + registro['pared']
+        if len(registro['pila']) > 1:
+            padre = ';'.join(registro['pila'][:-1])
+            propios[padre] = propios.get(padre, 0.0) - registro['pared']
+    return [f"{pila} {max(int(segundos * 1e6), 0)}" for pila, segundos in propios.items()]
+
+
+def _eventos_traza(registros):
+    """
+    Eventos completos ('ph': 'X') del formato Trace Event, en microsegundos,
+    uno por etapa en la fila de su hilo, más el nombre de cada hilo
+    """
+    pid = os.getpid()
+    hilos = {r['hilo']: r['nombre_hilo'] for r in registros}
+    nombres = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': hilo, 'args': {'name': nombre}}
+               for hilo, nombre in hilos.items()]
+    return nombres + [{
+        'name': r['nombre'],
+        'ph': 'X',
+        'ts': round(r['inicio'] * 1e6, 1),
+        'dur': round(r['pared'] * 1e6, 1),
+        'pid': pid,
+        'tid': r['hilo'],
+        'args': {'cpu_proceso_s': round(r['cpu'], 6), 'memoria_pico_bytes': r['memoria_pico'], **r['detalles']},
+    } for r in registros]
+
+
+def guardar_perfil(ruta=None):
+    """
+    Escribe la traza JSON y el perfil colapsado (.folded) al lado.
+
+    Returns:
+        (ruta de la traza, ruta del perfil colapsado)
+    """
+    ruta = ruta or _estado['ruta'] or 'perfil.json'
+    registros = _estado['registros']
+    traza = {
+        'traceEvents': _eventos_traza(registros),
+        'displayTimeUnit': 'ms',
+        'memoria_medida': _estado['memoria'],
+        'resumen': resumen_perfil(registros),
+    }
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    os.makedirs(directorio, exist_ok=True)
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump(traza, archivo, indent=1, ensure_ascii=False)
+
+    ruta_colapsada = f"{os.path.splitext(ruta)[0]}.folded"
+    with open(ruta_colapsada, 'w', encoding='utf-8') as archivo:
+        archivo.write('\n'.join(pilas_colapsadas(registros)) + '\n')
+    return ruta, ruta_colapsada
+
+
+def imprimir_resumen(limite=15):
+    """Muestra las etapas que más tiempo tomaron"""
+    resumen = resumen_perfil()
+    print("=" * 80)
+    print(f"{'Etapa':<40} {'Llamadas':>8} {'Real':>9} {'CPU proc':>9} {'Memoria':>10}")
+    print("-" * 80)
+    for total in resumen[:limite]:
+        memoria = f"{total['memoria_pico'] / 1e6:.1f} MB" if _estado['memoria'] else '-'
+        print(f"{total['nombre'][:40]:<40} {total['llamadas']:>8} {total['pared']:>8.3f}s "
+              f"{total['cpu']:>8.3f}s {memoria:>10}")
+    print("=" * 80)
+
+
+def _guardar_al_salir():
+    if _estado['registros']:
+        imprimir_resumen()
+        traza, colapsada = guardar_perfil()
+        print(f"[OK] Perfil guardado en: {traza} y {colapsada}")
+
+
+if os.environ.get(VARIABLE_PERFILADO):
+    activar_perfilado(os.environ[VARIABLE_PERFILADO], memoria=os.environ.get(VARIABLE_MEMORIA, '1') != '0')
@@ -0,0 +1,243 @@
+"""
+Ejecución completa del análisis
+Carga la encuesta una sola vez, normaliza los encabezados una sola vez y
+ejecuta las secciones 2, 4, 5 y 6 junto con los scripts de las secciones
+3 y 7 sobre el mismo DataFrame. Con --salida los gráficos se guardan como
+PNG (modo lote) y con --procesos las secciones se reparten entre procesos.
+Los filtros se pasan como argumentos (--genero, --grado, ...) y con --barrido
+se calculan todas las combinaciones de filtros (ver barrido.py)
+"""
+
+import argparse
+import functools
+import importlib.util
+import os
+
+from argumentos import agregar_argumentos_filtros, filtros_desde_argumentos
+from carga_datos import cargar_encuesta_normalizada, ARCHIVO_RESPUESTAS, RAIZ_PROYECTO
+from cubo import construir_cubo
+from indices import aplicar_filtros, construir_indices, vista_filas
+from config_graficos import activar_modo_lote, nombre_archivo_seguro
+from render_lote import ejecutar_en_paralelo, VARIABLE_PROCESOS
+from perfilado import activar_perfilado, etapa
+
+# ============================================================================
+# SCRIPTS DE LAS SECCIONES 3 Y 7
+# ============================================================================
+
+DIRECTORIO_SECCIONES_3_7 = os.path.join(RAIZ_PROYECTO, 'Seccion 3 y 7')
+
+SCRIPTS_SECCION_3 = [
+    'nivel_socioeconomico.py',
+    'ingreso_principal_numpy.py',
+    'nivel_educativo_padres.py',
+    'personas_del_hoga_numpy.py',
+    'influencia_economica_numpy.py',
+    'apoyo_numpy.py',
+]
+
+SCRIPTS_SECCION_7 = [
+    'moda_grados.py',
+    'test_moda.py',
+    'test_vocacional.py',
+]
+
+
+def importar_script(ruta):
+    """Importa un script por su ruta (las carpetas tienen espacios en el nombre)"""
+    nombre = 'script_' + os.path.splitext(os.path.basename(ruta))[0]
+    spec = importlib.util.spec_from_file_location(nombre, ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+# ============================================================================
+# REGISTRO DE SECCIONES
+# ============================================================================
+
+def _ejecutar_seccion2(df, filtros=None, indices=None):
+    """
+    La Sección 2 pide el grado por teclado; en el pipeline se usan todos.
+    Con filtros cuenta sobre las posiciones de las filas que los cumplen.
+    """
+    import seccion2
+    filas = aplicar_filtros(df, filtros, indices)[0] if filtros else None
+    seccion2.ejecutar(df, grados_filtrar=seccion2.grados_presentes(df, filas), filas=filas)
+
+
+def _sobre_filas_filtradas(funcion, filtros, indices, df):
+    """
+    Ejecuta un script que solo recibe un DataFrame sobre las filas que
+    cumplen los filtros (una copia de esas filas mientras dura el script)
+    """
+    filas, _ = aplicar_filtros(df, filtros, indices)
+    funcion(vista_filas(df, filas))
+
+
+def obtener_secciones(cubo=None, indices=None, filtros=None):
+    """
+    Devuelve la lista ordenada de (nombre, función) de todas las secciones.
+    Las secciones 4, 5 y 6 reciben el cubo de conteos, los índices de
+    filtros ya construidos y los filtros; la Sección 2, los índices y los
+    filtros; los scripts de las secciones 3 y 7 reciben solo las filas que
+    cumplen los filtros.
+    """
+    import seccion4
+    import seccion5
+    import seccion6
+
+    # Sin filtros explícitos las secciones 4, 5 y 6 usan su diccionario FILTROS
+    extra = {} if filtros is None else {'filtros': filtros}
+    secciones = [
+        ('Sección 2', functools.partial(_ejecutar_seccion2, filtros=filtros, indices=indices)),
+        ('Sección 4', functools.partial(seccion4.ejecutar, cubo=cubo, indices=indices, **extra)),
+        ('Sección 5', functools.partial(seccion5.ejecutar, cubo=cubo, indices=indices, **extra)),
+        ('Sección 6', functools.partial(seccion6.ejecutar, cubo=cubo, indices=indices, **extra)),
+    ]
+
+    for carpeta, scripts in [('Seccion 3', SCRIPTS_SECCION_3), ('Seccion 7', SCRIPTS_SECCION_7)]:
+        for script in scripts:
+            ruta = os.path.join(DIRECTORIO_SECCIONES_3_7, carpeta, script)
+            modulo = importar_script(ruta)
+            secciones.append((f"{carpeta}/{script}", modulo.ejecutar))
+
+    if filtros:
+        secciones = [(nombre, funcion) if nombre in ('Sección 2', 'Sección 4', 'Sección 5', 'Sección 6')
+                     else (nombre, functools.partial(_sobre_filas_filtradas, funcion, filtros, indices))
+                     for nombre, funcion in secciones]
+    return secciones
+
+
+# ============================================================================
+# EJECUCIÓN
+# ============================================================================
+
+def _ejecutar_seccion(nombre, funcion, df):
+    """Ejecuta una sección; devuelve el mensaje de error o None si terminó bien"""
+    import matplotlib
+
+    print(f"\n>>> {nombre}")
+    try:
+        # Cada sección modifica el estilo de matplotlib; se restaura al terminar
+        with matplotlib.rc_context(), etapa(f"seccion:{nombre}"):
+            funcion(df)
+    except Exception as e:
+        print(f"[ERROR] {nombre}: {e}")
+        return str(e)
+    return None
+
+
+def _ejecutar_seccion_en_proceso(nombre, df, cubo, indices, salida, filtros=None):
+    """Tarea del pool: ejecuta una sección y guarda sus gráficos con su propio prefijo"""
+    # Dentro de un trabajador no se abren más procesos
+    os.environ[VARIABLE_PROCESOS] = '1'
+    activar_modo_lote(salida, prefijo=f"{nombre_archivo_seguro(nombre)}_")
+    funcion = dict(obtener_secciones(cubo, indices, filtros))[nombre]
+    return _ejecutar_seccion(nombre, funcion, df)
+
+
+def ejecutar_todo(df=None, archivo=ARCHIVO_RESPUESTAS, solo=None, salida=None, procesos=1,
+                  filtros=None, cubo=None):
+    """
+    Ejecuta todas las secciones sobre un único DataFrame.
+
+    Args:
+        df: DataFrame ya normalizado; si es None se carga desde `archivo`
+        archivo: Ruta al Excel de respuestas
+        solo: Lista opcional de nombres de sección a ejecutar
+        salida: Carpeta donde guardar los gráficos (modo lote, sin pantalla)
+        procesos: Cantidad de procesos para repartir las secciones (requiere `salida`)
+        filtros: Diccionario dimensión -> valor (o lista) aplicado a todas las
+                 secciones; si es None las secciones 4, 5 y 6 usan sus FILTROS
+        cubo: Cubo ya construido sobre df (opcional)
+
+    Returns:
+        Lista con los nombres de las secciones que fallaron
+    """
+    if df is None:
+        df = cargar_encuesta_normalizada(archivo)
+    if cubo is None:
+        cubo = construir_cubo(df)
+    indices = construir_indices(df)
+
+    print("=" * 80)
+    print(f"PIPELINE COMPLETO - {len(df)} estudiantes")
+    if filtros:
+        filas, filtros_aplicados = aplicar_filtros(df, filtros, indices)
+        print(f"Filtros: {' | '.join(filtros_aplicados)} ({len(filas)} estudiantes)")
+    print("=" * 80)
+
+    secciones = [(nombre, funcion) for nombre, funcion in obtener_secciones(cubo, indices, filtros)
+                 if not solo or any(nombre.startswith(s) for s in solo)]
+
+    if procesos > 1 and not salida:
+        print("ADVERTENCIA: --procesos necesita --salida (los gráficos no se pueden mostrar "
+              "desde otros procesos). Se ejecuta en un solo proceso.")
+        procesos = 1
+
+    if procesos > 1:
+        tareas = [(nombre, df, cubo, indices, salida, filtros) for nombre, _ in secciones]
+        errores = ejecutar_en_paralelo(_ejecutar_seccion_en_proceso, tareas, procesos=procesos)
+    else:
+        errores = []
+        for nombre, funcion in secciones:
+            if salida:
+                activar_modo_lote(salida, prefijo=f"{nombre_archivo_seguro(nombre)}_")
+            errores.append(_ejecutar_seccion(nombre, funcion, df))
+
+    fallidas = [nombre for (nombre, _), error in zip(secciones, errores) if error is not None]
+
+    print("\n" + "=" * 80)
+    if fallidas:
+        print(f"[ADVERTENCIA] Secciones con errores: {', '.join(fallidas)}")
+    else:
+        print("[OK] Todas las secciones se ejecutaron correctamente")
+    if salida:
+        print(f"Gráficos guardados en: {salida}")
+    print("=" * 80)
+    return fallidas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ejecuta todas las secciones del análisis sobre un solo DataFrame")
+    parser.add_argument('--archivo', default=ARCHIVO_RESPUESTAS, help="Excel de respuestas a analizar")
+    parser.add_argument('--solo', nargs='*', help="Ejecutar solo estas secciones (ej. 'Sección 5' 'Seccion 3')")
+    parser.add_argument('--salida', help="Guardar los gráficos como PNG en esta carpeta en lugar de mostrarlos")
+    parser.add_argument('--procesos', type=int, help="Procesos para repartir las secciones (con --salida); "
+                                                     "en el barrido, por defecto los núcleos")
+    parser.add_argument('--barrido', action='store_true',
+                        help="Calcular todas las combinaciones de Género x Edad x Grado x Distrito en --salida")
+    parser.add_argument('--sin-graficos', action='store_true', help="En el barrido, guardar solo conteos y métricas")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Contar solo las filas nuevas del archivo y sumarlas a los conteos guardados")
+    parser.add_argument('--fuentes', nargs='*', metavar='ARCHIVO',
+                        help="Unir estos archivos (sin repetidos) y analizarlos juntos; "
+                             "sin archivos, las respuestas, T03 y la encuesta vocacional")
+    parser.add_argument('--perfilar', metavar='TRAZA',
+                        help="Medir tiempo, CPU y memoria de cada etapa y guardar la traza en TRAZA (.json y .folded); "
+                             "todo se ejecuta en un solo proceso")
+    agregar_argumentos_filtros(parser)
+    args = parser.parse_args()
+
+    if args.perfilar:
+        activar_perfilado(args.perfilar)
+    if args.incremental:
+        from ingesta import actualizar_encuesta
+        df, cubo = actualizar_encuesta(args.archivo)
+    elif args.fuentes is not None:
+        from fuentes import cargar_unificada, FUENTES
+        df = cargar_unificada(args.fuentes or FUENTES)
+        cubo = construir_cubo(df)
+    else:
+        df = cargar_encuesta_normalizada(args.archivo)
+        cubo = construir_cubo(df)
+    filtros = filtros_desde_argumentos(args, cubo)
+
+    if args.barrido:
+        from barrido import ejecutar_barrido
+        ejecutar_barrido(df=df, salida=args.salida or 'barrido', filtros_fijos=filtros,
+                         graficos=not args.sin_graficos, procesos=args.procesos, cubo=cubo)
+    else:
+        ejecutar_todo(df=df, solo=args.solo, salida=args.salida, procesos=args.procesos or 1,
+                      filtros=filtros or None, cubo=cubo)
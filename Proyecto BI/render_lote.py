@@ -0,0 +1,60 @@
+"""
+Generación de gráficos en paralelo
+Reparte figuras independientes (un gráfico por colegio, por distrito o una
+sección completa) entre varios procesos. Cada proceso usa el backend Agg y
+guarda sus figuras en disco, así el tiempo total escala con los núcleos
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from perfilado import perfilado_activo
+
+# Variable de entorno para fijar la cantidad de procesos (por defecto, los núcleos)
+VARIABLE_PROCESOS = 'BI_PROCESOS'
+
+
+def procesos_por_defecto():
+    """Cantidad de procesos a usar: BI_PROCESOS o el número de núcleos"""
+    valor = os.environ.get(VARIABLE_PROCESOS)
+    if valor:
+        try:
+            return max(1, int(valor))
+        except ValueError:
+            print(f"ADVERTENCIA: {VARIABLE_PROCESOS}='{valor}' no es un número; se usan todos los núcleos.")
+    return os.cpu_count() or 1
+
+
+def _inicializar_trabajador(directorio):
+    """Cada proceso dibuja sin pantalla; con `directorio` activa el modo lote"""
+    import matplotlib
+    matplotlib.use('Agg')
+    if directorio:
+        from config_graficos import activar_modo_lote
+        activar_modo_lote(directorio)
+
+
+def ejecutar_en_paralelo(funcion, tareas, procesos=None, directorio=None):
+    """
+    Ejecuta funcion(*argumentos) para cada tarea repartiendo entre procesos.
+
+    Args:
+        funcion: Función de nivel de módulo (debe poder enviarse a otro proceso)
+        tareas: Lista de tuplas de argumentos
+        procesos: Cantidad de procesos; con 1 (o una sola tarea, o con el
+                  perfilado activo) no se crea el pool
+        directorio: Carpeta del modo lote para los trabajadores (opcional)
+
+    Returns:
+        Lista con el resultado de cada tarea, en el mismo orden
+    """
+    tareas = list(tareas)
+    procesos = min(procesos or procesos_por_defecto(), len(tareas))
+    # Las etapas de otros procesos no quedarían en el perfil
+    if procesos <= 1 or perfilado_activo():
+        return [funcion(*argumentos) for argumentos in tareas]
+
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_trabajador,
+                             initargs=(directorio,)) as ejecutor:
+        futuros = [ejecutor.submit(funcion, *argumentos) for argumentos in tareas]
+        return [futuro.result() for futuro in futuros]
@@ -0,0 +1,359 @@
+"""
+Banco de pruebas de rendimiento
+Mide por separado cada etapa del análisis (carga del Excel, normalización y
+renombrado de columnas, filtros, conteos por pregunta y por corte, puntajes de la
+Sección 7, dibujo de gráficos y reporte PDF) sobre encuestas sintéticas de
+1.000 a 1.000.000 de encuestados. Los resultados se guardan en JSON y se
+comparan con una línea base: termina con código 1 si alguna etapa es más
+lenta que la base por encima del umbral
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from carga_datos import normalizar_columnas, RAIZ_PROYECTO
+from cubo import DIMENSIONES, construir_cubo
+from esquema import aplicar_esquema, RENOMBRAR_SECCIONES
+from indices import aplicar_filtros, construir_indices
+from render_lote import VARIABLE_PROCESOS
+
+# Encuestas sintéticas generadas para las mediciones (ignorada por git)
+DIRECTORIO_DATOS_RENDIMIENTO = os.path.join(RAIZ_PROYECTO, '.cache_rendimiento')
+
+DIRECTORIO_REPORTE = os.path.join(RAIZ_PROYECTO, 'Python Intermediate', 'Seccion2')
+
+TAMANOS = [1_000, 10_000, 100_000, 1_000_000]
+
+# Escribir y leer un xlsx más grande lleva minutos: por encima de este
+# tamaño la etapa 'carga_excel' se omite (la carga se mide con Parquet)
+MAX_FILAS_EXCEL = 10_000
+
+SEMILLA = 2024
+
+# Una etapa es una regresión si tarda más de (1 + UMBRAL) veces la línea base
+# y la diferencia supera MINIMO_SEGUNDOS (debajo de eso es ruido del reloj)
+UMBRAL = 0.25
+MINIMO_SEGUNDOS = 0.02
+
+VERSION_RESULTADOS = 1
+
+
+# ============================================================================
+# DATOS DE PRUEBA
+# ============================================================================
+
+def rutas_encuesta(n_filas, directorio=DIRECTORIO_DATOS_RENDIMIENTO, semilla=SEMILLA):
+    """Ruta base (sin extensión) de la encuesta sintética de n_filas"""
+    return os.path.join(directorio, f"encuesta_{n_filas}_{semilla}")
+
+
+def preparar_encuesta(n_filas, directorio=DIRECTORIO_DATOS_RENDIMIENTO, semilla=SEMILLA,
+                      max_filas_excel=MAX_FILAS_EXCEL):
+    """
+    Genera (una sola vez) la encuesta sintética de n_filas en Parquet y, si
+    no es demasiado grande, en xlsx.
+
+    Returns:
+        Diccionario formato -> ruta de los archivos disponibles
+    """
+    from encuesta_sintetica import escribir_encuesta, generar_encuesta
+
+    base = rutas_encuesta(n_filas, directorio, semilla)
+    formatos = ['parquet'] + (['xlsx'] if n_filas <= max_filas_excel else [])
+    faltantes = [f for f in formatos if not os.path.exists(f"{base}.{f}")]
+    if faltantes:
+        print(f"Generando encuesta sintética de {n_filas} filas ({', '.join(faltantes)})...")
+        escribir_encuesta(generar_encuesta(n_filas, semilla=semilla), base, faltantes)
+    return {f: f"{base}.{f}" for f in formatos}
+
+
+# ============================================================================
+# ETAPAS
+# ============================================================================
+
+def _importar_reporte():
+    """reporte.py está en otra carpeta y sus imports la necesitan en sys.path"""
+    if DIRECTORIO_REPORTE not in sys.path:
+        sys.path.insert(0, DIRECTORIO_REPORTE)
+    import reporte
+    return reporte
+
+
+def _filtros_frecuentes(indices, dimensiones=('Grado', 'Genero')):
+    """Filtro con el valor más frecuente de cada dimensión (un corte típico)"""
+    from indices import contar_bits
+    filtros = {}
+    for dimension in dimensiones:
+        mapas = indices['mapas'].get(dimension)
+        if mapas:
+            filtros[dimension] = max(mapas, key=lambda v: contar_bits(mapas[v]))
+    return filtros
+
+
+def _etapa_carga_excel(ctx):
+    pd.read_excel(ctx['archivos']['xlsx'])
+
+
+def _etapa_carga_parquet(ctx):
+    pd.read_parquet(ctx['archivos']['parquet'])
+
+
+def _etapa_normalizacion(ctx):
+    aplicar_esquema(normalizar_columnas(ctx['original'])).rename(columns=ctx['renombrar'])
+
+
+def _etapa_filtros(ctx):
+    aplicar_filtros(ctx['df'], ctx['filtros'], construir_indices(ctx['df']))
+
+
+def _etapa_conteo(ctx):
+    from metricas import tabla_conteos
+    tabla_conteos(ctx['df'], ctx['preguntas'])
+
+
+def _etapa_cubo(ctx):
+    construir_cubo(ctx['df'])
+
+
+def _etapa_bloques(ctx):
+    from lectura_bloques import cubo_por_bloques
+    cubo_por_bloques(ctx['archivos']['parquet'])
+
+
+def _etapa_consultas(ctx):
+    # Encuesta nueva en cada medición: se miden también los filtros y su caché
+    from consultas import encuesta, ejecutar_consultas
+    base = encuesta(ctx['df'])
+    mapas = ctx['indices']['mapas']
+    ejecutar_consultas([base.filtrar(Grado=grado, Genero=genero).contar(pregunta)
+                        for grado in mapas.get('Grado', {}) for genero in mapas.get('Genero', {})
+                        for pregunta in ctx['preguntas']])
+
+
+def _etapa_areas(ctx):
+    from areas_vocacionales import puntajes_por_grupo
+    puntajes_por_grupo(ctx['df'], ctx['columna_colegio'])
+
+
+def _etapa_graficos(ctx):
+    # Caché vacía en cada medición: se mide el dibujo, no la copia del PNG
+    from cache_graficos import graficar_en_memoria
+    reporte = ctx['reporte']
+    cache = tempfile.mkdtemp(dir=ctx['temporal'])
+    for titulo, info in reporte.PREGUNTAS_REPORTE.items():
+        conteos = ctx['datos_reporte']['preguntas'][titulo]
+        if conteos is not None and len(conteos['total']):
+            graficar_en_memoria(reporte.dibujar_grafico_pregunta, conteos['total'], info['grafico'],
+                                directorio_cache=cache)
+
+
+def _etapa_reporte(ctx):
+    with contextlib.redirect_stdout(io.StringIO()):
+        ctx['reporte'].generar_reporte_pdf(cubo=ctx['cubo'], procesos=1,
+                                           nombre_pdf=os.path.join(ctx['temporal'], 'reporte.pdf'))
+
+
+# Etapa -> (descripción, función); cada función recibe el contexto preparado
+# y solo se mide su tiempo
+ETAPAS = {
+    'carga_excel': ("pd.read_excel del archivo de respuestas", _etapa_carga_excel),
+    'carga_parquet': ("pd.read_parquet del mismo archivo", _etapa_carga_parquet),
+    'normalizacion': ("Encabezados, esquema categórico y renombrado de las secciones", _etapa_normalizacion),
+    'filtros': ("Índices de bits y aplicar_filtros (Grado y Género)", _etapa_filtros),
+    'conteo': ("Conteo de todas las preguntas (metricas.tabla_conteos)", _etapa_conteo),
+    'cubo': ("Cubo de conteos por pregunta y dimensión", _etapa_cubo),
+    'bloques': ("Cubo leído por bloques del Parquet (lectura_bloques.py)", _etapa_bloques),
+    'consultas': ("Conteo de todas las preguntas por Grado x Género (consultas.py, sin cubo)", _etapa_consultas),
+    'areas_seccion7': ("Puntajes de las áreas vocacionales por colegio", _etapa_areas),
+    'graficos': ("Dibujo de los gráficos del reporte (sin caché)", _etapa_graficos),
+    'reporte': ("generar_reporte_pdf con los gráficos en la caché", _etapa_reporte),
+}
+
+
+def preparar_contexto(archivos, temporal):
+    """Todo lo que las etapas necesitan ya calculado, para medir solo la etapa"""
+    original = pd.read_parquet(archivos['parquet'])
+    df = aplicar_esquema(normalizar_columnas(original))
+    indices = construir_indices(df)
+    cubo = construir_cubo(df)
+    reporte = _importar_reporte()
+    columna_colegio = next((c for c in DIMENSIONES['Colegio'] if c in df.columns), None)
+    return {
+        'archivos': archivos,
+        'temporal': temporal,
+        'original': original,
+        'df': df,
+        'renombrar': RENOMBRAR_SECCIONES,
+        'filtros': _filtros_frecuentes(indices),
+        'indices': indices,
+        'preguntas': [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)],
+        'columna_colegio': columna_colegio,
+        'cubo': cubo,
+        'reporte': reporte,
+        'datos_reporte': reporte.datos_reporte(cubo),
+    }
+
+
+def _etapa_disponible(etapa, ctx):
+    """Las etapas sin sus datos (xlsx demasiado grande, sin columna de colegio) se omiten"""
+    if etapa == 'carga_excel':
+        return 'xlsx' in ctx['archivos']
+    if etapa == 'areas_seccion7':
+        return ctx['columna_colegio'] is not None
+    return True
+
+
+def medir(funcion, ctx, repeticiones):
+    """Tiempos de `repeticiones` ejecuciones de la etapa (en segundos)"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(ctx)
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+# ============================================================================
+# EJECUCIÓN
+# ============================================================================
+
+def entorno():
+    """Versiones y máquina de la medición (para saber si dos resultados se pueden comparar)"""
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'nucleos': os.cpu_count(),
+    }
+
+
+def ejecutar_rendimiento(tamanos=TAMANOS, etapas=None, repeticiones=3, max_filas_excel=MAX_FILAS_EXCEL,
+                         directorio=DIRECTORIO_DATOS_RENDIMIENTO):
+    """
+    Mide todas las etapas en cada tamaño de encuesta.
+
+    Cada etapa se ejecuta `repeticiones` veces y se guarda el mínimo (el
+    tiempo menos afectado por otros procesos) y la mediana.
+
+    Returns:
+        Diccionario con el entorno y resultados[filas][etapa] = {'segundos', 'mediana'}
+    """
+    etapas = etapas or list(ETAPAS)
+    # Las etapas se miden en un solo proceso para que los tiempos sean comparables
+    os.environ[VARIABLE_PROCESOS] = '1'
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+
+    resultados = {}
+    for n_filas in tamanos:
+        archivos = preparar_encuesta(n_filas, directorio, max_filas_excel=max_filas_excel)
+        temporal = tempfile.mkdtemp(prefix='rendimiento_')
+        try:
+            ctx = preparar_contexto(archivos, temporal)
+            if 'reporte' in etapas:
+                # Primera ejecución fuera de la medición: deja los gráficos en la caché
+                _etapa_reporte(ctx)
+
+            resultados[str(n_filas)] = {}
+            for etapa in etapas:
+                if not _etapa_disponible(etapa, ctx):
+                    continue
+                tiempos = medir(ETAPAS[etapa][1], ctx, repeticiones)
+                resultados[str(n_filas)][etapa] = {'segundos': min(tiempos), 'mediana': float(np.median(tiempos))}
+                print(f"  {n_filas:>9} filas  {etapa:<15} {min(tiempos):>9.4f}s")
+        finally:
+            shutil.rmtree(temporal, ignore_errors=True)
+
+    return {
+        'version': VERSION_RESULTADOS,
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'entorno': entorno(),
+        'repeticiones': repeticiones,
+        'resultados': resultados,
+    }
+
+
+def comparar_con_linea_base(actual, base, umbral=UMBRAL, minimo=MINIMO_SEGUNDOS):
+    """
+    Compara dos resultados de ejecutar_rendimiento.
+
+    Solo se comparan los tamaños y etapas presentes en ambos.
+
+    Returns:
+        Lista de (filas, etapa, segundos base, segundos actuales, cambio relativo)
+        de las etapas más lentas que la base por encima del umbral
+    """
+    regresiones = []
+    for filas, etapas in actual['resultados'].items():
+        for etapa, medicion in etapas.items():
+            anterior = base.get('resultados', {}).get(filas, {}).get(etapa)
+            if anterior is None:
+                continue
+            antes, ahora = anterior['segundos'], medicion['segundos']
+            if ahora > antes * (1 + umbral) and ahora - antes > minimo:
+                regresiones.append((int(filas), etapa, antes, ahora, ahora / antes - 1 if antes else float('inf')))
+    return regresiones
+
+
+def guardar_resultados(resultados, ruta):
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+
+
+def leer_resultados(ruta):
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide el tiempo de cada etapa del análisis según el tamaño de la encuesta")
+    parser.add_argument('--tamanos', type=int, nargs='+', default=TAMANOS, help="Cantidades de encuestados a medir")
+    parser.add_argument('--etapas', nargs='+', choices=list(ETAPAS), help="Medir solo estas etapas")
+    parser.add_argument('--repeticiones', type=int, default=3, help="Ejecuciones de cada etapa (se usa la menor)")
+    parser.add_argument('--max-filas-excel', type=int, default=MAX_FILAS_EXCEL,
+                        help="Tamaño máximo para el que se mide la carga del xlsx")
+    parser.add_argument('--salida', default='rendimiento.json', help="Archivo JSON con los resultados")
+    parser.add_argument('--linea-base', help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument('--guardar-linea-base', action='store_true',
+                        help="Guardar estos resultados como la nueva línea base (en --linea-base)")
+    parser.add_argument('--umbral', type=float, default=UMBRAL,
+                        help="Aumento relativo permitido antes de considerar una regresión (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("RENDIMIENTO POR ETAPA")
+    print("=" * 70)
+    resultados = ejecutar_rendimiento(args.tamanos, args.etapas, args.repeticiones, args.max_filas_excel)
+    guardar_resultados(resultados, args.salida)
+    print(f"[OK] Resultados guardados en: {args.salida}")
+
+    if not args.linea_base:
+        sys.exit(0)
+    if args.guardar_linea_base:
+        guardar_resultados(resultados, args.linea_base)
+        print(f"[OK] Línea base actualizada: {args.linea_base}")
+        sys.exit(0)
+    if not os.path.exists(args.linea_base):
+        print(f"ADVERTENCIA: No existe la línea base {args.linea_base}. Use --guardar-linea-base para crearla.")
+        sys.exit(0)
+
+    regresiones = comparar_con_linea_base(resultados, leer_resultados(args.linea_base), args.umbral)
+    print("-" * 70)
+    for filas, etapa, antes, ahora, cambio in regresiones:
+        print(f"[ERROR] {etapa} con {filas} filas: {antes:.4f}s -> {ahora:.4f}s (+{cambio:.0%})")
+    if regresiones:
+        print(f"[ERROR] {len(regresiones)} etapas más lentas que la línea base (umbral {args.umbral:.0%})")
+        sys.exit(1)
+    print(f"[OK] Sin regresiones respecto de la línea base (umbral {args.umbral:.0%})")
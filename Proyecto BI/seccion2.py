@@ -1,6 +1,7 @@
+import argparse
+import importlib.util
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Importar configuración de gráficos
 from config_graficos import (
@@ -11,134 +12,156 @@ from config_graficos import (
     COLOR_TEXTO, COLOR_BORDE, ALPHA_BARRAS, GROSOR_BORDE_BARRAS,
     TAMANO_TEXTO_BARRAS, TAMANO_TEXTO_PASTEL, TAMANO_LEYENDA,
     TAMANO_TITULO_SECUNDARIO, TAMANO_TITULO_DASHBOARD,
-    aplicar_estilo_ejes, aplicar_grid, aplicar_titulo, aplicar_etiquetas
+    aplicar_estilo_ejes, aplicar_grid, aplicar_titulo, aplicar_etiquetas,
+    mostrar_o_guardar, modo_lote_activo
 )
-
-# Importar scipy solo si está disponible
-try:
-    from scipy import stats
-    SCIPY_AVAILABLE = True
-except ImportError:
-    SCIPY_AVAILABLE = False
+from argumentos import agregar_argumentos_filtros, filtros_desde_argumentos
+from carga_datos import cargar_encuesta_normalizada, ARCHIVO_RESPUESTAS
+from cubo import construir_cubo
+from indices import aplicar_filtros
+from cache_graficos import graficar_con_cache
+from esquema import contar_respuestas, tabla_cruzada
+from metricas import calcular_metricas, ranking_diversidad, serie_conteo, tabla_conteos
+from asociaciones import estadisticos_contingencia, valores_p
+
+# Scipy es opcional; solo se comprueba que esté instalado (se importa al calcular los valores p)
+SCIPY_AVAILABLE = importlib.util.find_spec('scipy') is not None
+if not SCIPY_AVAILABLE:
     print("ADVERTENCIA: Scipy no esta disponible. Las pruebas estadisticas avanzadas estaran limitadas.")
 
-# Configurar estilo global de gráficos
-configurar_estilo_global()
+# Mapeo de columnas según el archivo real (encabezados ya normalizados)
+col_grado = '¿En qué grado estás actualmente?'
+col_genero_archivo = 'Género'
 
-# Cargar datos del archivo correcto
-archivo = '../data/RecopilaciónDeDatos-BI(respuestas).xlsx'
-df = pd.read_excel(archivo)
 
+# --- FILAS ANALIZADAS ---
+def grados_presentes(df, filas=None):
+    """Grados con al menos un estudiante (entre las posiciones `filas`, si se indican)"""
+    cantidades = contar_respuestas(df[col_grado], filas=filas)
+    return sorted(cantidades.index[cantidades > 0])
 
-# Mapeo de columnas según el archivo real
-col_grado = '  ¿En qué grado estás actualmente?   '
-col_genero = 'Género ' if 'Género ' in df.columns else None
 
+def filas_de_grados(df, grados, filas=None):
+    """Posiciones de los estudiantes de los grados indicados (dentro de `filas`)"""
+    mascara = df[col_grado].isin(grados).to_numpy()
+    return np.flatnonzero(mascara) if filas is None else filas[mascara[filas]]
 
-total_estudiantes = len(df)
-conteo_por_grado = df[col_grado].value_counts()
-conteo_por_genero = df[col_genero].value_counts() if col_genero else None
 
-print("\n============================")
-print("METRICAS GENERALES")
-print("============================")
-print(f"Total de estudiantes encuestados: {total_estudiantes}\n")
+def _conteo_ordenado(serie, filas):
+    """Conteo de mayor a menor, como value_counts, sin armar el DataFrame filtrado"""
+    return contar_respuestas(serie, filas=filas).sort_values(ascending=False, kind='stable')
 
-print("Distribucion por grado:")
-for grado, cant in conteo_por_grado.items():
-    print(f"   - {grado} de secundaria: {cant}")
 
-if conteo_por_genero is not None:
-    print("\nDistribucion por genero:")
-    for genero, cant in conteo_por_genero.items():
-        print(f"   - {genero}: {cant}")
+# --- MÉTRICAS GENERALES ---
+def mostrar_metricas_generales(df, filas=None):
+    """Muestra la distribución por grado y género con sus gráficos"""
+    import matplotlib.pyplot as plt
 
-# --- GRÁFICOS DE DISTRIBUCIÓN PROFESIONALES ---
-# Gráfico de barras por grado
-fig, ax = plt.subplots(figsize=TAMANO_BARRAS)
-bars = ax.bar(conteo_por_grado.index, conteo_por_grado.values, 
-              color=COLORES_PROFESIONALES[:len(conteo_por_grado)], 
-              edgecolor=COLOR_BORDE, linewidth=GROSOR_BORDE_BARRAS, alpha=ALPHA_BARRAS)
+    col_genero = col_genero_archivo if col_genero_archivo in df.columns else None
 
-# Agregar valores en las barras
-for bar in bars:
-    height = bar.get_height()
-    ax.text(bar.get_x() + bar.get_width()/2., height + 1,
-            f'{int(height)}', ha='center', va='bottom', 
-            fontweight='bold', fontsize=TAMANO_TEXTO_BARRAS, color=COLOR_TEXTO)
+    total_estudiantes = len(df) if filas is None else len(filas)
+    conteo_por_grado = _conteo_ordenado(df[col_grado], filas)
+    conteo_por_genero = _conteo_ordenado(df[col_genero], filas) if col_genero else None
 
-aplicar_titulo(ax, "Distribución de Estudiantes por Grado")
-aplicar_etiquetas(ax, xlabel="Grado", ylabel="Número de Estudiantes")
-aplicar_grid(ax, eje='y')
-ax.set_ylim(0, max(conteo_por_grado.values) * 1.1)
-aplicar_estilo_ejes(ax)
+    print("\n============================")
+    print("METRICAS GENERALES")
+    print("============================")
+    print(f"Total de estudiantes encuestados: {total_estudiantes}\n")
 
-plt.tight_layout()
-plt.show()
+    print("Distribucion por grado:")
+    for grado, cant in conteo_por_grado.items():
+        print(f"   - {grado} de secundaria: {cant}")
+
+    if conteo_por_genero is not None:
+        print("\nDistribucion por genero:")
+        for genero, cant in conteo_por_genero.items():
+            print(f"   - {genero}: {cant}")
+
+    # --- GRÁFICOS DE DISTRIBUCIÓN PROFESIONALES ---
+    # Gráfico de barras por grado
+    fig, ax = plt.subplots(figsize=TAMANO_BARRAS)
+    bars = ax.bar(conteo_por_grado.index, conteo_por_grado.values, 
+                  color=COLORES_PROFESIONALES[:len(conteo_por_grado)], 
+                  edgecolor=COLOR_BORDE, linewidth=GROSOR_BORDE_BARRAS, alpha=ALPHA_BARRAS)
+
+    # Agregar valores en las barras
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 1,
+                f'{int(height)}', ha='center', va='bottom', 
+                fontweight='bold', fontsize=TAMANO_TEXTO_BARRAS, color=COLOR_TEXTO)
+
+    aplicar_titulo(ax, "Distribución de Estudiantes por Grado")
+    aplicar_etiquetas(ax, xlabel="Grado", ylabel="Número de Estudiantes")
+    aplicar_grid(ax, eje='y')
+    ax.set_ylim(0, max(conteo_por_grado.values) * 1.1)
+    aplicar_estilo_ejes(ax)
 
-# Gráfico de pastel por género (si existe)
-if conteo_por_genero is not None:
-    fig, ax = plt.subplots(figsize=TAMANO_PASTEL)
-    
-    wedges, texts, autotexts = ax.pie(conteo_por_genero.values, 
-                                     labels=conteo_por_genero.index,
-                                     autopct='%1.1f%%',
-                                     startangle=90,
-                                     colors=COLORES_PROFESIONALES[:len(conteo_por_genero)],
-                                     explode=[0.05] * len(conteo_por_genero),
-                                     shadow=True,
-                                     textprops={'fontsize': 12, 'fontweight': 'bold'})
-    
-    # Personalizar el texto de porcentajes
-    for autotext in autotexts:
-        autotext.set_color(COLOR_TEXTO)
-        autotext.set_fontweight('bold')
-        autotext.set_fontsize(TAMANO_TEXTO_PASTEL)
-    
-    aplicar_titulo(ax, "Distribución por Género")
-    ax.legend(wedges, [f'{label}: {value}' for label, value in zip(conteo_por_genero.index, conteo_por_genero.values)],
-              title="Género", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1),
-              fontsize=TAMANO_LEYENDA, title_fontsize=12)
-    
     plt.tight_layout()
-    plt.show()
+    mostrar_o_guardar()
+
+    # Gráfico de pastel por género (si existe)
+    if conteo_por_genero is not None:
+        fig, ax = plt.subplots(figsize=TAMANO_PASTEL)
+        
+        wedges, texts, autotexts = ax.pie(conteo_por_genero.values, 
+                                         labels=conteo_por_genero.index,
+                                         autopct='%1.1f%%',
+                                         startangle=90,
+                                         colors=COLORES_PROFESIONALES[:len(conteo_por_genero)],
+                                         explode=[0.05] * len(conteo_por_genero),
+                                         shadow=True,
+                                         textprops={'fontsize': 12, 'fontweight': 'bold'})
+        
+        # Personalizar el texto de porcentajes
+        for autotext in autotexts:
+            autotext.set_color(COLOR_TEXTO)
+            autotext.set_fontweight('bold')
+            autotext.set_fontsize(TAMANO_TEXTO_PASTEL)
+        
+        aplicar_titulo(ax, "Distribución por Género")
+        ax.legend(wedges, [f'{label}: {value}' for label, value in zip(conteo_por_genero.index, conteo_por_genero.values)],
+                  title="Género", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1),
+                  fontsize=TAMANO_LEYENDA, title_fontsize=12)
+        
+        plt.tight_layout()
+        mostrar_o_guardar()
 
 # --- FUNCIONES DE ANÁLISIS ESTADÍSTICO ---
-def calcular_metricas_estadisticas(df, pregunta, titulo):
-    """Calcula métricas estadísticas para una pregunta"""
-    if pregunta not in df.columns:
-        return None
-    
-    respuestas = df[pregunta].dropna()
-    if respuestas.empty:
+def calcular_metricas_estadisticas(df, preguntas, filas=None):
+    """
+    Calcula métricas estadísticas de todas las preguntas en una sola pasada.
+
+    Args:
+        df: DataFrame de la encuesta
+        preguntas: Diccionario pregunta -> título
+        filas: Posiciones de los estudiantes analizados (por defecto todos)
+
+    Returns:
+        Diccionario pregunta -> métricas (solo preguntas con respuestas)
+    """
+    presentes = [p for p in preguntas if p in df.columns]
+    tabla = tabla_conteos(df, presentes, filas=filas)
+    resultado = {}
+    for _, fila in calcular_metricas(df, presentes, tabla=tabla).iterrows():
+        resultado[fila['pregunta']] = {
+            'titulo': preguntas[fila['pregunta']],
+            'total_respuestas': fila['total_respuestas'],
+            'moda': fila['moda'],
+            'frecuencia_moda': fila['frecuencia_moda'],
+            'porcentaje_moda': fila['porcentaje_moda'],
+            'entropia': fila['entropia'],
+            'diversidad': fila['diversidad'],
+            'conteo': serie_conteo(tabla, fila['pregunta'])
+        }
+    return resultado
+
+def ranking_por_grado(df, preguntas, filas=None):
+    """Pregunta con mayor y menor diversidad dentro de cada grado"""
+    presentes = [p for p in preguntas if p in df.columns]
+    if col_grado not in df.columns or not presentes:
         return None
-    
-    conteo = respuestas.value_counts()
-    total_respuestas = len(respuestas)
-    
-    # Métricas básicas
-    moda = conteo.index[0]  # Respuesta más frecuente
-    frecuencia_moda = conteo.iloc[0]
-    porcentaje_moda = (frecuencia_moda / total_respuestas) * 100
-    
-    # Diversidad de respuestas (entropía)
-    probabilidades = conteo / total_respuestas
-    entropia = -np.sum(probabilidades * np.log2(probabilidades + 1e-10))
-    
-    # Índice de diversidad (1 - concentración)
-    concentracion = np.sum(probabilidades**2)
-    diversidad = 1 - concentracion
-    
-    return {
-        'titulo': titulo,
-        'total_respuestas': total_respuestas,
-        'moda': moda,
-        'frecuencia_moda': frecuencia_moda,
-        'porcentaje_moda': porcentaje_moda,
-        'entropia': entropia,
-        'diversidad': diversidad,
-        'conteo': conteo
-    }
+    return ranking_diversidad(calcular_metricas(df, presentes, grupo=col_grado, filas=filas)).sort_index()
 
 def comparar_grados_estadisticamente(df, pregunta, titulo):
     """Compara estadísticamente las respuestas entre grados"""
@@ -146,16 +169,17 @@ def comparar_grados_estadisticamente(df, pregunta, titulo):
     if len(grados) < 2:
         return None
     
-    # Crear tabla de contingencia
-    tabla_contingencia = pd.crosstab(df[col_grado], df[pregunta])
+    # Crear tabla de contingencia (sin opciones ni grados vacíos, como pd.crosstab)
+    tabla_contingencia = tabla_cruzada(df[col_grado], df[pregunta])
+    tabla_contingencia = tabla_contingencia.loc[tabla_contingencia.sum(axis=1) > 0,
+                                                tabla_contingencia.sum(axis=0) > 0]
     
     if SCIPY_AVAILABLE:
-        # Prueba chi-cuadrado
-        chi2, p_value, dof, expected = stats.chi2_contingency(tabla_contingencia)
-        
-        # Cramer's V (medida de asociación)
-        n = tabla_contingencia.sum().sum()
-        cramers_v = np.sqrt(chi2 / (n * (min(tabla_contingencia.shape) - 1)))
+        # Prueba chi-cuadrado y Cramer's V (mismo cálculo vectorizado del mapa de asociaciones)
+        estadisticos = estadisticos_contingencia(tabla_contingencia.to_numpy())
+        chi2 = estadisticos['chi2'][0]
+        p_value = valores_p(estadisticos['chi2'], estadisticos['gl'])[0]
+        cramers_v = estadisticos['cramers_v'][0]
         
         return {
             'tabla_contingencia': tabla_contingencia,
@@ -165,21 +189,11 @@ def comparar_grados_estadisticamente(df, pregunta, titulo):
             'significativo': p_value < 0.05
         }
     else:
-        # Análisis básico sin scipy
-        n = tabla_contingencia.sum().sum()
-        total_por_grado = tabla_contingencia.sum(axis=1)
-        total_por_respuesta = tabla_contingencia.sum(axis=0)
-        
-        # Calcular diferencias porcentuales
-        diferencias = {}
-        for grado in grados:
-            for respuesta in tabla_contingencia.columns:
-                observado = tabla_contingencia.loc[grado, respuesta]
-                esperado = (total_por_grado[grado] * total_por_respuesta[respuesta]) / n
-                diferencia = abs(observado - esperado)
-                diferencias[f"{grado}_{respuesta}"] = diferencia
-        
-        diferencia_promedio = np.mean(list(diferencias.values()))
+        # Análisis básico sin scipy: diferencia media entre observado y esperado
+        observado = tabla_contingencia.to_numpy()
+        n = observado.sum()
+        esperado = np.outer(observado.sum(axis=1), observado.sum(axis=0)) / n
+        diferencia_promedio = np.abs(observado - esperado).mean()
         
         return {
             'tabla_contingencia': tabla_contingencia,
@@ -188,39 +202,45 @@ def comparar_grados_estadisticamente(df, pregunta, titulo):
         }
 
 # --- SELECCIÓN DE GRADO ---
-grados_disponibles = sorted(df[col_grado].dropna().unique())
-
-print("\n" + "="*50)
-print("SELECCION DE GRADOS PARA ANALISIS")
-print("="*50)
-print("Grados disponibles:")
-for i, grado in enumerate(grados_disponibles, 1):
-    cantidad = len(df[df[col_grado] == grado])
-    print(f"{i}. {grado} de secundaria ({cantidad} estudiantes)")
-
-print(f"\nOpciones:")
-print("1. Solo 4to de secundaria")
-print("2. Solo 5to de secundaria") 
-print("3. Ambos grados (comparativo)")
-print("4. Todos los grados disponibles")
-
-opcion = input("\nElige una opción (1-4): ").strip()
-
-if opcion == "1":
-    grados_filtrar = ["4°"]
-elif opcion == "2":
-    grados_filtrar = ["5°"]
-elif opcion == "3":
-    grados_filtrar = ["4°", "5°"]
-elif opcion == "4":
-    grados_filtrar = grados_disponibles
-else:
-    print("Opción no válida. Se usarán ambos grados (4to y 5to).")
-    grados_filtrar = ["4°", "5°"]
-
-df_filtrado = df[df[col_grado].isin(grados_filtrar)]
-print(f"\nAnalizando datos para: {', '.join(grados_filtrar)}")
-print(f"Total de estudiantes: {len(df_filtrado)}")
+def seleccionar_grados(df, filas=None):
+    """Muestra el menú de grados y devuelve la lista de grados elegida"""
+    grados_disponibles = grados_presentes(df, filas)
+
+    print("\n" + "="*50)
+    print("SELECCION DE GRADOS PARA ANALISIS")
+    print("="*50)
+    print("Grados disponibles:")
+    cantidades = contar_respuestas(df[col_grado], filas=filas)
+    for i, grado in enumerate(grados_disponibles, 1):
+        cantidad = cantidades[grado]
+        print(f"{i}. {grado} de secundaria ({cantidad} estudiantes)")
+
+    print(f"\nOpciones:")
+    print("1. Solo 4to de secundaria")
+    print("2. Solo 5to de secundaria") 
+    print("3. Ambos grados (comparativo)")
+    print("4. Todos los grados disponibles")
+
+    try:
+        opcion = input("\nElige una opción (1-4): ").strip()
+    except EOFError:
+        # La entrada se terminó (ej. un pipe vacío): se analizan todos los grados
+        print("\nSin más entrada: se analizan todos los grados.")
+        return grados_disponibles
+
+    if opcion == "1":
+        grados_filtrar = ["4°"]
+    elif opcion == "2":
+        grados_filtrar = ["5°"]
+    elif opcion == "3":
+        grados_filtrar = ["4°", "5°"]
+    elif opcion == "4":
+        grados_filtrar = grados_disponibles
+    else:
+        print("Opción no válida. Se usarán ambos grados (4to y 5to).")
+        grados_filtrar = ["4°", "5°"]
+
+    return grados_filtrar
 
 # --- PREGUNTAS DE LA SECCIÓN 2: PREFERENCIAS E INTERESES ---
 preguntas_seccion2 = {
@@ -238,7 +258,13 @@ def graficar_barras(serie, titulo, horizontal=False):
     if serie.empty:
         print(f"No hay datos para: {titulo}")
         return
-    
+    graficar_con_cache(_dibujar_barras, serie, titulo, horizontal)
+
+
+def _dibujar_barras(serie, titulo, horizontal):
+    """Dibuja las barras de graficar_barras (se reutiliza desde la caché si no cambió)"""
+    import matplotlib.pyplot as plt
+
     # Crear figura
     fig, ax = plt.subplots(figsize=(12, 8) if not horizontal else TAMANO_BARRAS_HORIZONTALES)
     
@@ -295,22 +321,28 @@ def graficar_barras(serie, titulo, horizontal=False):
         ax.set_ylim(0, max(serie_ordenada.values) * 1.15)
     
     plt.tight_layout()
-    plt.show()
 
 
-def graficar_comparativo(df, pregunta, titulo, grados):
+def graficar_comparativo(df, pregunta, titulo, grados, filas=None):
     """Gráfico comparativo profesional"""
-    datos = {}
-    for grado in grados:
-        respuestas = df[df[col_grado] == grado][pregunta].value_counts()
-        if not respuestas.empty:
-            datos[grado] = respuestas
-
-    if not datos:
+    # Opción x grado en una sola pasada; se quitan los grados sin respuestas
+    comparativo = tabla_cruzada(df[pregunta], df[col_grado], categorias_columnas=grados, posiciones=filas)
+    comparativo = comparativo.loc[:, comparativo.sum(axis=0) > 0]
+    if not isinstance(df[pregunta].dtype, pd.CategoricalDtype):
+        # Sin categorías fijas solo se muestran las respuestas de los grados elegidos
+        comparativo = comparativo.loc[comparativo.sum(axis=1) > 0]
+
+    if comparativo.empty:
         print(f"No hay respuestas para comparación en: {titulo}")
         return
 
-    comparativo = pd.DataFrame(datos).fillna(0).astype(int)
+    graficar_con_cache(_dibujar_comparativo, comparativo, titulo)
+
+
+def _dibujar_comparativo(comparativo, titulo):
+    """Dibuja el comparativo por grado (se reutiliza desde la caché si no cambió)"""
+    import matplotlib.pyplot as plt
+
     n_respuestas = len(comparativo)
 
     # Crear figura con un solo gráfico
@@ -342,92 +374,144 @@ def graficar_comparativo(df, pregunta, titulo, grados):
     aplicar_estilo_ejes(ax)
 
     plt.tight_layout()
-    plt.show()
-
-# --- ANÁLISIS DE LA SECCIÓN 2: PREFERENCIAS E INTERESES ---
-print("\n" + "="*60)
-print("ANALISIS DE LA SECCION 2: PREFERENCIAS E INTERESES")
-print("="*60)
 
-# Almacenar métricas para resumen final
-metricas_totales = []
-
-for pregunta, titulo in preguntas_seccion2.items():
-    if pregunta not in df_filtrado.columns:
-        print(f"ADVERTENCIA: La pregunta '{pregunta}' no se encontro en el archivo.")
-        continue
+# --- ANÁLISIS COMPLETO DE LA SECCIÓN 2 ---
+def ejecutar(df, grados_filtrar=None, filas=None):
+    """
+    Ejecuta el análisis completo de la Sección 2 sobre un DataFrame ya cargado.
+
+    Args:
+        df: DataFrame con encabezados normalizados
+        grados_filtrar: Lista de grados a analizar; si es None se pregunta al usuario
+                        (o se usan todos en modo lote o si la entrada se terminó)
+        filas: Posiciones de los estudiantes a analizar (las de indices.aplicar_filtros);
+               los conteos se hacen sobre esas posiciones, sin copiar el DataFrame
+    """
+    # Configurar estilo global de gráficos
+    configurar_estilo_global()
+
+    mostrar_metricas_generales(df, filas)
+
+    if grados_filtrar is None and modo_lote_activo():
+        # Sin pantalla no hay a quién preguntar: se analizan todos los grados
+        grados_filtrar = grados_presentes(df, filas)
+    elif grados_filtrar is None:
+        grados_filtrar = seleccionar_grados(df, filas)
+
+    filas = filas_de_grados(df, grados_filtrar, filas)
+    print(f"\nAnalizando datos para: {', '.join(grados_filtrar)}")
+    print(f"Total de estudiantes: {len(filas)}")
+
+    # --- ANÁLISIS DE LA SECCIÓN 2: PREFERENCIAS E INTERESES ---
+    print("\n" + "="*60)
+    print("ANALISIS DE LA SECCION 2: PREFERENCIAS E INTERESES")
+    print("="*60)
+
+    # Métricas de todas las preguntas a la vez
+    metricas_por_pregunta = calcular_metricas_estadisticas(df, preguntas_seccion2, filas)
+    metricas_totales = []
+
+    for pregunta, titulo in preguntas_seccion2.items():
+        if pregunta not in df.columns:
+            print(f"ADVERTENCIA: La pregunta '{pregunta}' no se encontro en el archivo.")
+            continue
+
+        print(f"\n{'='*50}")
+        print(f"{titulo}")
+        print(f"{'='*50}")
+
+        # Calcular métricas estadísticas
+        metricas = metricas_por_pregunta.get(pregunta)
+        if metricas:
+            metricas_totales.append(metricas)
+
+            # Mostrar métricas
+            print(f"METRICAS ESTADISTICAS:")
+            print(f"   - Total de respuestas: {metricas['total_respuestas']}")
+            print(f"   - Respuesta mas frecuente: {metricas['moda']} ({metricas['porcentaje_moda']:.1f}%)")
+            print(f"   - Diversidad de respuestas: {metricas['diversidad']:.3f} (0=concentrado, 1=diverso)")
+            print(f"   - Entropia: {metricas['entropia']:.3f} bits")
+
+            # Mostrar distribución
+            print(f"\nDISTRIBUCION DE RESPUESTAS:")
+            for respuesta, cantidad in metricas['conteo'].items():
+                porcentaje = (cantidad / metricas['total_respuestas']) * 100
+                print(f"   - {respuesta}: {cantidad} ({porcentaje:.1f}%)")
+
+
+    # --- RESUMEN FINAL ---
+    # Solo mostrar el resumen una vez al final
+    if metricas_totales:
+        print(f"\n{'='*60}")
+        print("RESUMEN EJECUTIVO - SECCION 2")
+        print(f"{'='*60}")
+
+        print(f"Total de preguntas analizadas: {len(metricas_totales)}")
+        print(f"Total de estudiantes: {len(filas)}")
+        print(f"Grados analizados: {', '.join(grados_filtrar)}")
+
+        # Encontrar preguntas con mayor y menor diversidad
+        diversidades = [(m['titulo'], m['diversidad']) for m in metricas_totales]
+        diversidades.sort(key=lambda x: x[1], reverse=True)
+
+        print(f"\nINSIGHTS PRINCIPALES:")
+        print(f"   - Mayor diversidad de opiniones: {diversidades[0][0]} ({diversidades[0][1]:.3f})")
+        print(f"   - Menor diversidad de opiniones: {diversidades[-1][0]} ({diversidades[-1][1]:.3f})")
+
+        # Mayor y menor diversidad dentro de cada grado
+        ranking = ranking_por_grado(df, preguntas_seccion2, filas)
+        if ranking is not None and len(ranking) >= 2:
+            print(f"\nDIVERSIDAD POR GRADO:")
+            for grado, fila in ranking.iterrows():
+                print(f"   - {grado}: mayor en {preguntas_seccion2[fila['mayor_diversidad']]} ({fila['valor_mayor']:.3f}), "
+                      f"menor en {preguntas_seccion2[fila['menor_diversidad']]} ({fila['valor_menor']:.3f})")
+
+        # Mostrar respuestas más frecuentes
+        print(f"\nRESPUESTAS MAS FRECUENTES:")
+        for metrica in metricas_totales:
+            print(f"   - {metrica['titulo']}: {metrica['moda']} ({metrica['porcentaje_moda']:.1f}%)")
+
+    # --- GENERAR TODOS LOS GRÁFICOS AL FINAL ---
+    print(f"\n{'='*60}")
+    print("GENERANDO GRAFICOS VISUALES...")
+    print(f"{'='*60}")
 
-    print(f"\n{'='*50}")
-    print(f"{titulo}")
-    print(f"{'='*50}")
-    
-    # Calcular métricas estadísticas
-    metricas = calcular_metricas_estadisticas(df_filtrado, pregunta, titulo)
-    if metricas:
-        metricas_totales.append(metricas)
-        
-        # Mostrar métricas
-        print(f"METRICAS ESTADISTICAS:")
-        print(f"   - Total de respuestas: {metricas['total_respuestas']}")
-        print(f"   - Respuesta mas frecuente: {metricas['moda']} ({metricas['porcentaje_moda']:.1f}%)")
-        print(f"   - Diversidad de respuestas: {metricas['diversidad']:.3f} (0=concentrado, 1=diverso)")
-        print(f"   - Entropia: {metricas['entropia']:.3f} bits")
-        
-        # Mostrar distribución
-        print(f"\nDISTRIBUCION DE RESPUESTAS:")
-        for respuesta, cantidad in metricas['conteo'].items():
-            porcentaje = (cantidad / metricas['total_respuestas']) * 100
-            print(f"   - {respuesta}: {cantidad} ({porcentaje:.1f}%)")
-        
+    if metricas_totales:
+        print("Generando graficos individuales de cada pregunta...")
+
+        # Generar gráficos individuales (alternando entre vertical y horizontal)
+        for i, metrica in enumerate(metricas_totales):
+            # Alternar: pares = vertical, impares = horizontal
+            es_horizontal = i % 2 == 1
+            orientacion = "horizontal" if es_horizontal else "vertical"
+            print(f"  - Grafico {orientacion}: {metrica['titulo']}")
+            graficar_barras(metrica['conteo'], metrica['titulo'], horizontal=es_horizontal)
+
+        # Generar gráficos comparativos si hay múltiples grados
+        if len(grados_filtrar) >= 2:
+            print("\nGenerando graficos comparativos entre grados...")
+            for pregunta, titulo in preguntas_seccion2.items():
+                if pregunta in df.columns:
+                    print(f"  - Comparativo: {titulo}")
+                    graficar_comparativo(df, pregunta, titulo, grados_filtrar, filas)
 
-# --- RESUMEN FINAL ---
-# Solo mostrar el resumen una vez al final
-if metricas_totales:
     print(f"\n{'='*60}")
-    print("RESUMEN EJECUTIVO - SECCION 2")
+    print("ANALISIS COMPLETADO EXITOSAMENTE")
     print(f"{'='*60}")
-    
-    print(f"Total de preguntas analizadas: {len(metricas_totales)}")
-    print(f"Total de estudiantes: {len(df_filtrado)}")
-    print(f"Grados analizados: {', '.join(grados_filtrar)}")
-    
-    # Encontrar preguntas con mayor y menor diversidad
-    diversidades = [(m['titulo'], m['diversidad']) for m in metricas_totales]
-    diversidades.sort(key=lambda x: x[1], reverse=True)
-    
-    print(f"\nINSIGHTS PRINCIPALES:")
-    print(f"   - Mayor diversidad de opiniones: {diversidades[0][0]} ({diversidades[0][1]:.3f})")
-    print(f"   - Menor diversidad de opiniones: {diversidades[-1][0]} ({diversidades[-1][1]:.3f})")
-    
-    # Mostrar respuestas más frecuentes
-    print(f"\nRESPUESTAS MAS FRECUENTES:")
-    for metrica in metricas_totales:
-        print(f"   - {metrica['titulo']}: {metrica['moda']} ({metrica['porcentaje_moda']:.1f}%)")
-
-# --- GENERAR TODOS LOS GRÁFICOS AL FINAL ---
-print(f"\n{'='*60}")
-print("GENERANDO GRAFICOS VISUALES...")
-print(f"{'='*60}")
-
-if metricas_totales:
-    print("Generando graficos individuales de cada pregunta...")
-    
-    # Generar gráficos individuales (alternando entre vertical y horizontal)
-    for i, metrica in enumerate(metricas_totales):
-        # Alternar: pares = vertical, impares = horizontal
-        es_horizontal = i % 2 == 1
-        orientacion = "horizontal" if es_horizontal else "vertical"
-        print(f"  - Grafico {orientacion}: {metrica['titulo']}")
-        graficar_barras(metrica['conteo'], metrica['titulo'], horizontal=es_horizontal)
-    
-    # Generar gráficos comparativos si hay múltiples grados
-    if len(grados_filtrar) >= 2:
-        print("\nGenerando graficos comparativos entre grados...")
-        for pregunta, titulo in preguntas_seccion2.items():
-            if pregunta in df_filtrado.columns:
-                print(f"  - Comparativo: {titulo}")
-                graficar_comparativo(df_filtrado, pregunta, titulo, grados_filtrar)
-
-print(f"\n{'='*60}")
-print("ANALISIS COMPLETADO EXITOSAMENTE")
-print(f"{'='*60}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sección 2: preferencias e intereses")
+    parser.add_argument('--archivo', default=ARCHIVO_RESPUESTAS, help="Excel de respuestas a analizar")
+    agregar_argumentos_filtros(parser)
+    args = parser.parse_args()
+
+    df = cargar_encuesta_normalizada(args.archivo)
+    filtros = filtros_desde_argumentos(args, construir_cubo(df))
+
+    # Con --grado no se muestra el menú; el resto de filtros elige las filas
+    grados = filtros.pop('Grado', None)
+    if grados is not None and not isinstance(grados, list):
+        grados = [grados]
+    filas = aplicar_filtros(df, filtros)[0] if filtros else None
+    ejecutar(df, grados_filtrar=grados, filas=filas)
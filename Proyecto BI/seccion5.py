@@ -1,27 +1,14 @@
+import argparse
 import pandas as pd
-
-# ==================== CARGA DE DATOS ====================
-df = pd.read_excel('../data/RecopilaciónDeDatos-BI(respuestas).xlsx')
-
-# ==================== LIMPIEZA DE NOMBRES ====================
-df.columns = df.columns.str.strip().str.replace('\u200b', '', regex=True).str.replace('\n', '', regex=True)
+from carga_datos import cargar_encuesta_normalizada, ARCHIVO_RESPUESTAS
+from esquema import obtener_categorias, RENOMBRAR_SECCION5
+from argumentos import agregar_argumentos_filtros, filtros_desde_argumentos
+from cubo import construir_cubo, consultar_cubo, resolver_pregunta
+from indices import aplicar_filtros
 
 # ==================== RENOMBRAR COLUMNAS ====================
-renombrar = {
-    # Filtros
-    'Género': 'Genero',
-    '¿Cuál es tu edad?': 'Edad',
-    '¿En qué grado estás actualmente?': 'Grado',
-    '¿En qué distrito vives?': 'Distrito',
-    
-    # Preguntas Sección 5
-    '¿Qué tan difícil consideras cubrir los costos de matrícula y pensiones de estudios superiores?': 'Dificultad_Costos',
-    '¿Qué tan importante sería contar con una beca para poder continuar tus estudios?': 'Importancia_Beca',
-    '¿Qué tanto influye la distancia y transporte como barrera para estudiar en una institución superior?': 'Influencia_Distancia',
-    '¿En qué medida consideras que el apoyo económico de tu familia es suficiente para tus estudios futuros?': 'Apoyo_Familiar',
-    '¿Actualmente cuentas con computadora y conexión a internet en tu hogar?': 'Recursos_Tecnologicos'
-}
-df.rename(columns=renombrar, inplace=True)
+# Encabezado normalizado -> nombre corto (definido en esquema.py)
+renombrar = RENOMBRAR_SECCION5
 
 # ==================== FILTROS OPCIONALES ====================
 FILTROS = {
@@ -31,24 +18,16 @@ FILTROS = {
 }
 
 # ==================== FUNCIONES ====================
-def aplicar_filtros(df, filtros):
-    """Aplica los filtros definidos al dataframe"""
-    df_filtrado = df.copy()
-    for col, val in filtros.items():
-        if col in df_filtrado.columns:
-            df_filtrado = df_filtrado[df_filtrado[col] == val]
-    return df_filtrado
-
-def analizar_pregunta(df, columna, categorias, titulo):
-    """Muestra conteos y porcentajes totales de una pregunta"""
+def analizar_pregunta(cubo, filtros, columna, categorias, titulo):
+    """Muestra conteos y porcentajes totales de una pregunta (leídos del cubo)"""
     print(f"\n{titulo}")
     print("-" * 60)
 
-    if columna not in df.columns:
+    if not resolver_pregunta(cubo, columna):
         print("Columna no encontrada.")
         return
 
-    conteo = df[columna].value_counts().reindex(categorias, fill_value=0)
+    conteo = consultar_cubo(cubo, columna, filtros, categorias)
     total = conteo.sum()
 
     print(f"{'Categoría':<40} {'N° de respuestas':<18} {'Porcentaje'}")
@@ -61,40 +40,63 @@ def analizar_pregunta(df, columna, categorias, titulo):
 
     print(f"\nTotal de respuestas: {total}")
 
-# ==================== APLICAR FILTROS ====================
-df_filtrado = aplicar_filtros(df, FILTROS)
-df_analisis = df_filtrado if not df_filtrado.empty else df
-
-print("\n" + "=" * 60)
-print("SECCIÓN 5: BARRERAS Y APOYO")
-print(f"Total registros: {len(df_analisis)}")
-print("=" * 60)
-
-# ==================== PREGUNTA 1 ====================
-analizar_pregunta(df_analisis, 'Dificultad_Costos',
-    ['Nada difícil', 'Poco difícil', 'Medianamente difícil', 'Difícil', 'Muy difícil'],
-    "1. Dificultad para cubrir costos")
-
-# ==================== PREGUNTA 2 ====================
-analizar_pregunta(df_analisis, 'Importancia_Beca',
-    ['Nada importante', 'Poco importante', 'Medianamente importante', 'Importante', 'Muy importante'],
-    "2. Importancia de contar con beca")
-
-# ==================== PREGUNTA 3 ====================
-analizar_pregunta(df_analisis, 'Influencia_Distancia',
-    ['Nada', 'Poco', 'Medianamente', 'Mucho', 'Demasiado'],
-    "3. Influencia de la distancia y transporte")
-
-# ==================== PREGUNTA 4 ====================
-analizar_pregunta(df_analisis, 'Apoyo_Familiar',
-    ['Nada suficiente', 'Poco suficiente', 'Medianamente suficiente', 'Suficiente', 'Muy suficiente'],
-    "4. Suficiencia del apoyo familiar")
-
-# ==================== PREGUNTA 5 ====================
-analizar_pregunta(df_analisis, 'Recursos_Tecnologicos',
-    ['Sí, cuento con ambos (computadora e internet)', 'Solo computadora', 'Solo internet', 'No cuento con ninguno'],
-    "5. Acceso a recursos tecnológicos")
-
-print("\n" + "=" * 60)
-print("ANÁLISIS COMPLETADO")
-print("=" * 60)
+# ==================== EJECUCIÓN DE LA SECCIÓN ====================
+def ejecutar(df, filtros=FILTROS, cubo=None, indices=None):
+    """Ejecuta todo el análisis de la Sección 5 sobre un DataFrame normalizado"""
+    df = df.rename(columns=renombrar)
+    if cubo is None:
+        cubo = construir_cubo(df)
+
+    # ==================== APLICAR FILTROS ====================
+    filas_filtradas, _ = aplicar_filtros(df, filtros, indices)
+    hay_filas = len(filas_filtradas) > 0
+    total_analisis = len(filas_filtradas) if hay_filas else len(df)
+    filtros_analisis = filtros if hay_filas else {}
+
+    print("\n" + "=" * 60)
+    print("SECCIÓN 5: BARRERAS Y APOYO")
+    print(f"Total registros: {total_analisis}")
+    print("=" * 60)
+
+    # ==================== PREGUNTA 1 ====================
+    analizar_pregunta(cubo, filtros_analisis, 'Dificultad_Costos',
+        obtener_categorias('Dificultad_Costos'),
+        "1. Dificultad para cubrir costos")
+
+    # ==================== PREGUNTA 2 ====================
+    analizar_pregunta(cubo, filtros_analisis, 'Importancia_Beca',
+        obtener_categorias('Importancia_Beca'),
+        "2. Importancia de contar con beca")
+
+    # ==================== PREGUNTA 3 ====================
+    analizar_pregunta(cubo, filtros_analisis, 'Influencia_Distancia',
+        obtener_categorias('Influencia_Distancia'),
+        "3. Influencia de la distancia y transporte")
+
+    # ==================== PREGUNTA 4 ====================
+    analizar_pregunta(cubo, filtros_analisis, 'Apoyo_Familiar',
+        obtener_categorias('Apoyo_Familiar'),
+        "4. Suficiencia del apoyo familiar")
+
+    # ==================== PREGUNTA 5 ====================
+    analizar_pregunta(cubo, filtros_analisis, 'Recursos_Tecnologicos',
+        obtener_categorias('Recursos_Tecnologicos'),
+        "5. Acceso a recursos tecnológicos")
+
+    print("\n" + "=" * 60)
+    print("ANÁLISIS COMPLETADO")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sección 5: barreras y apoyo")
+    parser.add_argument('--archivo', default=ARCHIVO_RESPUESTAS, help="Excel de respuestas a analizar")
+    agregar_argumentos_filtros(parser)
+    args = parser.parse_args()
+
+    # Leer el archivo Excel (desde la copia columnar si ya existe)
+    df = cargar_encuesta_normalizada(args.archivo)
+    cubo = construir_cubo(df.rename(columns=renombrar))
+    # Sin filtros en la línea de comandos se usa el diccionario FILTROS
+    filtros = filtros_desde_argumentos(args, cubo) or FILTROS
+    ejecutar(df, filtros=filtros, cubo=cubo)
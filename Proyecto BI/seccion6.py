@@ -1,41 +1,17 @@
+import argparse
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import os
-
-# Obtener la ruta absoluta del directorio del script
-script_dir = os.path.dirname(os.path.abspath(__file__))
-# Construir la ruta al archivo Excel
-excel_path = os.path.join(script_dir, '..', 'data', 'RecopilaciónDeDatos-BI_T03.xlsx')
-
-# Leer el archivo Excel
-df = pd.read_excel(excel_path)
+import matplotlib.style
+from carga_datos import cargar_encuesta_normalizada, ARCHIVO_T03
+from esquema import obtener_categorias, RENOMBRAR_SECCION6
+from argumentos import agregar_argumentos_filtros, filtros_desde_argumentos
+from cubo import construir_cubo, consultar_cubo, resolver_pregunta
+from indices import aplicar_filtros
+from cache_graficos import graficar_con_cache
 
 # ==================== RENOMBRAR COLUMNAS ====================
-# Primero limpiamos los espacios en blanco de todas las columnas
-df.columns = df.columns.str.strip()
-
-renombrar = {
-    # Filtros
-    'Género': 'Genero',
-    '¿Cuál es tu edad?': 'Edad',
-    '¿En qué grado estás actualmente?': 'Grado',
-    '¿En qué distrito vives?': 'Distrito',
-
-    # Preguntas Sección 6: Proyecto de Vida y Expectativas Futuras
-    'Al terminar el colegio, ¿cuál es tu principal plan a seguir?': 'Plan_Despues_Colegio',
-    '¿Qué es lo más importante que buscas en tu futuro trabajo o profesión?': 'Importante_Trabajo_Futuro',
-    '¿Qué papel crees que juega la educación superior (universitaria o técnica para alcanzar el futuro que deseas?': 'Papel_Educacion_Superior',
-    'Pensando en 10 años, ¿cómo te gustaría que fuera tu estilo de vida?': 'Estilo_Vida_10_Anos',
-    '¿Cuál consideras que es el mayor desafío o preocupación que enfrentas al pensar en tu futuro después del colegio?': 'Mayor_Desafio_Futuro'
-}
-
-df = df.rename(columns=renombrar)
-
-print("Columnas renombradas exitosamente:")
-for old, new in renombrar.items():
-    if old in df.columns or new in df.columns:
-        print(f"  ✓ {new}")
+# Encabezado normalizado -> nombre corto (definido en esquema.py)
+renombrar = RENOMBRAR_SECCION6
 
 # ==================== CONFIGURACIÓN DE FILTROS ====================
 FILTROS = {
@@ -47,17 +23,12 @@ FILTROS = {
 
 # ==================================================================
 
-def aplicar_filtros(dataframe, filtros):
-    """Aplica los filtros definidos al dataframe"""
-    df_filtrado = dataframe.copy()
-    filtros_aplicados = []
-
-    for columna, valor in filtros.items():
-        if columna in df_filtrado.columns:
-            df_filtrado = df_filtrado[df_filtrado[columna] == valor]
-            filtros_aplicados.append(f"{columna}={valor}")
-
-    return df_filtrado, filtros_aplicados
+def conteo_por_grado(cubo, columna, filtros, opciones):
+    """Conteo de cada opción para 4° y 5° (None si los datos no tienen grado)"""
+    if 'Grado' not in cubo['dimensiones']:
+        return None
+    por_grado = consultar_cubo(cubo, columna, filtros, opciones, por='Grado')
+    return por_grado.reindex(columns=['4°', '5°'], fill_value=0)
 
 def obtener_titulo_filtros(filtros_aplicados):
     """Genera un subtítulo con los filtros aplicados"""
@@ -65,33 +36,15 @@ def obtener_titulo_filtros(filtros_aplicados):
         return "Todos los estudiantes"
     return " | ".join(filtros_aplicados)
 
-# Aplicar filtros
-df_filtrado, filtros_aplicados = aplicar_filtros(df, FILTROS)
-subtitulo_filtros = obtener_titulo_filtros(filtros_aplicados)
-
-print("\n" + "=" * 60)
-print(f"FILTROS APLICADOS: {subtitulo_filtros}")
-print(f"Total de registros filtrados: {len(df_filtrado)}")
-print(f"Total de registros originales: {len(df)}")
-print("=" * 60)
-
 # ==================== PREGUNTA 6.1: Plan después del colegio ====================
-print("\n6.1. PLAN DESPUÉS DEL COLEGIO")
-print("-" * 60)
-
 columna_p6_1 = 'Plan_Despues_Colegio'
-opciones_p6_1 = [
-    'Ingresar a la universidad para estudiar una carrera profesional.',
-    'Estudiar en un instituto una carrera técnica corta.',
-    'Empezar a trabajar lo antes posible para tener independencia económica.',
-    'Tomarme un tiempo para decidir qué quiero hacer o viajar.'
-]
+opciones_p6_1 = obtener_categorias(columna_p6_1)
 
-if columna_p6_1 in df_filtrado.columns:
-    conteo_p6_1 = df_filtrado[columna_p6_1].value_counts().reindex(opciones_p6_1, fill_value=0)
+def graficar_p6_1(conteo_p6_1, por_grado, subtitulo_filtros):
+    """Dibuja el gráfico de la pregunta 6.1: Plan después del colegio"""
+    import matplotlib.pyplot as plt
 
     # Crear gráfico de barras horizontales apiladas
-    plt.style.use('dark_background')
     fig, ax = plt.subplots(figsize=(16, 8))
     fig.patch.set_facecolor('#1a1a2e')
     ax.set_facecolor('#1a1a2e')
@@ -111,14 +64,9 @@ if columna_p6_1 in df_filtrado.columns:
     bar_height = 0.5
 
     # Calcular conteos por grado
-    if 'Grado' in df_filtrado.columns:
-        conteo_4to = []
-        conteo_5to = []
-        for opcion in opciones_p6_1:
-            df_4to = df_filtrado[df_filtrado['Grado'] == '4°']
-            df_5to = df_filtrado[df_filtrado['Grado'] == '5°']
-            conteo_4to.append(len(df_4to[df_4to[columna_p6_1] == opcion]))
-            conteo_5to.append(len(df_5to[df_5to[columna_p6_1] == opcion]))
+    if por_grado is not None:
+        conteo_4to = por_grado['4°'].tolist()
+        conteo_5to = por_grado['5°'].tolist()
 
         # Crear barras apiladas horizontales
         left_pos = np.zeros(len(etiquetas_cortas))
@@ -179,27 +127,29 @@ if columna_p6_1 in df_filtrado.columns:
 
     # Ajustar márgenes para que se vean bien las etiquetas
     plt.subplots_adjust(left=0.3, right=0.95, top=0.93, bottom=0.07)
-    plt.show()
 
-    print(conteo_p6_1)
-    print(f"Total: {conteo_p6_1.sum()}")
-else:
-    print("Columna no encontrada")
+def analizar_p6_1(cubo, filtros, subtitulo_filtros):
+    """Pregunta 6.1: Plan después del colegio"""
+    print("\n6.1. PLAN DESPUÉS DEL COLEGIO")
+    print("-" * 60)
 
-# ==================== PREGUNTA 6.2: Lo más importante en trabajo futuro ====================
-print("\n6.2. LO MÁS IMPORTANTE EN TRABAJO FUTURO")
-print("-" * 60)
+    if resolver_pregunta(cubo, columna_p6_1):
+        conteo_p6_1 = consultar_cubo(cubo, columna_p6_1, filtros, opciones_p6_1)
+        por_grado = conteo_por_grado(cubo, columna_p6_1, filtros, opciones_p6_1)
+        graficar_con_cache(graficar_p6_1, conteo_p6_1, por_grado, subtitulo_filtros)
 
+        print(conteo_p6_1)
+        print(f"Total: {conteo_p6_1.sum()}")
+    else:
+        print("Columna no encontrada")
+
+# ==================== PREGUNTA 6.2: Lo más importante en trabajo futuro ====================
 columna_p6_2 = 'Importante_Trabajo_Futuro'
-opciones_p6_2 = [
-    'Estabilidad económica y un buen sueldo.',
-    'Prestigio y reconocimiento en mi campo laboral.',
-    'Poder ayudar a los demás y tener un impacto positivo en la sociedad.',
-    'Un buen balance entre mi vida personal y el trabajo, con tiempo para mis pasatiempos.'
-]
+opciones_p6_2 = obtener_categorias(columna_p6_2)
 
-if columna_p6_2 in df_filtrado.columns:
-    conteo_p6_2 = df_filtrado[columna_p6_2].value_counts().reindex(opciones_p6_2, fill_value=0)
+def graficar_p6_2(conteo_p6_2, por_grado, subtitulo_filtros):
+    """Dibuja el gráfico de la pregunta 6.2: Lo más importante en trabajo futuro"""
+    import matplotlib.pyplot as plt
 
     # Crear gráfico de barras verticales con gradiente
     fig, ax = plt.subplots(figsize=(14, 9))
@@ -215,7 +165,7 @@ if columna_p6_2 in df_filtrado.columns:
     colores_gradiente = ['#e91e8c', '#22c55e', '#f97316', '#eab308']
 
     # Calcular conteos por grado si existe la columna
-    if 'Grado' in df_filtrado.columns:
+    if por_grado is not None:
         # Leyenda
         leyenda_labels = ['4to de Secundaria', '5to de Secundaria']
         leyenda_colors = ['#60a5fa', '#22d3ee']
@@ -263,27 +213,29 @@ if columna_p6_2 in df_filtrado.columns:
     ax.set_yticks([])
 
     plt.tight_layout()
-    plt.show()
 
-    print(conteo_p6_2)
-    print(f"Total: {conteo_p6_2.sum()}")
-else:
-    print("Columna no encontrada")
+def analizar_p6_2(cubo, filtros, subtitulo_filtros):
+    """Pregunta 6.2: Lo más importante en trabajo futuro"""
+    print("\n6.2. LO MÁS IMPORTANTE EN TRABAJO FUTURO")
+    print("-" * 60)
 
-# ==================== PREGUNTA 6.3: Papel de la educación superior ====================
-print("\n6.3. PAPEL DE LA EDUCACIÓN SUPERIOR")
-print("-" * 60)
+    if resolver_pregunta(cubo, columna_p6_2):
+        conteo_p6_2 = consultar_cubo(cubo, columna_p6_2, filtros, opciones_p6_2)
+        por_grado = conteo_por_grado(cubo, columna_p6_2, filtros, opciones_p6_2)
+        graficar_con_cache(graficar_p6_2, conteo_p6_2, por_grado, subtitulo_filtros)
 
+        print(conteo_p6_2)
+        print(f"Total: {conteo_p6_2.sum()}")
+    else:
+        print("Columna no encontrada")
+
+# ==================== PREGUNTA 6.3: Papel de la educación superior ====================
 columna_p6_3 = 'Papel_Educacion_Superior'
-opciones_p6_3 = [
-    'Es fundamental y la única vía para asegurar el éxito profesional y personal.',
-    'Es muy importante, pero creo que la experiencia y las habilidades prácticas son igual de valiosas.',
-    'Es solo un requisito formal, pero no garantiza el éxito.',
-    'No es tan necesaria; hay otras formas de alcanzar mis metas sin estudios superiores.'
-]
+opciones_p6_3 = obtener_categorias(columna_p6_3)
 
-if columna_p6_3 in df_filtrado.columns:
-    conteo_p6_3 = df_filtrado[columna_p6_3].value_counts().reindex(opciones_p6_3, fill_value=0)
+def graficar_p6_3(conteo_p6_3, por_grado, subtitulo_filtros):
+    """Dibuja el gráfico de la pregunta 6.3: Papel de la educación superior"""
+    import matplotlib.pyplot as plt
 
     # Crear gráfico tipo donut con categorías
     fig, ax = plt.subplots(figsize=(12, 10))
@@ -320,7 +272,7 @@ if columna_p6_3 in df_filtrado.columns:
     numeros_visuales = ['01', '02', '03', '04']
 
     # Leyenda para grados
-    if 'Grado' in df_filtrado.columns:
+    if por_grado is not None:
         legend_labels = ['4to de Secundaria', '5to de Secundaria']
         legend_colors = ['#60a5fa', '#22d3ee']
 
@@ -374,27 +326,31 @@ if columna_p6_3 in df_filtrado.columns:
     ax.set_ylim(-1.3, 1.3)
 
     plt.tight_layout()
-    plt.show()
 
-    print(conteo_p6_3)
-    print(f"Total: {conteo_p6_3.sum()}")
-else:
-    print("Columna no encontrada")
+def analizar_p6_3(cubo, filtros, subtitulo_filtros):
+    """Pregunta 6.3: Papel de la educación superior"""
+    print("\n6.3. PAPEL DE LA EDUCACIÓN SUPERIOR")
+    print("-" * 60)
 
-# ==================== PREGUNTA 6.4: Estilo de vida en 10 años ====================
-print("\n6.4. ESTILO DE VIDA EN 10 AÑOS")
-print("-" * 60)
+    if resolver_pregunta(cubo, columna_p6_3):
+        conteo_p6_3 = consultar_cubo(cubo, columna_p6_3, filtros, opciones_p6_3)
+        por_grado = conteo_por_grado(cubo, columna_p6_3, filtros, opciones_p6_3)
+        # Un gráfico de pastel sin respuestas no se puede dibujar
+        if conteo_p6_3.sum() > 0:
+            graficar_con_cache(graficar_p6_3, conteo_p6_3, por_grado, subtitulo_filtros)
 
+        print(conteo_p6_3)
+        print(f"Total: {conteo_p6_3.sum()}")
+    else:
+        print("Columna no encontrada")
+
+# ==================== PREGUNTA 6.4: Estilo de vida en 10 años ====================
 columna_p6_4 = 'Estilo_Vida_10_Anos'
-opciones_p6_4 = [
-    'Con una vida estable, una casa propia y seguridad financiera.',
-    'Con libertad para viajar por el mundo y vivir diferentes experiencias.',
-    'Liderando mi propio negocio o siendo un profesional independiente.',
-    'Dedicado/a a mi desarrollo profesional, ocupando un alto cargo en una empresa.'
-]
+opciones_p6_4 = obtener_categorias(columna_p6_4)
 
-if columna_p6_4 in df_filtrado.columns:
-    conteo_p6_4 = df_filtrado[columna_p6_4].value_counts().reindex(opciones_p6_4, fill_value=0)
+def graficar_p6_4(conteo_p6_4, por_grado, subtitulo_filtros):
+    """Dibuja el gráfico de la pregunta 6.4: Estilo de vida en 10 años"""
+    import matplotlib.pyplot as plt
 
     # Crear figura con gráficos circulares de porcentaje
     fig = plt.figure(figsize=(16, 6))
@@ -405,7 +361,7 @@ if columna_p6_4 in df_filtrado.columns:
             fontsize=20, fontweight='bold', color='white')
 
     # Leyenda de grados
-    if 'Grado' in df_filtrado.columns:
+    if por_grado is not None:
         legend_labels = ['4to de Secundaria', '5to de Secundaria']
         legend_colors = ['#60a5fa', '#22d3ee']
 
@@ -461,27 +417,29 @@ if columna_p6_4 in df_filtrado.columns:
                                    facecolor=color_circle,
                                    edgecolor='white', linewidth=1.5, alpha=0.3))
 
-    plt.show()
+def analizar_p6_4(cubo, filtros, subtitulo_filtros):
+    """Pregunta 6.4: Estilo de vida en 10 años"""
+    print("\n6.4. ESTILO DE VIDA EN 10 AÑOS")
+    print("-" * 60)
 
-    print(conteo_p6_4)
-    print(f"Total: {conteo_p6_4.sum()}")
-else:
-    print("Columna no encontrada")
+    if resolver_pregunta(cubo, columna_p6_4):
+        conteo_p6_4 = consultar_cubo(cubo, columna_p6_4, filtros, opciones_p6_4)
+        por_grado = conteo_por_grado(cubo, columna_p6_4, filtros, opciones_p6_4)
+        graficar_con_cache(graficar_p6_4, conteo_p6_4, por_grado, subtitulo_filtros)
 
-# ==================== PREGUNTA 6.5: Mayor desafío futuro ====================
-print("\n6.5. MAYOR DESAFÍO FUTURO")
-print("-" * 60)
+        print(conteo_p6_4)
+        print(f"Total: {conteo_p6_4.sum()}")
+    else:
+        print("Columna no encontrada")
 
+# ==================== PREGUNTA 6.5: Mayor desafío futuro ====================
 columna_p6_5 = 'Mayor_Desafio_Futuro'
-opciones_p6_5 = [
-    'La dificultad económica para poder costear mis estudios o proyectos.',
-    'La indecisión sobre qué carrera o camino profesional elegir.',
-    'La alta competencia en el campo laboral y el miedo a no encontrar trabajo.',
-    'La presión de mi familia o de la sociedad sobre lo que "debería" hacer.'
-]
-
-if columna_p6_5 in df_filtrado.columns:
-    conteo_p6_5 = df_filtrado[columna_p6_5].value_counts().reindex(opciones_p6_5, fill_value=0)
+opciones_p6_5 = obtener_categorias(columna_p6_5)
+
+def graficar_p6_5(conteo_p6_5, por_grado, subtitulo_filtros):
+    """Dibuja el gráfico de la pregunta 6.5: Mayor desafío futuro"""
+    import matplotlib.pyplot as plt
+
     etiquetas_cortas = ['Dificultad\nEconómica', 'Indecisión sobre\nla carrera',
                        'Alta competencia\nlaboral', 'Presión familiar']
 
@@ -494,14 +452,9 @@ if columna_p6_5 in df_filtrado.columns:
     width = 0.35  # Ancho de las barras
 
     # Calcular conteos por grado
-    if 'Grado' in df_filtrado.columns:
-        conteo_4to = []
-        conteo_5to = []
-        for opcion in opciones_p6_5:
-            df_4to = df_filtrado[df_filtrado['Grado'] == '4°']
-            df_5to = df_filtrado[df_filtrado['Grado'] == '5°']
-            conteo_4to.append(len(df_4to[df_4to[columna_p6_5] == opcion]))
-            conteo_5to.append(len(df_5to[df_5to[columna_p6_5] == opcion]))
+    if por_grado is not None:
+        conteo_4to = por_grado['4°'].tolist()
+        conteo_5to = por_grado['5°'].tolist()
 
         # Colores para 4to y 5to
         color_4to = '#60a5fa'  # Azul
@@ -559,8 +512,8 @@ if columna_p6_5 in df_filtrado.columns:
     # Configuración de ejes
     ax.set_xticks(x)
     ax.set_xticklabels(etiquetas_cortas, fontsize=11, fontweight='bold', color='white')
-    ax.set_ylim(-8, max(max(conteo_4to if 'Grado' in df_filtrado.columns else conteo_p6_5.values),
-                        max(conteo_5to if 'Grado' in df_filtrado.columns else conteo_p6_5.values)) * 1.2)
+    ax.set_ylim(-8, max(max(conteo_4to if por_grado is not None else conteo_p6_5.values),
+                        max(conteo_5to if por_grado is not None else conteo_p6_5.values)) * 1.2)
 
     # Título
     ax.set_title('Mayor desafío en el Futuro', fontsize=18, fontweight='bold',
@@ -578,13 +531,71 @@ if columna_p6_5 in df_filtrado.columns:
     ax.set_yticks([])
 
     plt.tight_layout()
-    plt.show()
 
-    print(conteo_p6_5)
-    print(f"Total: {conteo_p6_5.sum()}")
-else:
-    print("Columna no encontrada")
+def analizar_p6_5(cubo, filtros, subtitulo_filtros):
+    """Pregunta 6.5: Mayor desafío futuro"""
+    print("\n6.5. MAYOR DESAFÍO FUTURO")
+    print("-" * 60)
+
+    if resolver_pregunta(cubo, columna_p6_5):
+        conteo_p6_5 = consultar_cubo(cubo, columna_p6_5, filtros, opciones_p6_5)
+        por_grado = conteo_por_grado(cubo, columna_p6_5, filtros, opciones_p6_5)
+        graficar_con_cache(graficar_p6_5, conteo_p6_5, por_grado, subtitulo_filtros)
 
-print("\n" + "=" * 60)
-print("ANÁLISIS SECCIÓN 6 COMPLETADO")
-print("=" * 60)
+        print(conteo_p6_5)
+        print(f"Total: {conteo_p6_5.sum()}")
+    else:
+        print("Columna no encontrada")
+
+# ==================== EJECUCIÓN DE LA SECCIÓN ====================
+def ejecutar(df, filtros=FILTROS, cubo=None, indices=None):
+    """Ejecuta todo el análisis de la Sección 6 sobre un DataFrame normalizado"""
+    columnas_originales = set(df.columns)
+    df = df.rename(columns=renombrar)
+
+    # Solo los encabezados que estaban en el archivo
+    print("Columnas renombradas exitosamente:")
+    for old, new in renombrar.items():
+        if old in columnas_originales:
+            print(f"  ✓ {new}")
+
+    # Los conteos de cada pregunta se leen del cubo (una sola pasada sobre los datos)
+    if cubo is None:
+        cubo = construir_cubo(df)
+
+    # Tema oscuro para todos los gráficos de la sección (antes lo fijaba el de la pregunta 6.1)
+    matplotlib.style.use('dark_background')
+
+    # Aplicar filtros
+    filas_filtradas, filtros_aplicados = aplicar_filtros(df, filtros, indices)
+    subtitulo_filtros = obtener_titulo_filtros(filtros_aplicados)
+
+    print("\n" + "=" * 60)
+    print(f"FILTROS APLICADOS: {subtitulo_filtros}")
+    print(f"Total de registros filtrados: {len(filas_filtradas)}")
+    print(f"Total de registros originales: {len(df)}")
+    print("=" * 60)
+
+    analizar_p6_1(cubo, filtros, subtitulo_filtros)
+    analizar_p6_2(cubo, filtros, subtitulo_filtros)
+    analizar_p6_3(cubo, filtros, subtitulo_filtros)
+    analizar_p6_4(cubo, filtros, subtitulo_filtros)
+    analizar_p6_5(cubo, filtros, subtitulo_filtros)
+
+    print("\n" + "=" * 60)
+    print("ANÁLISIS SECCIÓN 6 COMPLETADO")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sección 6: proyecto de vida y expectativas futuras")
+    parser.add_argument('--archivo', default=ARCHIVO_T03, help="Excel de respuestas a analizar")
+    agregar_argumentos_filtros(parser)
+    args = parser.parse_args()
+
+    # Leer el archivo Excel (desde la copia columnar si ya existe)
+    df = cargar_encuesta_normalizada(args.archivo)
+    cubo = construir_cubo(df.rename(columns=renombrar))
+    # Sin filtros en la línea de comandos se usa el diccionario FILTROS
+    filtros = filtros_desde_argumentos(args, cubo) or FILTROS
+    ejecutar(df, filtros=filtros, cubo=cubo)
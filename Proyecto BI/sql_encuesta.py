@@ -0,0 +1,230 @@
+"""
+Consultas SQL sobre la encuesta
+Carga la copia columnar de un archivo de la encuesta en un motor SQL embebido
+(DuckDB si está instalado; si no, SQLite de la biblioteca estándar, en
+memoria) y define la vista `encuesta` con los nombres canónicos de las
+columnas (los nombres cortos de las secciones 4, 5 y 6 y los nombres
+canónicos, ambos de esquema.py). Así una pregunta nueva es una consulta, no un script:
+
+    python sql_encuesta.py "SELECT Grado, Dificultad_Costos, COUNT(*) AS n
+                            FROM encuesta GROUP BY 1, 2 ORDER BY 1, 2"
+
+La tabla `respuestas` conserva los encabezados normalizados del formulario.
+Los resultados son DataFrames y graficar_resultado() los dibuja con el
+estilo de config_graficos.py
+"""
+
+import argparse
+import sqlite3
+
+import pandas as pd
+
+from carga_datos import cargar_encuesta, normalizar_columnas, ARCHIVO_RESPUESTAS
+from cubo import DIMENSIONES
+from esquema import ESQUEMA, RENOMBRAR_SECCIONES
+from perfilado import etapa
+
+# Importar duckdb solo si está disponible (si no, se usa SQLite)
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+TABLA = 'respuestas'
+VISTA = 'encuesta'
+
+# Etiquetas más largas que esto se dibujan con barras horizontales
+LARGO_ETIQUETA_VERTICAL = 20
+
+
+# ============================================================================
+# NOMBRES CANÓNICOS
+# ============================================================================
+
+def nombres_canonicos(columnas):
+    """
+    Nombre de cada columna en la vista: el de las secciones, el de esquema.py
+    o el de la dimensión del cubo; si no tiene ninguno, su encabezado.
+    Si dos encabezados llevan al mismo nombre solo el primero lo usa.
+    """
+    canonicos = {}
+    for nombre, (encabezado, _) in ESQUEMA.items():
+        canonicos.setdefault(encabezado, nombre)
+    for nombre, candidatas in DIMENSIONES.items():
+        for candidata in candidatas:
+            canonicos.setdefault(candidata, nombre)
+    canonicos.update(RENOMBRAR_SECCIONES)
+
+    nombres = {}
+    usados = set()
+    for columna in columnas:
+        nombre = canonicos.get(columna, columna)
+        if nombre in usados:
+            nombre = columna
+        usados.add(nombre)
+        nombres[columna] = nombre
+    return nombres
+
+
+def _identificador(nombre):
+    """Nombre entre comillas dobles (los encabezados tienen espacios y signos)"""
+    return '"' + str(nombre).replace('"', '""') + '"'
+
+
+# ============================================================================
+# CONEXIÓN
+# ============================================================================
+
+def _para_sqlite(df):
+    """SQLite no tiene categóricas ni fechas: se guardan como texto"""
+    df = df.copy(deep=False)
+    for columna in df.columns:
+        if isinstance(df[columna].dtype, pd.CategoricalDtype):
+            df[columna] = df[columna].astype(object)
+        elif pd.api.types.is_datetime64_any_dtype(df[columna]):
+            df[columna] = df[columna].dt.strftime('%Y-%m-%d %H:%M:%S')
+    return df
+
+
+def conectar(ruta=ARCHIVO_RESPUESTAS, df=None, motor=None):
+    """
+    Abre una base en memoria con la encuesta.
+
+    Args:
+        ruta: Archivo de la encuesta (se lee su copia columnar, sin volver a leer el Excel)
+        df: DataFrame ya cargado (en lugar de `ruta`)
+        motor: 'duckdb' o 'sqlite'; por defecto DuckDB si está instalado
+
+    Returns:
+        Diccionario con 'motor', 'conexion' y 'columnas' (encabezado -> nombre en la vista)
+    """
+    motor = motor or ('duckdb' if DUCKDB_AVAILABLE else 'sqlite')
+    if motor == 'duckdb' and not DUCKDB_AVAILABLE:
+        print("ADVERTENCIA: duckdb no esta disponible. Se usara SQLite.")
+        motor = 'sqlite'
+
+    if df is None:
+        with etapa('carga', archivo=ruta):
+            df = cargar_encuesta(ruta)
+    df = normalizar_columnas(df)
+    columnas = nombres_canonicos(df.columns)
+
+    with etapa('carga_sql', motor=motor):
+        if motor == 'duckdb':
+            # DuckDB lee el DataFrame por Arrow, sin copiarlo a otra tabla
+            conexion = duckdb.connect()
+            conexion.register(f"{TABLA}_df", df)
+            conexion.execute(f"CREATE VIEW {TABLA} AS SELECT * FROM {TABLA}_df")
+        else:
+            conexion = sqlite3.connect(':memory:')
+            _para_sqlite(df).to_sql(TABLA, conexion, index=False)
+
+        seleccion = ', '.join(f"{_identificador(c)} AS {_identificador(n)}" for c, n in columnas.items())
+        conexion.execute(f"CREATE VIEW {VISTA} AS SELECT {seleccion} FROM {TABLA}")
+    return {'motor': motor, 'conexion': conexion, 'columnas': columnas}
+
+
+def consultar(base, sql, parametros=()):
+    """Ejecuta una consulta (con parámetros '?') y devuelve un DataFrame"""
+    with etapa('consulta_sql'):
+        if base['motor'] == 'duckdb':
+            return base['conexion'].execute(sql, list(parametros)).df()
+        return pd.read_sql_query(sql, base['conexion'], params=list(parametros))
+
+
+# ============================================================================
+# CONSULTAS FRECUENTES
+# ============================================================================
+
+def _condiciones(filtros):
+    """Cláusula WHERE y parámetros de un diccionario columna -> valor (o lista)"""
+    condiciones, parametros = [], []
+    for columna, valor in (filtros or {}).items():
+        valores = list(valor) if isinstance(valor, (list, tuple, set)) else [valor]
+        condiciones.append(f"{_identificador(columna)} IN ({', '.join('?' * len(valores))})")
+        parametros.extend(valores)
+    donde = f" WHERE {' AND '.join(condiciones)}" if condiciones else ''
+    return donde, parametros
+
+
+def conteo_sql(base, columna, filtros=None):
+    """Respuestas de una columna de la vista (ej. 'Dificultad_Costos'), de mayor a menor"""
+    donde, parametros = _condiciones(filtros)
+    col = _identificador(columna)
+    donde = f"{donde} AND {col} IS NOT NULL" if donde else f" WHERE {col} IS NOT NULL"
+    resultado = consultar(base, f"SELECT {col} AS valor, COUNT(*) AS n FROM {VISTA}{donde} "
+                                f"GROUP BY 1 ORDER BY 2 DESC", parametros)
+    return pd.Series(resultado['n'].to_numpy(), index=pd.Index(resultado['valor'], name=columna), name='count')
+
+
+def tabla_cruzada_sql(base, filas, columnas, filtros=None):
+    """Tabla de contingencia filas x columnas (como pd.crosstab) calculada con GROUP BY"""
+    donde, parametros = _condiciones(filtros)
+    f, c = _identificador(filas), _identificador(columnas)
+    validas = f"{f} IS NOT NULL AND {c} IS NOT NULL"
+    donde = f"{donde} AND {validas}" if donde else f" WHERE {validas}"
+    resultado = consultar(base, f"SELECT {f} AS fila, {c} AS columna, COUNT(*) AS n FROM {VISTA}{donde} "
+                                f"GROUP BY 1, 2", parametros)
+    tabla = resultado.pivot(index='fila', columns='columna', values='n').fillna(0).astype(int)
+    tabla.index.name, tabla.columns.name = filas, columnas
+    return tabla.sort_index().sort_index(axis=1)
+
+
+# ============================================================================
+# GRÁFICOS
+# ============================================================================
+
+def graficar_resultado(resultado, titulo, nombre=None, horizontal=None):
+    """
+    Gráfico de barras de un resultado (Series o DataFrame) con el estilo del
+    proyecto; en modo lote se guarda como PNG. Sin `horizontal`, las barras
+    son horizontales cuando las etiquetas son largas (las respuestas completas)
+    """
+    import matplotlib.pyplot as plt
+    from config_graficos import (aplicar_estilo_ejes, aplicar_grid, aplicar_titulo, mostrar_o_guardar,
+                                 ALPHA_BARRAS, COLORES_PROFESIONALES, TAMANO_BARRAS,
+                                 TAMANO_BARRAS_HORIZONTALES)
+
+    if isinstance(resultado, pd.DataFrame) and resultado.shape[1] >= 2 and not pd.api.types.is_numeric_dtype(
+            resultado.iloc[:, 0]):
+        # Resultado de consultar(): la primera columna son las etiquetas
+        resultado = resultado.set_index(resultado.columns[0])
+    if isinstance(resultado, pd.DataFrame) and resultado.shape[1] == 1:
+        resultado = resultado.iloc[:, 0]
+
+    if horizontal is None:
+        horizontal = max((len(str(etiqueta)) for etiqueta in resultado.index), default=0) > LARGO_ETIQUETA_VERTICAL
+
+    # El estilo del proyecto (texto blanco) es para fondo oscuro, como en las secciones
+    with plt.style.context('dark_background'):
+        fig, ax = plt.subplots(figsize=TAMANO_BARRAS_HORIZONTALES if horizontal else TAMANO_BARRAS)
+        varias_series = isinstance(resultado, pd.DataFrame)
+        resultado.plot(kind='barh' if horizontal else 'bar', ax=ax, rot=0, alpha=ALPHA_BARRAS, edgecolor='black',
+                       color=COLORES_PROFESIONALES if varias_series else COLORES_PROFESIONALES[0])
+        aplicar_estilo_ejes(ax)
+        aplicar_grid(ax, eje='x' if horizontal else 'y')
+        aplicar_titulo(ax, titulo)
+        plt.tight_layout()
+        mostrar_o_guardar(nombre, fig=fig)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consulta SQL sobre la encuesta (vista 'encuesta', tabla 'respuestas')")
+    parser.add_argument('sql', nargs='?', help="Consulta a ejecutar")
+    parser.add_argument('--archivo', default=ARCHIVO_RESPUESTAS, help="Archivo de la encuesta")
+    parser.add_argument('--motor', choices=['duckdb', 'sqlite'], help="Motor SQL (por defecto DuckDB si está instalado)")
+    parser.add_argument('--columnas', action='store_true', help="Mostrar las columnas de la vista y salir")
+    parser.add_argument('--grafico', metavar='TITULO', help="Dibujar el resultado como gráfico de barras")
+    args = parser.parse_args()
+
+    base = conectar(args.archivo, motor=args.motor)
+    if args.columnas or not args.sql:
+        print(f"Motor: {base['motor']}")
+        for encabezado, nombre in base['columnas'].items():
+            print(f"  {nombre}" if nombre == encabezado else f"  {nombre:<28} <- {encabezado}")
+    else:
+        resultado = consultar(base, args.sql)
+        print(resultado.to_string(index=False))
+        if args.grafico:
+            graficar_resultado(resultado, args.grafico)
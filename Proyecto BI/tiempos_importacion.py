@@ -0,0 +1,132 @@
+"""
+Presupuesto de tiempo de importación
+Mide cuánto tarda en importarse cada módulo en un intérprete nuevo
+(python -X importtime) y comprueba que no cargue matplotlib.pyplot, seaborn
+ni scipy: esas librerías solo se importan al dibujar un gráfico o calcular
+un valor p. También mide los scripts de otras carpetas que se pueden
+importar sin ejecutarse: los de la Sección 3 y 7, reporte.py y utils.py
+(1P.py a 6P.py se ejecutan al importarse; de ellos se mide utils.py, que
+comparten). Termina con código 1 si algún módulo se pasa del presupuesto
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+DIRECTORIO_MODULOS = os.path.dirname(os.path.abspath(__file__))
+RAIZ_REPOSITORIO = os.path.dirname(DIRECTORIO_MODULOS)
+
+# Segundos permitidos por módulo (lo que más pesa es pandas, ~0.5 s)
+PRESUPUESTO_IMPORTACION = {
+    # Ejecuciones de solo texto o con conteos ya calculados
+    'carga_datos': 0.8,
+    'cubo': 0.8,
+    'metricas': 0.8,
+    'asociaciones': 0.8,
+    'seccion5': 0.8,
+    'pipeline': 0.8,
+    'barrido': 0.8,
+    # Secciones con gráficos: en modo lote con la caché no dibujan nada
+    'cache_graficos': 1.0,
+    'seccion2': 1.0,
+    'seccion4': 1.0,
+    'seccion6': 1.0,
+    # Scripts de otras carpetas (ver CARPETAS_MODULOS)
+    'reporte': 1.0,
+    'utils': 0.8,
+    'apoyo_numpy': 0.8,
+    'influencia_economica_numpy': 0.8,
+    'ingreso_principal_numpy': 0.8,
+    'nivel_educativo_padres': 0.8,
+    'nivel_socioeconomico': 0.8,
+    'personas_del_hoga_numpy': 0.8,
+    'moda_grados': 0.8,
+    'test_moda': 0.8,
+    'test_vocacional': 0.8,
+}
+
+# Carpeta (relativa a la raíz del repositorio) de los módulos que no están
+# en "Proyecto BI"; se importan desde su carpeta, como al ejecutarlos
+CARPETAS_MODULOS = {
+    'reporte': os.path.join('Python Intermediate', 'Seccion2'),
+    'utils': os.path.join('Python Intermediate', 'Seccion2'),
+    'apoyo_numpy': os.path.join('Seccion 3 y 7', 'Seccion 3'),
+    'influencia_economica_numpy': os.path.join('Seccion 3 y 7', 'Seccion 3'),
+    'ingreso_principal_numpy': os.path.join('Seccion 3 y 7', 'Seccion 3'),
+    'nivel_educativo_padres': os.path.join('Seccion 3 y 7', 'Seccion 3'),
+    'nivel_socioeconomico': os.path.join('Seccion 3 y 7', 'Seccion 3'),
+    'personas_del_hoga_numpy': os.path.join('Seccion 3 y 7', 'Seccion 3'),
+    'moda_grados': os.path.join('Seccion 3 y 7', 'Seccion 7'),
+    'test_moda': os.path.join('Seccion 3 y 7', 'Seccion 7'),
+    'test_vocacional': os.path.join('Seccion 3 y 7', 'Seccion 7'),
+}
+
+# Librerías que ningún módulo debe cargar al importarse
+MODULOS_PESADOS = ['matplotlib.pyplot', 'seaborn', 'scipy']
+
+
+def medir_importacion(modulo):
+    """
+    Importa `modulo` en un proceso nuevo.
+
+    Returns:
+        (segundos acumulados según -X importtime, librerías pesadas cargadas)
+    """
+    codigo = f"import sys, json, {modulo}; print(json.dumps([m for m in {MODULOS_PESADOS!r} if m in sys.modules]))"
+    carpeta = os.path.join(RAIZ_REPOSITORIO, CARPETAS_MODULOS[modulo]) if modulo in CARPETAS_MODULOS \
+        else DIRECTORIO_MODULOS
+    proceso = subprocess.run([sys.executable, '-X', 'importtime', '-c', codigo], cwd=carpeta,
+                             capture_output=True, text=True)
+    if proceso.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {modulo}: {proceso.stderr.strip().splitlines()[-1]}")
+
+    microsegundos = None
+    for linea in proceso.stderr.splitlines():
+        partes = linea.split('|')
+        if len(partes) == 3 and partes[2].strip() == modulo:
+            microsegundos = int(partes[1])
+    pesados = json.loads(proceso.stdout.strip().splitlines()[-1])
+    return (microsegundos or 0) / 1e6, pesados
+
+
+def verificar_presupuesto(presupuesto=PRESUPUESTO_IMPORTACION, repeticiones=3):
+    """
+    Mide cada módulo `repeticiones` veces (se queda con el mínimo) y lo
+    compara con su presupuesto.
+
+    Returns:
+        Lista de (módulo, segundos, presupuesto, librerías pesadas, dentro del presupuesto)
+    """
+    resultados = []
+    for modulo, limite in presupuesto.items():
+        mediciones = [medir_importacion(modulo) for _ in range(repeticiones)]
+        segundos = min(m[0] for m in mediciones)
+        pesados = mediciones[-1][1]
+        resultados.append((modulo, segundos, limite, pesados, segundos <= limite and not pesados))
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide el tiempo de importación de los módulos del proyecto")
+    parser.add_argument('--repeticiones', type=int, default=3, help="Mediciones por módulo (se usa la menor)")
+    parser.add_argument('modulos', nargs='*', help="Módulos a medir (por defecto todos los del presupuesto)")
+    args = parser.parse_args()
+
+    presupuesto = {m: PRESUPUESTO_IMPORTACION.get(m, 1.0) for m in args.modulos} or PRESUPUESTO_IMPORTACION
+    resultados = verificar_presupuesto(presupuesto, args.repeticiones)
+
+    print("=" * 80)
+    print(f"{'Módulo':<28} {'Tiempo':>9} {'Presupuesto':>12}  Librerías pesadas")
+    print("-" * 80)
+    for modulo, segundos, limite, pesados, correcto in resultados:
+        marca = "[OK]" if correcto else "[ERROR]"
+        print(f"{modulo:<28} {segundos:>8.3f}s {limite:>11.1f}s  {', '.join(pesados) or '-'}  {marca}")
+    print("=" * 80)
+
+    fallidos = [r[0] for r in resultados if not r[4]]
+    if fallidos:
+        print(f"[ERROR] Fuera del presupuesto: {', '.join(fallidos)}")
+        sys.exit(1)
+    print("[OK] Todos los módulos dentro del presupuesto")
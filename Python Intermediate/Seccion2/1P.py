@@ -1,14 +1,13 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from utils import menu_filtro_grado
+from utils import menu_filtro_grado, cargar_encuesta, ARCHIVO_RESPUESTAS, mostrar_o_guardar
 
 # ==================== PREGUNTA 1 — ¿Cómo prefieres aprender cosas nuevas? ====================
 # Conceptos aplicados: value_counts(), filtrado, diccionarios, gráficos
 
 # Cargar datos del archivo correcto
-archivo = '../../data/RecopilaciónDeDatos-BI(respuestas).xlsx'
-df = pd.read_excel(archivo)
+archivo = ARCHIVO_RESPUESTAS
+df = cargar_encuesta(archivo)
 
 # Menú interactivo para filtrar por grado
 df = menu_filtro_grado(df)
@@ -24,6 +23,9 @@ print("\nResultados:")
 print(res_p1)
 print(f"\nTotal de respuestas: {len(df)}")
 
+# pyplot se importa recién al dibujar (la carga y los conteos no lo usan)
+import matplotlib.pyplot as plt
+
 # Crear gráfico de barras
 plt.figure(figsize=(10, 6))
 res_p1.plot(kind='bar', color='steelblue', edgecolor='black', alpha=0.7)
@@ -33,7 +35,7 @@ plt.ylabel('Cantidad de Estudiantes', fontsize=12)
 plt.xticks(rotation=45, ha='right')
 plt.grid(axis='y', alpha=0.3, linestyle='--')
 plt.tight_layout()
-plt.show()
+mostrar_o_guardar('grafico_p1_barras')
 
 # Crear gráfico de pastel
 plt.figure(figsize=(8, 8))
@@ -41,4 +43,4 @@ res_p1.plot(kind='pie', autopct='%1.1f%%', startangle=90, colors=plt.cm.Set3.col
 plt.title('Distribución de Preferencias de Aprendizaje', fontsize=14, fontweight='bold')
 plt.ylabel('')
 plt.tight_layout()
-plt.show()
+mostrar_o_guardar('grafico_p1_pie')
@@ -1,14 +1,13 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from utils import menu_filtro_grado
+from utils import menu_filtro_grado, cargar_encuesta, ARCHIVO_RESPUESTAS, mostrar_o_guardar
 
 # ==================== PREGUNTA 2 — Importancia de la tecnología ====================
 # Conceptos aplicados: filtrado booleano + NumPy + conteo + gráficos
 
 # Cargar datos del archivo correcto
-archivo = '../../data/RecopilaciónDeDatos-BI(respuestas).xlsx'
-df = pd.read_excel(archivo)
+archivo = ARCHIVO_RESPUESTAS
+df = cargar_encuesta(archivo)
 
 # Menú interactivo para filtrar por grado
 df = menu_filtro_grado(df)
@@ -36,6 +35,9 @@ tech_counts = df[col_tech].value_counts()
 print("\nDistribución completa:")
 print(tech_counts)
 
+# pyplot se importa recién al dibujar (la carga y los conteos no lo usan)
+import matplotlib.pyplot as plt
+
 # Crear gráfico de barras
 plt.figure(figsize=(10, 6))
 tech_counts.plot(kind='bar', color=['#2ecc71', '#3498db', '#e74c3c', '#f39c12'], edgecolor='black', alpha=0.7)
@@ -45,4 +47,4 @@ plt.ylabel('Cantidad de Estudiantes', fontsize=12)
 plt.xticks(rotation=45, ha='right')
 plt.grid(axis='y', alpha=0.3, linestyle='--')
 plt.tight_layout()
-plt.show()
+mostrar_o_guardar('grafico_p2_barras')
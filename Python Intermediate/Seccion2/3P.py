@@ -1,14 +1,13 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from utils import menu_filtro_grado
+from utils import menu_filtro_grado, cargar_encuesta, ARCHIVO_RESPUESTAS, mostrar_o_guardar
 
 # ==================== PREGUNTA 3 — ¿Te entusiasma diseñar programas, aplicaciones o inventos? ====================
 # Conceptos aplicados: funciones + diccionarios + pandas + gráficos
 
 # Cargar datos del archivo correcto
-archivo = '../../data/RecopilaciónDeDatos-BI(respuestas).xlsx'
-df = pd.read_excel(archivo)
+archivo = ARCHIVO_RESPUESTAS
+df = cargar_encuesta(archivo)
 
 # Menú interactivo para filtrar por grado
 df = menu_filtro_grado(df)
@@ -28,6 +27,13 @@ print("\nDistribución de respuestas:")
 for respuesta, cantidad in resultado_p3.items():
     print(f"  - {respuesta}: {cantidad}")
 
+# pyplot se importa recién al dibujar (la carga y los conteos no lo usan)
+import matplotlib.pyplot as plt
+
+# Los gráficos de los demás scripts llevan el número de su pregunta en el
+# reporte (grafico_p1..p5; 4P es la pregunta 3 del reporte). Esta pregunta no
+# está en el reporte, así que sus archivos conservan su propio nombre para no
+# pisar los grafico_p3_* de 4P
 # Crear gráfico de barras horizontal
 serie_p3 = df[col_pregunta].value_counts()
 plt.figure(figsize=(10, 6))
@@ -37,7 +43,7 @@ plt.xlabel('Cantidad de Estudiantes', fontsize=12)
 plt.ylabel('Respuesta', fontsize=12)
 plt.grid(axis='x', alpha=0.3, linestyle='--')
 plt.tight_layout()
-plt.show()
+mostrar_o_guardar('grafico_programacion_barras')
 
 # Crear gráfico de pastel
 plt.figure(figsize=(8, 8))
@@ -45,5 +51,5 @@ serie_p3.plot(kind='pie', autopct='%1.1f%%', startangle=90, colors=plt.cm.Pastel
 plt.title('Distribución de Respuestas sobre Diseño de Programas', fontsize=14, fontweight='bold')
 plt.ylabel('')
 plt.tight_layout()
-plt.show()
+mostrar_o_guardar('grafico_programacion_pie')
 
@@ -1,14 +1,13 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from utils import menu_filtro_grado
+from utils import menu_filtro_grado, cargar_encuesta, ARCHIVO_RESPUESTAS, mostrar_o_guardar
 
 # ==================== PREGUNTA 4 — Factor que influye más en la elección de carrera ====================
 # Conceptos aplicados: funciones + diccionarios + pandas + gráficos
 
 # Cargar datos del archivo correcto
-archivo = '../../data/RecopilaciónDeDatos-BI(respuestas).xlsx'
-df = pd.read_excel(archivo)
+archivo = ARCHIVO_RESPUESTAS
+df = cargar_encuesta(archivo)
 
 # Menú interactivo para filtrar por grado
 df = menu_filtro_grado(df)
@@ -28,6 +27,9 @@ print("\nFactores que influyen en la elección de carrera:")
 for factor, cantidad in resultado_p3.items():
     print(f"  - {factor}: {cantidad}")
 
+# pyplot se importa recién al dibujar (la carga y los conteos no lo usan)
+import matplotlib.pyplot as plt
+
 # Crear gráfico de barras horizontal
 serie_p3 = df[col_eleccion].value_counts()
 plt.figure(figsize=(10, 6))
@@ -37,7 +39,7 @@ plt.xlabel('Cantidad de Estudiantes', fontsize=12)
 plt.ylabel('Factor', fontsize=12)
 plt.grid(axis='x', alpha=0.3, linestyle='--')
 plt.tight_layout()
-plt.show()
+mostrar_o_guardar('grafico_p3_barras')
 
 # Crear gráfico de pastel
 plt.figure(figsize=(8, 8))
@@ -45,4 +47,4 @@ serie_p3.plot(kind='pie', autopct='%1.1f%%', startangle=90, colors=plt.cm.Pastel
 plt.title('Distribución de Factores de Influencia', fontsize=14, fontweight='bold')
 plt.ylabel('')
 plt.tight_layout()
-plt.show()
+mostrar_o_guardar('grafico_p3_pie')
@@ -1,14 +1,13 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from utils import menu_filtro_grado
+from utils import menu_filtro_grado, cargar_encuesta, ARCHIVO_RESPUESTAS, mostrar_o_guardar
 
 # ==================== PREGUNTA 5 — Tipo de estudios preferidos después del colegio ====================
 # Conceptos aplicados: NumPy + boolean indexing + value_counts + gráficos
 
 # Cargar datos del archivo correcto
-archivo = '../../data/RecopilaciónDeDatos-BI(respuestas).xlsx'
-df = pd.read_excel(archivo)
+archivo = ARCHIVO_RESPUESTAS
+df = cargar_encuesta(archivo)
 
 # Menú interactivo para filtrar por grado
 df = menu_filtro_grado(df)
@@ -40,6 +39,9 @@ conteos = df[col_tipo_estudios].value_counts()
 print("\nDistribución completa:")
 print(conteos)
 
+# pyplot se importa recién al dibujar (la carga y los conteos no lo usan)
+import matplotlib.pyplot as plt
+
 # Crear gráfico de barras
 plt.figure(figsize=(10, 6))
 conteos.plot(kind='bar', color='mediumpurple', edgecolor='black', alpha=0.7)
@@ -49,7 +51,7 @@ plt.ylabel('Cantidad de Estudiantes', fontsize=12)
 plt.xticks(rotation=45, ha='right')
 plt.grid(axis='y', alpha=0.3, linestyle='--')
 plt.tight_layout()
-plt.show()
+mostrar_o_guardar('grafico_p4_barras')
 
 # Crear gráfico de pastel
 plt.figure(figsize=(8, 8))
@@ -57,5 +59,5 @@ conteos.plot(kind='pie', autopct='%1.1f%%', startangle=90, colors=plt.cm.Set2.co
 plt.title('Distribución de Preferencias de Estudios', fontsize=14, fontweight='bold')
 plt.ylabel('')
 plt.tight_layout()
-plt.show()
+mostrar_o_guardar('grafico_p4_pie')
 
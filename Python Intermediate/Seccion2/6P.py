@@ -1,14 +1,13 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from utils import menu_filtro_grado
+from utils import menu_filtro_grado, cargar_encuesta, ARCHIVO_RESPUESTAS, mostrar_o_guardar
 
 # ==================== PREGUNTA 6 — ¿Dónde se imaginan trabajando? ====================
 # Conceptos aplicados: groupby, comprensión de listas, gráficos
 
 # Cargar datos del archivo correcto
-archivo = '../../data/RecopilaciónDeDatos-BI(respuestas).xlsx'
-df = pd.read_excel(archivo)
+archivo = ARCHIVO_RESPUESTAS
+df = cargar_encuesta(archivo)
 
 # Menú interactivo para filtrar por grado
 df = menu_filtro_grado(df)
@@ -31,6 +30,9 @@ conteos_lugares = lugares.value_counts()
 print("\nResumen ordenado:")
 print(conteos_lugares)
 
+# pyplot se importa recién al dibujar (la carga y los conteos no lo usan)
+import matplotlib.pyplot as plt
+
 # Crear gráfico de barras
 plt.figure(figsize=(12, 6))
 conteos_lugares.plot(kind='bar', color='teal', edgecolor='black', alpha=0.7)
@@ -40,7 +42,7 @@ plt.ylabel('Cantidad de Estudiantes', fontsize=12)
 plt.xticks(rotation=45, ha='right')
 plt.grid(axis='y', alpha=0.3, linestyle='--')
 plt.tight_layout()
-plt.show()
+mostrar_o_guardar('grafico_p5_barras')
 
 # Crear gráfico de pastel
 plt.figure(figsize=(10, 10))
@@ -48,5 +50,5 @@ conteos_lugares.plot(kind='pie', autopct='%1.1f%%', startangle=90, colors=plt.cm
 plt.title('Distribución de Lugares de Trabajo Preferidos', fontsize=14, fontweight='bold')
 plt.ylabel('')
 plt.tight_layout()
-plt.show()
+mostrar_o_guardar('grafico_p5_pie')
 
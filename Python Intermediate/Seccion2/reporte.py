@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from io import BytesIO
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
 from reportlab.lib.units import inch
@@ -7,30 +8,70 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from datetime import datetime
+import argparse
 import os
-import glob
+from utils import cargar_encuesta_normalizada, ARCHIVO_RESPUESTAS
+from cubo import construir_cubo, consultar_cubo, total_cubo, resolver_pregunta
+from cache_graficos import graficar_en_memoria
+from config_graficos import nombre_archivo_seguro
+from render_lote import ejecutar_en_paralelo, procesos_por_defecto
+from perfilado import etapa, perfilar
 
-# ==================== GENERAR REPORTE PDF ====================
+# ==================== PREGUNTAS DEL REPORTE ====================
+# Cada pregunta lleva el gráfico de barras de su script (1P, 2P, 4P, 5P y 6P)
+
+PREGUNTAS_REPORTE = {
+    "Pregunta 1 - Preferencias de Aprendizaje": {
+        "columna": "¿Cómo prefieres aprender cosas nuevas?",
+        "descripcion": "Análisis de los métodos de aprendizaje preferidos por los estudiantes.",
+        "grafico": {"tipo": "bar", "color": "steelblue", "tamano": (10, 6),
+                    "titulo": "Preferencias de Aprendizaje de los Estudiantes",
+                    "xlabel": "Método de Aprendizaje", "ylabel": "Cantidad de Estudiantes"}
+    },
+    "Pregunta 2 - Importancia de la Tecnología": {
+        "columna": "¿Qué tan importante consideras la tecnología (computadoras, internet, apps) para tu educación futura?",
+        "descripcion": "Evaluación de la percepción sobre la importancia de la tecnología.",
+        "grafico": {"tipo": "bar", "color": ['#2ecc71', '#3498db', '#e74c3c', '#f39c12'], "tamano": (10, 6),
+                    "titulo": "Importancia de la Tecnología para la Educación Futura",
+                    "xlabel": "Nivel de Importancia", "ylabel": "Cantidad de Estudiantes"}
+    },
+    "Pregunta 3 - Factores de Elección de Carrera": {
+        "columna": "¿Qué factor influye más en tu elección de carrera?",
+        "descripcion": "Identificación de los principales factores que influyen en la elección de carrera.",
+        "grafico": {"tipo": "barh", "color": "coral", "tamano": (10, 6),
+                    "titulo": "Factores que Influyen en la Elección de Carrera",
+                    "xlabel": "Cantidad de Estudiantes", "ylabel": "Factor"}
+    },
+    "Pregunta 4 - Tipo de Estudios Preferidos": {
+        "columna": "¿Qué tipo de estudios prefieres seguir después del colegio?",
+        "descripcion": "Análisis de las preferencias sobre el tipo de estudios superiores.",
+        "grafico": {"tipo": "bar", "color": "mediumpurple", "tamano": (10, 6),
+                    "titulo": "Tipo de Estudios Preferidos Después del Colegio",
+                    "xlabel": "Tipo de Estudios", "ylabel": "Cantidad de Estudiantes"}
+    },
+    "Pregunta 5 - Lugar de Trabajo Futuro": {
+        "columna": "¿Dónde te imaginas trabajando en el futuro?",
+        "descripcion": "Expectativas sobre los lugares donde los estudiantes se imaginan trabajando.",
+        "grafico": {"tipo": "bar", "color": "teal", "tamano": (12, 6),
+                    "titulo": "Lugares Donde los Estudiantes se Imaginan Trabajando",
+                    "xlabel": "Lugar de Trabajo", "ylabel": "Cantidad de Estudiantes"}
+    }
+}
+
+GRADOS_REPORTE = {'4°': '4to Año', '5°': '5to Año'}
+
+# ==================== ESTILOS (se crean una sola vez) ====================
+
+_estilos = {}
+
+def obtener_estilos():
+    """Estilos de párrafo del reporte; se crean en la primera llamada y se reutilizan"""
+    if _estilos:
+        return _estilos
 
-def generar_reporte_pdf():
-    """Genera un reporte PDF completo con todos los resultados y gráficos"""
-    
-    # Cargar datos
-    archivo = '../../data/RecopilaciónDeDatos-BI(respuestas).xlsx'
-    df = pd.read_excel(archivo)
-    
-    # Crear el documento PDF
-    nombre_pdf = f"Reporte_Analisis_Encuesta_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-    doc = SimpleDocTemplate(nombre_pdf, pagesize=A4,
-                            rightMargin=72, leftMargin=72,
-                            topMargin=72, bottomMargin=18)
-    
-    # Contenedor para los elementos del PDF
-    story = []
-    
-    # Estilos
     styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
+    _estilos['normal'] = styles['Normal']
+    _estilos['titulo'] = ParagraphStyle(
         'CustomTitle',
         parent=styles['Heading1'],
         fontSize=24,
@@ -38,8 +79,7 @@ def generar_reporte_pdf():
         spaceAfter=30,
         alignment=TA_CENTER
     )
-    
-    heading_style = ParagraphStyle(
+    _estilos['encabezado'] = ParagraphStyle(
         'CustomHeading',
         parent=styles['Heading2'],
         fontSize=16,
@@ -47,194 +87,346 @@ def generar_reporte_pdf():
         spaceAfter=12,
         spaceBefore=12
     )
-    
-    # Título principal
-    story.append(Paragraph("REPORTE DE ANÁLISIS DE ENCUESTA", title_style))
-    story.append(Paragraph("Análisis de Preferencias y Expectativas de Estudiantes", 
-                          styles['Normal']))
-    story.append(Spacer(1, 0.2*inch))
-    story.append(Paragraph(f"<b>Fecha de generación:</b> {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", 
-                          styles['Normal']))
-    story.append(Paragraph(f"<b>Total de estudiantes encuestados:</b> {len(df)}", 
-                          styles['Normal']))
-    story.append(Spacer(1, 0.3*inch))
-    
-    # Columnas de las preguntas
-    columnas_preguntas = {
-        "Pregunta 1 - Preferencias de Aprendizaje": {
-            "columna": "¿Cómo prefieres aprender cosas nuevas?",
-            "descripcion": "Análisis de los métodos de aprendizaje preferidos por los estudiantes."
-        },
-        "Pregunta 2 - Importancia de la Tecnología": {
-            "columna": "¿Qué tan importante consideras la tecnología (computadoras, internet, apps) para tu educación futura?",
-            "descripcion": "Evaluación de la percepción sobre la importancia de la tecnología."
-        },
-        "Pregunta 3 - Factores de Elección de Carrera": {
-            "columna": "¿Qué factor influye más en tu elección de carrera?",
-            "descripcion": "Identificación de los principales factores que influyen en la elección de carrera."
-        },
-        "Pregunta 4 - Tipo de Estudios Preferidos": {
-            "columna": "¿Qué tipo de estudios prefieres seguir después del colegio?",
-            "descripcion": "Análisis de las preferencias sobre el tipo de estudios superiores."
-        },
-        "Pregunta 5 - Lugar de Trabajo Futuro": {
-            "columna": "¿Dónde te imaginas trabajando en el futuro?",
-            "descripcion": "Expectativas sobre los lugares donde los estudiantes se imaginan trabajando."
-        }
-    }
-    
-    # Procesar cada pregunta
-    for idx, (titulo, info) in enumerate(columnas_preguntas.items(), 1):
-        columna = info["columna"]
-        descripcion = info["descripcion"]
-        
-        if columna not in df.columns:
-            story.append(Paragraph(f"<b>{titulo}</b>", heading_style))
-            story.append(Paragraph("[ADVERTENCIA] Columna no encontrada en los datos.", styles['Normal']))
-            story.append(Spacer(1, 0.2*inch))
-            continue
-        
-        # Título de la pregunta
-        story.append(PageBreak() if idx > 1 else Spacer(1, 0.2*inch))
-        story.append(Paragraph(f"<b>{titulo}</b>", heading_style))
-        story.append(Paragraph(descripcion, styles['Normal']))
-        story.append(Spacer(1, 0.1*inch))
-        
-        # Columna de grado
-        col_grado = "  ¿En qué grado estás actualmente?   "
-        
-        # Función auxiliar para crear tabla
-        def crear_tabla_resultados(conteos, titulo_tabla=""):
-            """Crea una tabla con los resultados"""
-            # Crear estilo para encabezados con texto blanco
-            header_style = ParagraphStyle(
-                'HeaderStyle',
-                parent=styles['Normal'],
-                textColor=colors.white,
-                fontName='Helvetica-Bold',
-                fontSize=10,
-                alignment=TA_LEFT
-            )
-            header_style_center = ParagraphStyle(
-                'HeaderStyleCenter',
-                parent=header_style,
-                alignment=TA_CENTER
-            )
-            
-            data = [[Paragraph('Opción', header_style), 
-                     Paragraph('Cantidad', header_style_center), 
-                     Paragraph('Porcentaje', header_style_center)]]
-            total = conteos.sum() if len(conteos) > 0 else 0
-            
-            if total > 0:
-                for opcion, cantidad in conteos.items():
-                    porcentaje = (cantidad / total) * 100
-                    data.append([
-                        Paragraph(str(opcion)[:50] + ('...' if len(str(opcion)) > 50 else ''), styles['Normal']),
-                        Paragraph(str(cantidad), styles['Normal']),
-                        Paragraph(f"{porcentaje:.1f}%", styles['Normal'])
-                    ])
-                # Usar Paragraph para que el HTML se interprete correctamente
-                data.append([
-                    Paragraph('<b>TOTAL</b>', styles['Normal']), 
-                    Paragraph(f'<b>{total}</b>', styles['Normal']), 
-                    Paragraph('<b>100.0%</b>', styles['Normal'])
-                ])
-            else:
-                data.append([
-                    Paragraph('Sin datos', styles['Normal']), 
-                    Paragraph('0', styles['Normal']), 
-                    Paragraph('0.0%', styles['Normal'])
-                ])
-            
-            tabla = Table(data, colWidths=[3.5*inch, 1*inch, 1*inch])
-            tabla.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#283593')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -2), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, colors.lightgrey]),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#c5cae9')),
-            ]))
-            return tabla
-        
-        # Mostrar resultados por grado si existe la columna
-        if col_grado in df.columns:
-            # Resultados de 4to año
-            df_4to = df[df[col_grado] == '4°']
-            if len(df_4to) > 0:
-                conteos_4to = df_4to[columna].value_counts()
-                story.append(Paragraph("<b>Resultados - 4to Año:</b>", styles['Normal']))
-                story.append(Spacer(1, 0.05*inch))
-                tabla_4to = crear_tabla_resultados(conteos_4to)
-                story.append(tabla_4to)
-                story.append(Spacer(1, 0.15*inch))
-            
-            # Resultados de 5to año
-            df_5to = df[df[col_grado] == '5°']
-            if len(df_5to) > 0:
-                conteos_5to = df_5to[columna].value_counts()
-                story.append(Paragraph("<b>Resultados - 5to Año:</b>", styles['Normal']))
-                story.append(Spacer(1, 0.05*inch))
-                tabla_5to = crear_tabla_resultados(conteos_5to)
-                story.append(tabla_5to)
-                story.append(Spacer(1, 0.15*inch))
-        
-        # Obtener conteos totales
-        conteos = df[columna].value_counts()
-        
-        # Crear tabla con todos los resultados
-        story.append(Paragraph("<b>Resultados - Total (4to + 5to Año):</b>", styles['Normal']))
-        story.append(Spacer(1, 0.05*inch))
-        tabla_total = crear_tabla_resultados(conteos)
-        story.append(tabla_total)
-        story.append(Spacer(1, 0.2*inch))
-        
-        # Intentar agregar gráfico si existe
-        grafico_path = f'grafico_p{idx}_*.png'
-        graficos = glob.glob(grafico_path)
-        if graficos:
-            # Tomar el primer gráfico encontrado (barras preferiblemente)
-            grafico_barras = [g for g in graficos if 'pie' not in g]
-            grafico_a_usar = grafico_barras[0] if grafico_barras else graficos[0]
-            
-            if os.path.exists(grafico_a_usar):
-                try:
-                    img = Image(grafico_a_usar, width=6*inch, height=3.5*inch)
-                    story.append(img)
-                    story.append(Spacer(1, 0.2*inch))
-                except:
-                    pass
-    
+    # Encabezados de tabla con texto blanco
+    _estilos['cabecera'] = ParagraphStyle(
+        'HeaderStyle',
+        parent=styles['Normal'],
+        textColor=colors.white,
+        fontName='Helvetica-Bold',
+        fontSize=10,
+        alignment=TA_LEFT
+    )
+    _estilos['cabecera_centro'] = ParagraphStyle(
+        'HeaderStyleCenter',
+        parent=_estilos['cabecera'],
+        alignment=TA_CENTER
+    )
+    return _estilos
+
+ESTILO_TABLA = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#283593')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -2), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, colors.lightgrey]),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#c5cae9')),
+])
+
+# ==================== TABLAS Y GRÁFICOS ====================
+
+def ordenar_conteos(conteos):
+    """Deja los conteos del cubo como los da value_counts (sin ceros, de mayor a menor)"""
+    return conteos[conteos > 0].sort_values(ascending=False, kind='stable')
+
+@perfilar('tabla_reportlab')
+def crear_tabla_resultados(conteos, estilos):
+    """Crea una tabla con los resultados"""
+    normal = estilos['normal']
+    data = [[Paragraph('Opción', estilos['cabecera']),
+             Paragraph('Cantidad', estilos['cabecera_centro']),
+             Paragraph('Porcentaje', estilos['cabecera_centro'])]]
+    total = conteos.sum() if len(conteos) > 0 else 0
+
+    if total > 0:
+        for opcion, cantidad in conteos.items():
+            porcentaje = (cantidad / total) * 100
+            data.append([
+                Paragraph(str(opcion)[:50] + ('...' if len(str(opcion)) > 50 else ''), normal),
+                Paragraph(str(cantidad), normal),
+                Paragraph(f"{porcentaje:.1f}%", normal)
+            ])
+        # Usar Paragraph para que el HTML se interprete correctamente
+        data.append([
+            Paragraph('<b>TOTAL</b>', normal),
+            Paragraph(f'<b>{total}</b>', normal),
+            Paragraph('<b>100.0%</b>', normal)
+        ])
+    else:
+        data.append([
+            Paragraph('Sin datos', normal),
+            Paragraph('0', normal),
+            Paragraph('0.0%', normal)
+        ])
+
+    tabla = Table(data, colWidths=[3.5*inch, 1*inch, 1*inch])
+    tabla.setStyle(ESTILO_TABLA)
+    return tabla
+
+def dibujar_grafico_pregunta(conteos, grafico):
+    """Gráfico de barras de una pregunta (el mismo que guarda su script)"""
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=grafico['tamano'])
+    conteos.plot(kind=grafico['tipo'], color=grafico['color'], edgecolor='black', alpha=0.7)
+    plt.title(grafico['titulo'], fontsize=14, fontweight='bold')
+    plt.xlabel(grafico['xlabel'], fontsize=12)
+    plt.ylabel(grafico['ylabel'], fontsize=12)
+    if grafico['tipo'] == 'bar':
+        plt.xticks(rotation=45, ha='right')
+    plt.grid(axis='y' if grafico['tipo'] == 'bar' else 'x', alpha=0.3, linestyle='--')
+    plt.tight_layout()
+
+# ==================== DATOS DEL REPORTE ====================
+
+def conteos_pregunta(cubo, columna, grados, filtros=None):
+    """Conteos total y por grado de una pregunta, leídos del cubo"""
+    resultado = {'total': ordenar_conteos(consultar_cubo(cubo, columna, filtros))}
+    if grados:
+        por_grado = consultar_cubo(cubo, columna, filtros, por='Grado')
+        for grado in grados:
+            resultado[grado] = ordenar_conteos(por_grado[grado])
+    return resultado
+
+def datos_reporte(cubo, filtros=None):
+    """
+    Todo lo que necesita un reporte, leído del cubo: total de estudiantes,
+    conteos de cada pregunta (None si falta la columna) y distribución por grado.
+    Es un diccionario pequeño que se puede enviar a otro proceso.
+    """
+    grados = []
+    distribucion = None
+    if 'Grado' in cubo['dimensiones']:
+        grados = [g for g in GRADOS_REPORTE if total_cubo(cubo, {**(filtros or {}), 'Grado': g}) > 0]
+        distribucion = ordenar_conteos(total_cubo(cubo, filtros, por='Grado'))
+
+    preguntas = {}
+    for titulo, info in PREGUNTAS_REPORTE.items():
+        preguntas[titulo] = None
+        if resolver_pregunta(cubo, info["columna"]):
+            preguntas[titulo] = conteos_pregunta(cubo, info["columna"], grados, filtros)
+
+    return {'total': total_cubo(cubo, filtros), 'preguntas': preguntas, 'grados': distribucion}
+
+# ==================== SECCIONES DEL REPORTE ====================
+
+def crear_seccion_pregunta(idx, titulo, info, conteos, png, estilos):
+    """Flowables de una pregunta: título, tablas por grado, total y gráfico"""
+    normal = estilos['normal']
+    seccion = []
+
+    if conteos is None:
+        seccion.append(Paragraph(f"<b>{titulo}</b>", estilos['encabezado']))
+        seccion.append(Paragraph("[ADVERTENCIA] Columna no encontrada en los datos.", normal))
+        seccion.append(Spacer(1, 0.2*inch))
+        return seccion
+
+    # Título de la pregunta
+    seccion.append(PageBreak() if idx > 1 else Spacer(1, 0.2*inch))
+    seccion.append(Paragraph(f"<b>{titulo}</b>", estilos['encabezado']))
+    seccion.append(Paragraph(info["descripcion"], normal))
+    seccion.append(Spacer(1, 0.1*inch))
+
+    # Resultados por grado
+    for grado, nombre in GRADOS_REPORTE.items():
+        if grado in conteos:
+            seccion.append(Paragraph(f"<b>Resultados - {nombre}:</b>", normal))
+            seccion.append(Spacer(1, 0.05*inch))
+            seccion.append(crear_tabla_resultados(conteos[grado], estilos))
+            seccion.append(Spacer(1, 0.15*inch))
+
+    # Tabla con todos los resultados
+    seccion.append(Paragraph("<b>Resultados - Total (4to + 5to Año):</b>", normal))
+    seccion.append(Spacer(1, 0.05*inch))
+    seccion.append(crear_tabla_resultados(conteos['total'], estilos))
+    seccion.append(Spacer(1, 0.2*inch))
+
+    # Gráfico incrustado desde memoria
+    if png is not None:
+        seccion.append(Image(BytesIO(png), width=6*inch, height=3.5*inch))
+        seccion.append(Spacer(1, 0.2*inch))
+    return seccion
+
+def generar_secciones(datos, estilos, procesos):
+    """
+    Genera las secciones del reporte una por una.
+
+    Los gráficos se dibujan en paralelo por bloques de `procesos` preguntas,
+    así solo un bloque de imágenes está en memoria a la vez.
+    """
+    preguntas = list(PREGUNTAS_REPORTE.items())
+    for inicio in range(0, len(preguntas), procesos):
+        bloque = [(idx, titulo, info, datos['preguntas'][titulo])
+                  for idx, (titulo, info) in enumerate(preguntas[inicio:inicio + procesos], inicio + 1)]
+
+        tareas = [(dibujar_grafico_pregunta, conteos['total'], info['grafico'])
+                  for _, _, info, conteos in bloque if conteos is not None and len(conteos['total'])]
+        imagenes = iter(ejecutar_en_paralelo(graficar_en_memoria, tareas, procesos=procesos))
+
+        for idx, titulo, info, conteos in bloque:
+            png = next(imagenes) if conteos is not None and len(conteos['total']) else None
+            with etapa(f"pregunta:{titulo}"):
+                seccion = crear_seccion_pregunta(idx, titulo, info, conteos, png, estilos)
+            yield seccion
+
     # Página de resumen final
-    story.append(PageBreak())
-    story.append(Paragraph("<b>RESUMEN EJECUTIVO</b>", heading_style))
-    story.append(Spacer(1, 0.2*inch))
-    
-    # Estadísticas generales
-    col_grado = "  ¿En qué grado estás actualmente?   "
-    if col_grado in df.columns:
-        conteo_grados = df[col_grado].value_counts()
-        story.append(Paragraph("<b>Distribución por Grado:</b>", styles['Normal']))
-        for grado, cantidad in conteo_grados.items():
-            story.append(Paragraph(f"  • {grado}: {cantidad} estudiantes", styles['Normal']))
-        story.append(Spacer(1, 0.1*inch))
-    
-    # Construir el PDF
-    doc.build(story)
+    resumen = [PageBreak(), Paragraph("<b>RESUMEN EJECUTIVO</b>", estilos['encabezado']),
+               Spacer(1, 0.2*inch)]
+    if datos['grados'] is not None:
+        resumen.append(Paragraph("<b>Distribución por Grado:</b>", estilos['normal']))
+        for grado, cantidad in datos['grados'].items():
+            resumen.append(Paragraph(f"  • {grado}: {cantidad} estudiantes", estilos['normal']))
+        resumen.append(Spacer(1, 0.1*inch))
+    yield resumen
+
+def construir_por_secciones(doc, portada, secciones):
+    """
+    Construye el PDF agregando cada sección cuando la anterior ya se dibujó.
+
+    reportlab consume la lista de flowables desde el inicio; con el gancho
+    filterFlowables se agrega la siguiente sección justo antes de dibujar el
+    último elemento pendiente, en vez de armar todo el documento en memoria.
+    """
+    story = list(portada)
+
+    def agregar_siguiente(flowables):
+        # reportlab también pasa por aquí su lista interna de inicio de página
+        if flowables is not story:
+            return
+        while len(flowables) <= 1:
+            siguiente = next(secciones, None)
+            if siguiente is None:
+                return
+            flowables.extend(siguiente)
+
+    doc.filterFlowables = agregar_siguiente
+    with etapa('construccion_pdf'):
+        doc.build(story)
+
+# ==================== GENERAR REPORTE PDF ====================
+
+@perfilar('reporte')
+def escribir_pdf(datos, nombre_pdf, procesos=1, grupo=None):
+    """
+    Escribe un reporte a partir de datos_reporte().
+
+    Es una función de módulo para poder repartir varios reportes entre
+    procesos; los estilos se crean una sola vez por proceso.
+
+    Args:
+        datos: Diccionario devuelto por datos_reporte
+        nombre_pdf: Ruta del PDF
+        procesos: Procesos para dibujar los gráficos de este reporte
+        grupo: Texto del grupo del reporte (ej. 'Colegio: I.E.P ...'), opcional
+    """
+    estilos = obtener_estilos()
+    doc = SimpleDocTemplate(nombre_pdf, pagesize=A4,
+                            rightMargin=72, leftMargin=72,
+                            topMargin=72, bottomMargin=18)
+
+    # Título principal
+    portada = [
+        Paragraph("REPORTE DE ANÁLISIS DE ENCUESTA", estilos['titulo']),
+        Paragraph("Análisis de Preferencias y Expectativas de Estudiantes", estilos['normal']),
+        Spacer(1, 0.2*inch),
+    ]
+    if grupo:
+        portada.append(Paragraph(f"<b>{grupo}</b>", estilos['normal']))
+    portada += [
+        Paragraph(f"<b>Fecha de generación:</b> {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}",
+                  estilos['normal']),
+        Paragraph(f"<b>Total de estudiantes encuestados:</b> {datos['total']}", estilos['normal']),
+        Spacer(1, 0.3*inch),
+    ]
+
+    # Construir el PDF sección por sección
+    construir_por_secciones(doc, portada, generar_secciones(datos, estilos, max(1, procesos)))
+    return nombre_pdf
+
+def generar_reporte_pdf(df=None, archivo=ARCHIVO_RESPUESTAS, nombre_pdf=None, cubo=None, procesos=None):
+    """
+    Genera un reporte PDF completo con todos los resultados y gráficos.
+
+    Args:
+        df: Datos normalizados (por defecto se carga `archivo`)
+        archivo: Excel de la encuesta
+        nombre_pdf: Ruta del PDF (por defecto con fecha y hora)
+        cubo: Cubo de conteos ya calculado (por defecto se construye)
+        procesos: Procesos para dibujar los gráficos (por defecto BI_PROCESOS o núcleos)
+    """
+    # Cargar datos y precalcular todos los conteos en una sola pasada
+    if cubo is None:
+        if df is None:
+            df = cargar_encuesta_normalizada(archivo)
+        cubo = construir_cubo(df)
+
+    if nombre_pdf is None:
+        nombre_pdf = f"Reporte_Analisis_Encuesta_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    escribir_pdf(datos_reporte(cubo), nombre_pdf, procesos or procesos_por_defecto())
     print(f"\n[OK] Reporte PDF generado exitosamente: {nombre_pdf}")
     return nombre_pdf
 
+# ==================== REPORTES POR COLEGIO O DISTRITO ====================
+
+def generar_reportes_por_grupo(por='Colegio', df=None, archivo=ARCHIVO_RESPUESTAS, directorio=None,
+                               cubo=None, procesos=None):
+    """
+    Genera un PDF por cada colegio (o distrito) de la encuesta.
+
+    Los datos se cargan y el cubo se construye una sola vez; los conteos de
+    cada grupo son cortes del cubo. Los PDF se reparten entre los procesos
+    (cada uno con sus estilos en memoria) y los gráficos que no cambiaron
+    se toman de la caché de gráficos.
+
+    Args:
+        por: Dimensión del cubo que separa los reportes ('Colegio' o 'Distrito')
+        df: Datos normalizados (por defecto se carga `archivo`)
+        archivo: Excel de la encuesta
+        directorio: Carpeta de salida (por defecto reportes_por_<por>)
+        cubo: Cubo de conteos ya calculado (por defecto se construye)
+        procesos: Procesos para repartir los reportes (por defecto BI_PROCESOS o núcleos)
+
+    Returns:
+        Lista con las rutas de los PDF generados
+    """
+    if cubo is None:
+        if df is None:
+            df = cargar_encuesta_normalizada(archivo)
+        cubo = construir_cubo(df)
+    if por not in cubo['dimensiones']:
+        print(f"[ERROR] Los datos no tienen la columna de {por}.")
+        return []
+
+    directorio = directorio or f"reportes_por_{por.lower()}"
+    os.makedirs(directorio, exist_ok=True)
+
+    # Un reporte por cada valor con estudiantes; dos nombres que difieren solo
+    # en espacios o puntos darían el mismo archivo, así que se numeran
+    tareas = []
+    usados = {}
+    for valor in cubo['posiciones'][por]:
+        filtros = {por: valor}
+        if total_cubo(cubo, filtros) == 0:
+            continue
+        base = nombre_archivo_seguro(valor)
+        usados[base] = usados.get(base, 0) + 1
+        sufijo = f"_{usados[base]}" if usados[base] > 1 else ""
+        ruta = os.path.join(directorio, f"Reporte_{por}_{base}{sufijo}.pdf")
+        tareas.append((datos_reporte(cubo, filtros), ruta, 1, f"{por}: {valor}"))
+
+    print(f"Generando {len(tareas)} reportes por {por.lower()} en: {directorio}")
+    rutas = ejecutar_en_paralelo(escribir_pdf, tareas, procesos=procesos)
+    print(f"\n[OK] {len(rutas)} reportes PDF generados en: {directorio}")
+    return rutas
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera el reporte PDF de la encuesta")
+    parser.add_argument('--por', choices=['Colegio', 'Distrito'],
+                        help="Generar un reporte por cada colegio o distrito en lugar del global")
+    parser.add_argument('--salida', help="Carpeta de los reportes por colegio o distrito")
+    parser.add_argument('--procesos', type=int, help="Procesos a usar (por defecto todos los núcleos)")
+    args = parser.parse_args()
+
     print("=" * 80)
     print("GENERANDO REPORTE PDF...")
     print("=" * 80)
-    generar_reporte_pdf()
+    if args.por:
+        generar_reportes_por_grupo(args.por, directorio=args.salida, procesos=args.procesos)
+    else:
+        generar_reporte_pdf(procesos=args.procesos)
     print("\n[OK] Proceso completado!")
-
@@ -2,15 +2,46 @@
 Utilidades comunes para los scripts de análisis
 """
 
+import argparse
+import os
+import sys
+
+import numpy as np
 import pandas as pd
 
-def menu_filtro_grado(df):
+# Reutilizar el cargador compartido de "Proyecto BI"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Proyecto BI'))
+from carga_datos import cargar_encuesta, cargar_encuesta_normalizada, ARCHIVO_RESPUESTAS
+from config_graficos import mostrar_o_guardar, modo_lote_activo, directorio_salida
+from indices import vista_filas
+
+def grados_linea_comandos(argv=None):
+    """
+    Grados pasados con --grado al script (ej. python 1P.py --grado 4°).
+    Retorna None si no se indicó ninguno.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--grado', nargs='+')
+    args, _ = parser.parse_known_args(argv)
+    return args.grado
+
+def filas_por_grado(df, col_grado, grados):
+    """
+    Estudiantes de los grados indicados (ver indices.vista_filas: sin copia
+    si son todos o un tramo contiguo, si no una sola copia de esas filas).
+    """
+    mascara = df[col_grado].astype(str).str.strip().isin(grados).to_numpy()
+    return vista_filas(df, np.flatnonzero(mascara))
+
+def menu_filtro_grado(df, grados=None):
     """
     Muestra un menú interactivo para seleccionar el filtro de grado.
     Retorna el DataFrame filtrado según la selección del usuario.
     
     Args:
         df: DataFrame con los datos
+        grados: Grados a conservar (ej. ['4°']); si es None se leen de
+                --grado y, si tampoco se indicó, se muestra el menú
         
     Returns:
         DataFrame filtrado según la selección del usuario
@@ -21,10 +52,19 @@ def menu_filtro_grado(df):
     if col_grado not in df.columns:
         print("[ADVERTENCIA] No se encontró la columna de grado. Mostrando todos los datos.")
         return df
+
+    if grados is None:
+        grados = grados_linea_comandos()
+    if grados:
+        # Filtro indicado por argumento: no se pregunta nada
+        grados = [g.strip() for g in grados]
+        df_filtrado = filas_por_grado(df, col_grado, grados)
+        print(f"\n[OK] Filtrando estudiantes de {', '.join(grados)} ({len(df_filtrado)} estudiantes)")
+        return df_filtrado
     
     # Contar estudiantes por grado
-    conteo_4to = len(df[df[col_grado] == '4°'])
-    conteo_5to = len(df[df[col_grado] == '5°'])
+    conteo_4to = int((df[col_grado] == '4°').sum())
+    conteo_5to = int((df[col_grado] == '5°').sum())
     
     print("\n" + "=" * 80)
     print("FILTRO POR GRADO")
@@ -32,6 +72,11 @@ def menu_filtro_grado(df):
     print(f"Total de estudiantes: {len(df)}")
     print(f"  - 4to año: {conteo_4to} estudiantes")
     print(f"  - 5to año: {conteo_5to} estudiantes")
+    if modo_lote_activo():
+        # Sin pantalla no se puede preguntar: se usan todos los estudiantes
+        print(f"\n[OK] Sin menú: mostrando todos los estudiantes ({len(df)} estudiantes)")
+        return df
+
     print("\nSelecciona una opción:")
     print("  1. Solo 4to año")
     print("  2. Solo 5to año")
@@ -43,11 +88,11 @@ def menu_filtro_grado(df):
             opcion = input("\nIngresa tu opción (1, 2 o 3): ").strip()
             
             if opcion == '1':
-                df_filtrado = df[df[col_grado] == '4°'].copy()
+                df_filtrado = filas_por_grado(df, col_grado, ['4°'])
                 print(f"\n[OK] Filtrando solo estudiantes de 4to año ({len(df_filtrado)} estudiantes)")
                 return df_filtrado
             elif opcion == '2':
-                df_filtrado = df[df[col_grado] == '5°'].copy()
+                df_filtrado = filas_por_grado(df, col_grado, ['5°'])
                 print(f"\n[OK] Filtrando solo estudiantes de 5to año ({len(df_filtrado)} estudiantes)")
                 return df_filtrado
             elif opcion == '3':
@@ -55,6 +100,10 @@ def menu_filtro_grado(df):
                 return df
             else:
                 print("[ERROR] Opción inválida. Por favor ingresa 1, 2 o 3.")
+        except EOFError:
+            # La entrada se terminó (ej. un pipe vacío): se usan todos los estudiantes
+            print(f"\n[OK] Sin más entrada: mostrando todos los estudiantes ({len(df)} estudiantes)")
+            return df
         except KeyboardInterrupt:
             print("\n\n[ADVERTENCIA] Operación cancelada. Mostrando todos los datos.")
             return df
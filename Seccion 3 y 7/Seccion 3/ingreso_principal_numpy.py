@@ -1,41 +1,57 @@
 # pandas: se utiliza para la manipulación y análisis de datos estructurados, como hojas de Excel o archivos CSV
 # numpy: se emplea para realizar cálculos numéricos eficientes, como contar valores únicos y calcular porcentajes
 # matplotlib.pyplot: se usa para crear gráficos y visualizaciones, como gráficos de pastel, barras, líneas, etc.
+#   (se importa dentro de ejecutar(), recién al dibujar)
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+import os
+import sys
 
-# Cargamos el archivo Excel en un DataFrame de pandas
-df = pd.read_excel("RecopilacionDeDatos.xlsx")
+# carga_datos: módulo compartido de "Proyecto BI" que guarda el Excel en formato columnar
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', '..', 'Proyecto BI'))
+from config_graficos import mostrar_o_guardar
+from matriz_respuestas import frecuencias, matriz_encuesta
 
 # Definimos el nombre exacto de la columna que queremos analizar
 col = '¿Cuál es la principal fuente de ingresos de su hogar?'
 
-# Verificamos si la columna existe en el DataFrame
-if col in df.columns:
-    # Eliminamos valores nulos y extraemos los datos como un array de NumPy
-    data = df[col].dropna().values
-
-    # Obtenemos los valores únicos y la cantidad de veces que aparecen
-    unique, counts = np.unique(data, return_counts=True)
-
-    # Calculamos el total de respuestas válidas
-    total = np.sum(counts)
-
-    # Calculamos el porcentaje que representa cada respuesta
-    percentages = np.round((counts / total) * 100, 2)
-
-    # Mostramos los resultados en consola con formato amigable
-    print("Fuente principal de ingresos del hogar:")
-    for val, c, pct in zip(unique, counts, percentages):
-        print(f"{val}: {c} ({pct}%)")
-
-    # Creamos un gráfico de pastel para visualizar la distribución de respuestas
-    plt.figure(figsize=(7,7))  # Tamaño del gráfico
-    plt.pie(counts, labels=unique, autopct='%1.1f%%', startangle=140)  # Gráfico circular con porcentajes
-    plt.title('Fuente Principal de Ingreso del Hogar', fontsize=14, fontweight='bold')  # Título del gráfico
-    plt.tight_layout()  # Ajuste automático del layout
-    plt.show()  # Mostramos el gráfico
-else:
-    # Si la columna no existe, mostramos un mensaje de error
-    print("No se encontró la columna:", col)
+def ejecutar(datos):
+    """Analiza la fuente principal de ingresos del hogar"""
+    import matplotlib.pyplot as plt
+
+    # Contamos las respuestas sobre los códigos int8 de la pregunta (np.bincount);
+    # los vacíos no se cuentan y solo quedan las opciones con alguna respuesta
+    resultado = frecuencias(datos, col)
+
+    # Verificamos si la columna existe en los datos
+    if resultado is not None:
+        # Valores únicos y la cantidad de veces que aparecen
+        unique, counts = resultado
+
+        # Calculamos el total de respuestas válidas
+        total = np.sum(counts)
+
+        # Calculamos el porcentaje que representa cada respuesta
+        percentages = np.round((counts / total) * 100, 2)
+
+        # Mostramos los resultados en consola con formato amigable
+        print("Fuente principal de ingresos del hogar:")
+        for val, c, pct in zip(unique, counts, percentages):
+            print(f"{val}: {c} ({pct}%)")
+
+        # Creamos un gráfico de pastel para visualizar la distribución de respuestas
+        plt.figure(figsize=(7,7))  # Tamaño del gráfico
+        plt.pie(counts, labels=unique, autopct='%1.1f%%', startangle=140)  # Gráfico circular con porcentajes
+        plt.title('Fuente Principal de Ingreso del Hogar', fontsize=14, fontweight='bold')  # Título del gráfico
+        plt.tight_layout()  # Ajuste automático del layout
+        mostrar_o_guardar()  # Mostramos el gráfico (en modo lote se guarda como PNG)
+    else:
+        # Si la columna no existe, mostramos un mensaje de error
+        print("No se encontró la columna:", col)
+
+
+if __name__ == "__main__":
+    # Abrimos la matriz de códigos del Excel (mapeada en memoria; se crea la primera vez)
+    datos = matriz_encuesta(os.path.join(script_dir, "RecopilacionDeDatos.xlsx"))
+    ejecutar(datos)
@@ -1,92 +1,53 @@
 # pandas: se utiliza para la manipulación y análisis de datos estructurados, como hojas de Excel o archivos CSV
-# matplotlib.pyplot: se usa para crear gráficos y visualizaciones, como gráficos de pastel, barras, líneas, etc.
 # os: se utiliza para interactuar con el sistema operativo, como crear carpetas o manejar rutas de archivos
 import pandas as pd
-import matplotlib.pyplot as plt
 import os
+import sys
 
-# Cargamos el archivo Excel en un DataFrame de pandas
-df = pd.read_excel("RecopilacionDeDatos.xlsx")
+# carga_datos: módulo compartido de "Proyecto BI" que guarda el Excel en formato columnar
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', '..', 'Proyecto BI'))
+from carga_datos import cargar_encuesta_normalizada
+from config_graficos import directorio_salida
+from render_lote import ejecutar_en_paralelo
+from areas_vocacionales import guardar_grafico_areas, puntajes_por_grupo, preguntas_faltantes
 
 # Definimos el nombre exacto de la columna que identifica el colegio
 col_colegio = "Nombre de tu colegio:"
 
-# Verificamos que la columna del colegio exista en el DataFrame
-if col_colegio not in df.columns:
-    print(f"No se encontró la columna '{col_colegio}'")
-    exit()
-
-# Definimos las áreas vocacionales y las preguntas asociadas a cada una
-areas = {
-    "Ciencias de la Salud": [
-        "¿Te interesa aprender cómo funciona el cuerpo humano?",
-        "¿Te motiva la idea de ayudar a otras personas a mejorar su bienestar?",
-        "¿Te gustaría trabajar en hospitales, clínicas o centros de investigación médica?"
-    ],
-    "Ciencias Sociales y Humanidades": [
-        "¿Disfrutas conversar y escuchar los problemas de los demás para orientarlos?",
-        "¿Te interesa la historia, la filosofía o comprender cómo piensan las personas?",
-        "¿Te gusta participar en proyectos sociales, comunitarios o de voluntariado?"
-    ],
-    "Ingeniería, Tecnología y Matemáticas": [
-        "¿Te gustan las matemáticas y resolver problemas lógicos?",
-        "¿Te interesa entender cómo funcionan las máquinas, aparatos o sistemas digitales?",
-        "¿Te entusiasma diseñar programas, aplicaciones o inventos?"
-    ],
-    "Arte, Comunicación y Diseño": [
-        "¿Te gusta expresarte a través de la música, la pintura, el teatro o la escritura?",
-        "¿Disfrutas crear contenidos (videos, redes sociales, diseño gráfico, etc.)?",
-        "¿Te interesa trabajar en medios de comunicación o en proyectos artísticos?"
-    ],
-    "Negocios, Economía y Emprendimiento": [
-        "¿Te interesa organizar proyectos, liderar equipos o emprender negocios?",
-        "¿Te gustan los números aplicados a la economía y las finanzas?",
-        "¿Te motiva la idea de tener tu propio negocio en el futuro?"
-    ],
-    "Ciencias Naturales y Medio Ambiente": [
-        "¿Te interesa la naturaleza y cuidar el medio ambiente?",
-        "¿Te gusta trabajar al aire libre, en campos, laboratorios o áreas ecológicas?",
-        "¿Te motiva la idea de aportar a la sostenibilidad y seguridad alimentaria?"
-    ]
-}
-
-# Creamos una carpeta para guardar los gráficos generados por colegio
-output_folder = "graficos_por_colegio"
-os.makedirs(output_folder, exist_ok=True)
-
-# Obtenemos la lista de colegios únicos presentes en el archivo
-colegios = df[col_colegio].dropna().unique()
-
-# Iteramos por cada colegio para generar un gráfico de preferencias vocacionales
-for colegio in colegios:
-    # Filtramos el DataFrame para el colegio actual
-    df_colegio = df[df[col_colegio] == colegio]
-    conteo_areas = {}
-
-    # Contamos cuántas respuestas tipo "A" hay por área vocacional
-    for area, preguntas in areas.items():
-        total_A = 0
-        for pregunta in preguntas:
-            if pregunta in df_colegio.columns:
-                respuestas = df_colegio[pregunta].dropna()
-                total_A += respuestas[respuestas.str.startswith("A")].count()
-            else:
-                print(f"Pregunta no encontrada en el archivo: {pregunta}")
-        conteo_areas[area] = total_A
-
-    # Creamos un gráfico de barras para visualizar las preferencias por área
-    plt.figure(figsize=(10,6))  # Tamaño del gráfico
-    plt.bar(conteo_areas.keys(), conteo_areas.values(), color='mediumslateblue')  # Barras con color definido
-    plt.title(f"Preferencias Vocacionales - {colegio}", fontsize=14, fontweight='bold')  # Título del gráfico
-    plt.xlabel("Áreas Vocacionales")  # Etiqueta del eje X
-    plt.ylabel("Cantidad de respuestas A")  # Etiqueta del eje Y
-    plt.xticks(rotation=30, ha='right')  # Rotación de etiquetas para mejor lectura
-    plt.tight_layout()  # Ajuste automático del layout
-
-    # Guardamos el gráfico como imagen PNG en la carpeta correspondiente
-    safe_name = colegio.replace(" ", "_").replace("/", "_")
-    plt.savefig(f"{output_folder}/{safe_name}.png")
-    plt.close()  # Cerramos el gráfico para liberar memoria
-
-# Mensaje final de confirmación
-print("Todos los gráficos fueron generados y guardados en la carpeta 'graficos_por_colegio'.")
+# Las áreas vocacionales y sus preguntas están en areas_vocacionales.py (Proyecto BI)
+
+def ejecutar(df):
+    """Guarda el gráfico de preferencias vocacionales de cada colegio"""
+    # Verificamos que la columna del colegio exista en el DataFrame
+    if col_colegio not in df.columns:
+        print(f"No se encontró la columna '{col_colegio}'")
+        return
+
+    # Creamos una carpeta para guardar los gráficos generados por colegio
+    # (en modo lote, dentro de la carpeta de salida)
+    output_folder = directorio_salida("graficos_por_colegio") or os.path.join(script_dir, "graficos_por_colegio")
+    os.makedirs(output_folder, exist_ok=True)
+
+    # Contamos cuántas respuestas tipo "A" hay por área vocacional en cada colegio,
+    # todos los colegios a la vez (una fila por colegio, una columna por área)
+    conteos = puntajes_por_grupo(df, col_colegio)
+    for pregunta in preguntas_faltantes(df):
+        print(f"Pregunta no encontrada en el archivo: {pregunta}")
+
+    # Preparamos un gráfico por colegio; al ser independientes se dibujan en
+    # paralelo, un proceso por núcleo
+    tareas = []
+    for colegio, conteo_areas in conteos.iterrows():
+        safe_name = colegio.replace(" ", "_").replace("/", "_")
+        tareas.append((conteo_areas, f"Preferencias Vocacionales - {colegio}", 'mediumslateblue', os.path.join(output_folder, f"{safe_name}.png")))
+    ejecutar_en_paralelo(guardar_grafico_areas, tareas)
+
+    # Mensaje final de confirmación
+    print("Todos los gráficos fueron generados y guardados en la carpeta 'graficos_por_colegio'.")
+
+
+if __name__ == "__main__":
+    # Cargamos el archivo Excel en un DataFrame de pandas (usando la copia columnar si ya existe)
+    df = cargar_encuesta_normalizada(os.path.join(script_dir, "RecopilacionDeDatos.xlsx"))
+    ejecutar(df)